@@ -18,6 +18,15 @@ from app.attendance.models import Attendance, AttendanceStatus
 from app.notification.models import Notification, NotificationType
 from app.message.models import Message
 from app.material.models import Material
+from app.auth.models import RevokedToken
+from app.stats.models import (
+    StudentSubjectGradeStats,
+    ClassSubjectGradeStats,
+    StudentAttendanceStats,
+    ClassAttendanceStats,
+)
+from app.sync.models import Tombstone
+from config.broker import BrokerPayload
 
 config = context.config
 section = config.config_ini_section
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -11,23 +13,46 @@ from app.dashboard.routes import router as dashboard_router
 from app.grade.routes import router as grade_router
 from app.homework.routes import router as homework_router
 from app.material.routes import router as material_router
+from app.metrics.routes import router as metrics_router
+from app.notification.dispatcher import dispatcher
 from app.notification.routes import router as notification_router
 from app.password.routes import router as password_router
 from app.reports.routes import router as reports_router
 from app.schedule.routes import router as schedule_router
 from app.school.routes import router as school_router
 from app.subject.routes import router as subject_router
+from app.sync.routes import router as sync_router
 from app.users.routes.student import router as student_router
 from app.users.routes.teacher import router as teacher_router
 from app.users.routes.user import router as user_router
 from app.users.schemas import TeacherRead, StudentRead
 from app.websocket.routes import router as websocket_router
-from middleware import setup_cors
+from config.broker import broker
+from config.loop_monitor import loop_monitor
+from config.responses import FastJSONResponse, use_fast_json
+from config.token_blacklist import start_revocation_sync, stop_revocation_sync
+from middleware import setup_cors, setup_request_stats
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await broker.start()
+    await start_revocation_sync()
+    await loop_monitor.start()
+    yield
+    await loop_monitor.stop()
+    await stop_revocation_sync()
+    # Drain pending notification pushes while the broker can still publish them
+    await dispatcher.stop()
+    await broker.stop()
+
 
 app = FastAPI(
     title="School App API",
     description="Backend API for School Management Application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Ensure uploads directory exists
@@ -41,6 +66,7 @@ app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 ClassBase.model_rebuild(_types_namespace={"TeacherRead": TeacherRead, "StudentRead": StudentRead})
 
 setup_cors(app)
+setup_request_stats(app)
 
 # API Routes
 app.include_router(auth_router)
@@ -59,6 +85,8 @@ app.include_router(attendance_router)
 app.include_router(notification_router)
 app.include_router(material_router)
 app.include_router(reports_router)
+app.include_router(sync_router)
+app.include_router(metrics_router)
 
 # WebSocket Routes
 app.include_router(websocket_router)
@@ -80,3 +108,7 @@ def start_page():
            </body>
        </html>
        """
+
+
+# Must run after every route is registered
+use_fast_json(app)
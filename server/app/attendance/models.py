@@ -3,7 +3,7 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
@@ -24,6 +24,13 @@ class AttendanceStatus(str, enum.Enum):
 
 class Attendance(Base):
     __tablename__ = "attendances"
+    __table_args__ = (
+        # One record per student, subject and day; roll calls upsert on it
+        UniqueConstraint("student_id", "subject_id", "attendance_date", name="uq_attendance_student_subject_date"),
+        Index("ix_attendances_student_date", "student_id", "attendance_date"),
+        Index("ix_attendances_student_created", "student_id", "created_at", "id"),
+        Index("ix_attendances_student_updated", "student_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True
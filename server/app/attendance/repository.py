@@ -1,20 +1,26 @@
 import uuid
-from typing import List, Optional
-from sqlalchemy import select
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import joinedload
 
 from app.attendance.models import Attendance
-from app.attendance.schemas import AttendanceCreate, AttendanceUpdate
+from app.attendance.schemas import AttendanceCreate, AttendanceUpdate, RollCallCreate
+from app.stats.repository import StatsRepository
+from app.users.models.students import Student
 from config.database import AsyncSession
+from config.pagination import CursorParams, paginate_keyset
 
 
 class AttendanceRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.stats = StatsRepository(session)
 
     async def create(self, attendance_data: AttendanceCreate) -> Attendance:
         attendance = Attendance(**attendance_data.model_dump())
         self.session.add(attendance)
+        await self.stats.apply_attendance_deltas([(attendance.student_id, attendance.status, 1)])
         await self.session.commit()
         await self.session.refresh(attendance)
 
@@ -26,6 +32,85 @@ class AttendanceRepository:
         )
         return result.scalar_one()
 
+    async def upsert_roll_call(
+            self, data: RollCallCreate, commit: bool = True
+    ) -> Tuple[List[Attendance], Set[uuid.UUID]]:
+        """
+        Record a roll call with one INSERT ... ON CONFLICT DO UPDATE keyed on
+        (student_id, subject_id, attendance_date). Returns the rows (subject loaded) in
+        entry order and the ids of the students whose row was inserted or changed status.
+        """
+        keys = [(e.student_id, data.subject_id, data.attendance_date) for e in data.entries]
+
+        # Serialize roll calls of the same lesson (e.g. a retried POST): on a first roll call
+        # there are no rows for FOR UPDATE to lock, and two submissions would both read no
+        # previous statuses and both count +1. Held until the transaction ends.
+        await self.session.execute(select(func.pg_advisory_xact_lock(
+            func.hashtextextended(f"attendance:{data.subject_id}:{data.attendance_date.isoformat()}", 0)
+        )))
+
+        # Current statuses of rows being overwritten, read after the lock so the rollup deltas stay exact
+        result = await self.session.execute(
+            select(Attendance.student_id, Attendance.status)
+            .where(tuple_(Attendance.student_id, Attendance.subject_id, Attendance.attendance_date).in_(keys))
+            .with_for_update()
+        )
+        previous = {student_id: old_status for student_id, old_status in result.all()}
+
+        stmt = pg_insert(Attendance).values([
+            {
+                "id": uuid.uuid4(),
+                "student_id": e.student_id,
+                "subject_id": data.subject_id,
+                "teacher_id": data.teacher_id,
+                "attendance_date": data.attendance_date,
+                "status": e.status,
+                "notes": e.notes,
+            }
+            for e in data.entries
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["student_id", "subject_id", "attendance_date"],
+            set_={
+                "status": stmt.excluded.status,
+                "notes": stmt.excluded.notes,
+                "teacher_id": stmt.excluded.teacher_id,
+                "updated_at": func.now(),
+            },
+        ).returning(Attendance.id, Attendance.student_id)
+        result = await self.session.execute(stmt)
+        ids_by_student = {student_id: attendance_id for attendance_id, student_id in result.all()}
+
+        deltas = []
+        changed = set()
+        for e in data.entries:
+            old_status = previous.get(e.student_id)
+            if old_status == e.status:
+                continue
+            changed.add(e.student_id)
+            if old_status is not None:
+                deltas.append((e.student_id, old_status, -1))
+            deltas.append((e.student_id, e.status, 1))
+        await self.stats.apply_attendance_deltas(deltas)
+
+        result = await self.session.execute(
+            select(Attendance)
+            .options(joinedload(Attendance.subject))
+            .where(Attendance.id.in_(ids_by_student.values()))
+            .execution_options(populate_existing=True)
+        )
+        by_id = {a.id: a for a in result.scalars().all()}
+        if commit:
+            await self.session.commit()
+        return [by_id[ids_by_student[e.student_id]] for e in data.entries], changed
+
+    async def get_class_student_ids(self, class_id: uuid.UUID, student_ids: List[uuid.UUID]) -> set:
+        """The subset of student_ids that belong to the class."""
+        result = await self.session.execute(
+            select(Student.user_id).where(Student.class_id == class_id, Student.user_id.in_(student_ids))
+        )
+        return set(result.scalars().all())
+
     async def get_by_id(self, attendance_id: uuid.UUID) -> Optional[Attendance]:
         result = await self.session.execute(
             select(Attendance)
@@ -43,15 +128,30 @@ class AttendanceRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page_by_student(self, student_id: uuid.UUID, params: CursorParams) -> dict:
+        """Cursor-paginated attendance, newest first (by record creation, not attendance date)."""
+        query = (
+            select(Attendance)
+            .options(joinedload(Attendance.subject))
+            .where(Attendance.student_id == student_id)
+        )
+        return await paginate_keyset(self.session, query, Attendance, params)
+
     async def update(self, attendance_id: uuid.UUID, attendance_data: AttendanceUpdate) -> Optional[Attendance]:
         attendance = await self.get_by_id(attendance_id)
         if not attendance:
             return None
 
+        old_status = attendance.status
         update_data = attendance_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(attendance, field, value)
 
+        if attendance.status != old_status:
+            await self.stats.apply_attendance_deltas([
+                (attendance.student_id, old_status, -1),
+                (attendance.student_id, attendance.status, 1),
+            ])
         await self.session.commit()
         await self.session.refresh(attendance)
         return attendance
@@ -61,6 +161,7 @@ class AttendanceRepository:
         if not attendance:
             return False
 
+        await self.stats.apply_attendance_deltas([(attendance.student_id, attendance.status, -1)])
         await self.session.delete(attendance)
         await self.session.commit()
         return True
\ No newline at end of file
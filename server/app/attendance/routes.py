@@ -1,17 +1,20 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Union
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.attendance.repository import AttendanceRepository
-from app.attendance.schemas import AttendanceCreate, AttendanceRead, AttendanceUpdate
+from app.attendance.models import AttendanceStatus
+from app.attendance.schemas import AttendanceCreate, AttendanceRead, AttendanceUpdate, RollCallCreate
 from app.attendance.service import AttendanceService
 from config.database import AsyncSession, get_db
 from config.dependences import get_current_user
+from config.pagination import CursorPaginatedResponse, CursorParams
 
 # NEW: notification + websocket
 from app.notification.repository import NotificationRepository
 from app.notification.schemas import NotificationCreate
 from app.notification.models import NotificationType
+from app.notification.dispatcher import dispatcher
 from app.websocket.manager import manager
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
@@ -22,6 +25,54 @@ async def get_attendance_service(session: AsyncSession = Depends(get_db)) -> Att
     return AttendanceService(repository)
 
 
+def _build_attendance_notification(att, subject_name: str | None) -> NotificationCreate:
+    status_txt = getattr(att, "status", None)
+    date_txt = None
+    try:
+        date_txt = att.attendance_date.strftime('%d.%m.%Y')
+    except Exception:
+        date_txt = None
+
+    message = "A fost înregistrată o prezență."
+    if status_txt and subject_name and date_txt:
+        message = f"Status: {status_txt} la {subject_name} ({date_txt})."
+    elif status_txt and date_txt:
+        message = f"Status: {status_txt} ({date_txt})."
+
+    return NotificationCreate(
+        title="Prezență",
+        message=message,
+        notification_type=NotificationType.ATTENDANCE,
+        user_id=att.student_id,
+    )
+
+
+def _attendance_event(notif, att) -> dict:
+    # WebSocket payload sent to the student for an attendance record
+    return {
+        "type": "attendance",
+        "event": "created",
+        "notification": {
+            "id": str(notif.id),
+            "title": notif.title,
+            "message": notif.message,
+            "notification_type": notif.notification_type,
+            "is_read": notif.is_read,
+            "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
+            "user_id": str(notif.user_id),
+        },
+        "attendance": {
+            "id": str(att.id),
+            "attendance_date": att.attendance_date.isoformat() if getattr(att, "attendance_date", None) else None,
+            "status": getattr(att, "status", None),
+            "notes": getattr(att, "notes", None),
+            "student_id": str(att.student_id) if getattr(att, "student_id", None) else None,
+            "teacher_id": str(att.teacher_id) if getattr(att, "teacher_id", None) else None,
+            "subject_id": str(att.subject_id) if getattr(att, "subject_id", None) else None,
+        },
+    }
+
+
 @router.post("/", response_model=AttendanceRead, status_code=status.HTTP_201_CREATED)
 async def create_attendance(
         attendance_data: AttendanceCreate,
@@ -33,74 +84,68 @@ async def create_attendance(
 
     # Notify the student
     try:
-        title = "Prezență"
-        status_txt = getattr(att, "status", None)
-        date_txt = None
-        try:
-            date_txt = att.attendance_date.strftime('%d.%m.%Y')
-        except Exception:
-            date_txt = None
-
-        # Try to include subject name if available
         subject_name = None
         try:
             subject_name = getattr(getattr(att, "subject", None), "name", None)
         except Exception:
             subject_name = None
 
-        message = "A fost înregistrată o prezență."
-        if status_txt and subject_name and date_txt:
-            message = f"Status: {status_txt} la {subject_name} ({date_txt})."
-        elif status_txt and date_txt:
-            message = f"Status: {status_txt} ({date_txt})."
-
         notif_repo = NotificationRepository(session)
-        notif = await notif_repo.create(
-            NotificationCreate(
-                title=title,
-                message=message,
-                notification_type=NotificationType.ATTENDANCE,
-                user_id=att.student_id,
-            )
-        )
+        notif = await notif_repo.create(_build_attendance_notification(att, subject_name))
 
-        await manager.send_personal_message(
-            {
-                "type": "attendance",
-                "event": "created",
-                "notification": {
-                    "id": str(notif.id),
-                    "title": notif.title,
-                    "message": notif.message,
-                    "notification_type": notif.notification_type,
-                    "is_read": notif.is_read,
-                    "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
-                    "user_id": str(notif.user_id),
-                },
-                "attendance": {
-                    "id": str(att.id),
-                    "attendance_date": att.attendance_date.isoformat() if getattr(att, "attendance_date", None) else None,
-                    "status": getattr(att, "status", None),
-                    "notes": getattr(att, "notes", None),
-                    "student_id": str(att.student_id) if getattr(att, "student_id", None) else None,
-                    "teacher_id": str(att.teacher_id) if getattr(att, "teacher_id", None) else None,
-                    "subject_id": str(att.subject_id) if getattr(att, "subject_id", None) else None,
-                },
-            },
-            user_id=str(att.student_id),
-        )
+        await manager.send_personal_message(_attendance_event(notif, att), user_id=str(att.student_id))
     except Exception:
         pass
 
     return att
 
 
-@router.get("/student/{student_id}", response_model=List[AttendanceRead])
+@router.post("/roll-call", response_model=List[AttendanceRead])
+async def record_roll_call(
+        data: RollCallCreate,
+        current_user: dict = Depends(get_current_user),
+        service: AttendanceService = Depends(get_attendance_service),
+        session: AsyncSession = Depends(get_db),
+):
+    """Record attendance for a whole class and lesson in one request (Teacher or Admin only).
+
+    Rows are upserted on (student, subject, date), so re-submitting a corrected roll call
+    updates it. Only students who were not present are notified, and on a re-submission
+    only those whose status changed.
+    """
+    if current_user.get("role") not in {"teacher", "admin"}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only teacher or admin can record attendance",
+        )
+
+    records, changed = await service.record_roll_call(data, commit=False)
+    not_present = [a for a in records if a.student_id in changed and a.status != AttendanceStatus.PRESENT]
+    notifications = await NotificationRepository(session).create_many(
+        [_build_attendance_notification(a, a.subject.name if a.subject else None) for a in not_present],
+        commit=False,
+    )
+    await session.commit()
+
+    dispatcher.dispatch([
+        (str(att.student_id), _attendance_event(notif, att))
+        for att, notif in zip(not_present, notifications)
+    ])
+    return records
+
+
+@router.get(
+    "/student/{student_id}",
+    response_model=Union[List[AttendanceRead], CursorPaginatedResponse[AttendanceRead]]
+)
 async def get_student_attendance(
         student_id: uuid.UUID,
+        page: CursorParams = Depends(),
         current_user: dict = Depends(get_current_user),
         service: AttendanceService = Depends(get_attendance_service)
 ):
+    if page.enabled:
+        return await service.get_student_attendance_page(student_id, page)
     return await service.get_student_attendance(student_id)
 
 
@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 from app.attendance.models import AttendanceStatus
 
@@ -24,6 +24,21 @@ class AttendanceUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class RollCallEntry(BaseModel):
+    student_id: uuid.UUID
+    status: AttendanceStatus
+    notes: Optional[str] = None
+
+
+class RollCallCreate(BaseModel):
+    """Attendance of a whole class for one lesson (subject + date)."""
+    class_id: uuid.UUID
+    subject_id: uuid.UUID
+    teacher_id: uuid.UUID
+    attendance_date: date
+    entries: List[RollCallEntry] = Field(..., min_length=1, max_length=200)
+
+
 class SubjectInfo(BaseModel):
     id: uuid.UUID
     name: str
@@ -1,10 +1,12 @@
 import uuid
-from typing import List
+from typing import List, Set, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 
 from app.attendance.models import Attendance
 from app.attendance.repository import AttendanceRepository
-from app.attendance.schemas import AttendanceCreate, AttendanceUpdate
+from app.attendance.schemas import AttendanceCreate, AttendanceUpdate, RollCallCreate
+from config.pagination import CursorParams
 
 
 class AttendanceService:
@@ -12,7 +14,47 @@ class AttendanceService:
         self.repository = repository
 
     async def create_attendance(self, attendance_data: AttendanceCreate) -> Attendance:
-        return await self.repository.create(attendance_data)
+        try:
+            return await self.repository.create(attendance_data)
+        except IntegrityError as e:
+            await self.repository.session.rollback()
+            if "uq_attendance_student_subject_date" in str(e.orig):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Attendance for this student, subject and date already exists"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown student, subject or teacher"
+            )
+
+    async def record_roll_call(
+            self, data: RollCallCreate, commit: bool = True
+    ) -> Tuple[List[Attendance], Set[uuid.UUID]]:
+        """Returns the rows in entry order and the students whose status is new or changed."""
+        student_ids = [e.student_id for e in data.entries]
+        if len(set(student_ids)) != len(student_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each student may appear only once in a roll call"
+            )
+
+        in_class = await self.repository.get_class_student_ids(data.class_id, student_ids)
+        unknown = [str(sid) for sid in student_ids if sid not in in_class]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Students not in class {data.class_id}: {', '.join(unknown)}"
+            )
+
+        try:
+            return await self.repository.upsert_roll_call(data, commit=commit)
+        except IntegrityError:
+            await self.repository.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown subject or teacher"
+            )
 
     async def get_attendance(self, attendance_id: uuid.UUID) -> Attendance:
         attendance = await self.repository.get_by_id(attendance_id)
@@ -26,6 +68,9 @@ class AttendanceService:
     async def get_student_attendance(self, student_id: uuid.UUID) -> List[Attendance]:
         return await self.repository.get_by_student(student_id)
 
+    async def get_student_attendance_page(self, student_id: uuid.UUID, params: CursorParams) -> dict:
+        return await self.repository.get_page_by_student(student_id, params)
+
     async def update_attendance(self, attendance_id: uuid.UUID, attendance_data: AttendanceUpdate) -> Attendance:
         attendance = await self.repository.update(attendance_id, attendance_data)
         if not attendance:
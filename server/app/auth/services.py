@@ -7,12 +7,12 @@ from app.auth.schemas import (
     EmailCheckResponse, AccountStatus, UserLoginRequest, AuthResponse,
     RefreshTokenRequest, RefreshTokenResponse
 )
-from app.password.utils import pwd_context
+from app.password.hasher import password_hasher
 from config.security import (
     create_access_token, create_refresh_token,
-    verify_refresh_token, get_token_expiry
+    verify_refresh_token, get_token_id, get_token_revocation_info
 )
-from config.token_blacklist import blacklist_token, is_token_blacklisted
+from config.token_blacklist import blacklist_token, is_token_revoked
 
 
 class AuthService:
@@ -49,7 +49,7 @@ class AuthService:
                     detail="Account not activated. Please set your password."
                 )
 
-            password_hash = pwd_context.hash(data.password)
+            password_hash = await password_hasher.hash(data.password)
             await self.repository.activate_user(user, password_hash)
             access_token = create_access_token({
                 "sub": str(user.id),
@@ -70,11 +70,17 @@ class AuthService:
                 refresh_token=refresh_token,
             )
 
-        if not data.password or not pwd_context.verify(data.password, user.password):
+        is_valid, new_hash = (False, None)
+        if data.password:
+            is_valid, new_hash = await password_hasher.verify_and_update(data.password, user.password)
+        if not is_valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password"
             )
+        if new_hash:
+            # Stored hash uses older argon2 costs
+            await self.repository.set_password(user, new_hash)
 
         access_token = create_access_token({
             "sub": str(user.id),
@@ -97,13 +103,6 @@ class AuthService:
 
     async def refresh_token(self, data: RefreshTokenRequest) -> RefreshTokenResponse:
         """Generate new access and refresh tokens using a valid refresh token."""
-        # Check if token is blacklisted
-        if is_token_blacklisted(data.refresh_token):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has been revoked"
-            )
-
         # Verify the refresh token
         is_valid, payload = verify_refresh_token(data.refresh_token)
         if not is_valid or not payload:
@@ -112,6 +111,13 @@ class AuthService:
                 detail="Invalid or expired refresh token"
             )
 
+        # Check if token has been revoked
+        if is_token_revoked(get_token_id(data.refresh_token, payload)):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(
@@ -119,10 +125,10 @@ class AuthService:
                 detail="Invalid token payload"
             )
 
-        # Blacklist the old refresh token (token rotation)
-        expiry = get_token_expiry(data.refresh_token)
-        if expiry:
-            blacklist_token(data.refresh_token, expiry)
+        # Revoke the old refresh token (token rotation)
+        revocation = get_token_revocation_info(data.refresh_token)
+        if revocation:
+            await blacklist_token(*revocation)
 
         # Get user to include role in new access token
         # For simplicity, we'll use the user_id from the token
@@ -143,15 +149,15 @@ class AuthService:
 
     async def logout(self, access_token: str, refresh_token: str = None) -> dict:
         """Logout user by blacklisting their tokens."""
-        # Blacklist the access token
-        expiry = get_token_expiry(access_token)
-        if expiry:
-            blacklist_token(access_token, expiry)
+        # Revoke the access token
+        revocation = get_token_revocation_info(access_token)
+        if revocation:
+            await blacklist_token(*revocation)
 
-        # Blacklist the refresh token if provided
+        # Revoke the refresh token if provided
         if refresh_token:
-            refresh_expiry = get_token_expiry(refresh_token)
-            if refresh_expiry:
-                blacklist_token(refresh_token, refresh_expiry)
+            refresh_revocation = get_token_revocation_info(refresh_token)
+            if refresh_revocation:
+                await blacklist_token(*refresh_revocation)
 
         return {"message": "Successfully logged out"}
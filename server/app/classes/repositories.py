@@ -2,7 +2,10 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.cache import classes_cache, invalidate, teacher_assignments_cache, teacher_home_cache
+
 from .models import Class
+from .schemas import ClassOut
 
 
 class ClassRepository:
@@ -12,6 +15,8 @@ class ClassRepository:
         db.add(obj)
         await db.commit()
         await db.refresh(obj)
+        await invalidate(classes_cache)
+        await invalidate(teacher_home_cache)
         return obj
 
     @staticmethod
@@ -20,18 +25,27 @@ class ClassRepository:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all(db: AsyncSession):
-        result = await db.execute(select(Class))
-        return result.scalars().all()
+    async def get_all(db: AsyncSession) -> list[ClassOut]:
+        """All classes, read through classes_cache."""
+        async def load() -> tuple:
+            result = await db.execute(select(Class))
+            return tuple(ClassOut.model_validate(c) for c in result.scalars().all())
+
+        return list(await classes_cache.get_or_load("all", load))
 
     @staticmethod
     async def update(db: AsyncSession, obj: Class):
         await db.commit()
         await db.refresh(obj)
+        await invalidate(classes_cache)
+        await invalidate(teacher_home_cache)
         return obj
 
     @staticmethod
     async def delete(db: AsyncSession, obj: Class):
         await db.delete(obj)
         await db.commit()
+        await invalidate(classes_cache)
+        await invalidate(teacher_assignments_cache)
+        await invalidate(teacher_home_cache)
         return True
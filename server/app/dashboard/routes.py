@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from config.database import get_db
+from config import cache
+from config.database import get_db, get_pool_stats
 from config.dependences import admin_required
+from config.loop_monitor import PROFILE_MAX_SECONDS, loop_monitor
+from app.password.hasher import password_hasher
 from app.users.models.users import User
 from app.users.models.students import Student
 from app.users.models.teachers import Teacher
@@ -74,4 +80,40 @@ async def get_dashboard_stats(session: AsyncSession = Depends(get_db)):
         },
         "recent_users_30_days": recent_users or 0,
         "class_distribution": class_distribution
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/db-pool", dependencies=[Depends(admin_required)])
+async def get_db_pool_stats():
+    """Get database connection pool statistics for this worker"""
+    return get_pool_stats()
+
+
+@router.get("/password-hasher", dependencies=[Depends(admin_required)])
+async def get_password_hasher_stats():
+    """Get password hashing queue and latency statistics for this worker"""
+    return password_hasher.get_stats()
+
+
+@router.get("/cache", dependencies=[Depends(admin_required)])
+async def get_cache_stats():
+    """Get hit/miss, single-flight and eviction counters of the in-process caches for this worker"""
+    return cache.get_stats()
+
+
+@router.get("/event-loop", dependencies=[Depends(admin_required)])
+async def get_event_loop_stats():
+    """Get event loop lag and recent stalls (with the blocking stack) for this worker"""
+    return loop_monitor.get_stats()
+
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(admin_required)])
+async def profile_event_loop(
+        seconds: float = Query(5, gt=0, le=PROFILE_MAX_SECONDS),
+        interval_ms: float = Query(5, ge=1, le=100),
+):
+    """Sample the event loop thread of this worker and return collapsed stacks (flamegraph input)"""
+    try:
+        return await asyncio.to_thread(loop_monitor.profile, seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, ForeignKey
+from sqlalchemy import CheckConstraint, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
@@ -27,6 +27,13 @@ class GradeModel(Base):
     __tablename__ = "grades"
     __table_args__ = (
         CheckConstraint('value >= 2 AND value <= 10', name='grade_value_range'),
+        # Per-student/teacher/subject listings, newest first (also the keyset pagination order)
+        Index("ix_grades_student_created", "student_id", "created_at", "id"),
+        Index("ix_grades_teacher_created", "teacher_id", "created_at", "id"),
+        Index("ix_grades_subject_created", "subject_id", "created_at", "id"),
+        # Delta sync (/sync) reads changes in (updated_at, id) order
+        Index("ix_grades_student_updated", "student_id", "updated_at", "id"),
+        Index("ix_grades_teacher_updated", "teacher_id", "updated_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -1,17 +1,24 @@
 import uuid
 from typing import List, Optional, Tuple
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, String
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 from app.grade.models import GradeModel
 from app.grade.schemas import GradeCreate, GradeUpdate
+from app.stats.repository import StatsRepository
+from app.subject.models import Subject
+from app.users.models import User
+from app.users.models.students import Student
 from config.database import AsyncSession
+from config.pagination import CursorParams, paginate_keyset
 
 
 class GradeRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.stats = StatsRepository(session)
 
     async def create(self, grade_data: GradeCreate) -> GradeModel:
         grade = GradeModel(**grade_data.model_dump())
@@ -22,6 +29,7 @@ class GradeRepository:
             grade.updated_at = datetime.utcnow()
 
         self.session.add(grade)
+        await self.stats.apply_grade_deltas([(grade.student_id, grade.subject_id, grade.value, 1)])
         await self.session.commit()
 
         result = await self.session.execute(
@@ -31,6 +39,25 @@ class GradeRepository:
         )
         return result.scalar_one()
 
+    async def create_many(self, grades_data: List[GradeCreate], commit: bool = True) -> List[GradeModel]:
+        """Insert grades with one multi-row INSERT and return them (subject loaded) in input order."""
+        rows = [{"id": uuid.uuid4(), **g.model_dump()} for g in grades_data]
+        if not rows:
+            return []
+
+        await self.session.execute(insert(GradeModel).values(rows))
+        await self.stats.apply_grade_deltas([(r["student_id"], r["subject_id"], r["value"], 1) for r in rows])
+
+        result = await self.session.execute(
+            select(GradeModel)
+            .options(joinedload(GradeModel.subject))
+            .where(GradeModel.id.in_([r["id"] for r in rows]))
+        )
+        by_id = {g.id: g for g in result.scalars().all()}
+        if commit:
+            await self.session.commit()
+        return [by_id[r["id"]] for r in rows]
+
     async def get_by_id(self, grade_id: uuid.UUID) -> Optional[GradeModel]:
         result = await self.session.execute(
             select(GradeModel)
@@ -107,15 +134,84 @@ class GradeRepository:
         )
         return list(result.scalars().all()), total
 
+    async def get_page(
+        self,
+        params: CursorParams,
+        student_id: Optional[uuid.UUID] = None,
+        teacher_id: Optional[uuid.UUID] = None,
+        subject_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        """Cursor-paginated grades, newest first, optionally filtered."""
+        query = select(GradeModel).options(joinedload(GradeModel.subject))
+        if student_id is not None:
+            query = query.where(GradeModel.student_id == student_id)
+        if teacher_id is not None:
+            query = query.where(GradeModel.teacher_id == teacher_id)
+        if subject_id is not None:
+            query = query.where(GradeModel.subject_id == subject_id)
+        return await paginate_keyset(self.session, query, GradeModel, params)
+
+    async def get_class_roster(self, class_id: uuid.UUID) -> List[Tuple[uuid.UUID, str]]:
+        """(student_id, username) for every student in the class, by name."""
+        result = await self.session.execute(
+            select(Student.user_id, User.username)
+            .join(User, User.id == Student.user_id)
+            .where(Student.class_id == class_id)
+            .order_by(User.username)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_class_matrix_cells(
+        self,
+        class_id: uuid.UUID,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        subject_id: Optional[uuid.UUID] = None,
+    ) -> list:
+        """
+        One row per (student, subject) with grades in the class, in a single grouped query:
+        (student_id, subject_id, subject_name, average, ids, values, types, created_ats),
+        the arrays ordered by grade date.
+        """
+        order = GradeModel.created_at
+        query = (
+            select(
+                GradeModel.student_id,
+                GradeModel.subject_id,
+                Subject.name,
+                func.avg(GradeModel.value),
+                func.array_agg(aggregate_order_by(GradeModel.id, order)),
+                func.array_agg(aggregate_order_by(GradeModel.value, order)),
+                func.array_agg(aggregate_order_by(GradeModel.types.cast(String), order)),
+                func.array_agg(aggregate_order_by(GradeModel.created_at, order)),
+            )
+            .join(Student, Student.user_id == GradeModel.student_id)
+            .join(Subject, Subject.id == GradeModel.subject_id)
+            .where(Student.class_id == class_id)
+            .group_by(GradeModel.student_id, GradeModel.subject_id, Subject.name)
+        )
+        if date_from is not None:
+            query = query.where(GradeModel.created_at >= date_from)
+        if date_to is not None:
+            query = query.where(GradeModel.created_at < date_to)
+        if subject_id is not None:
+            query = query.where(GradeModel.subject_id == subject_id)
+
+        result = await self.session.execute(query)
+        return result.all()
+
     async def update(self, grade_id: uuid.UUID, grade_data: GradeUpdate) -> Optional[GradeModel]:
         grade = await self.get_by_id(grade_id)
         if not grade:
             return None
 
+        old_value = grade.value
         update_data = grade_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(grade, field, value)
 
+        if grade.value != old_value:
+            await self.stats.apply_grade_deltas([(grade.student_id, grade.subject_id, grade.value - old_value, 0)])
         await self.session.commit()
         await self.session.refresh(grade)
         return grade
@@ -125,6 +221,7 @@ class GradeRepository:
         if not grade:
             return False
 
+        await self.stats.apply_grade_deltas([(grade.student_id, grade.subject_id, -grade.value, -1)])
         await self.session.delete(grade)
         await self.session.commit()
         return True
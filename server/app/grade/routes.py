@@ -1,28 +1,77 @@
 import uuid
-from typing import List
+from datetime import date
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from sqlalchemy.exc import IntegrityError
 
 from app.grade.repository import GradeRepository
 from app.grade.schemas import GradeCreate, GradeRead, GradeUpdate
 from app.grade.service import GradeService
 from config.database import AsyncSession, get_db
 from config.dependences import get_current_user, admin_required
-from config.pagination import PaginationParams
+from config.pagination import CursorPaginatedResponse, CursorParams, PaginationParams
 
 # NEW: notification + websocket
 from app.notification.repository import NotificationRepository
 from app.notification.schemas import NotificationCreate
 from app.notification.models import NotificationType
+from app.notification.dispatcher import dispatcher
 from app.websocket.manager import manager
 
 router = APIRouter(prefix="/grades", tags=["Grades"])
 
+# Upper bound for one POST /grades/bulk request (a class is ~30 students)
+GRADE_BULK_MAX_ITEMS = 500
+
 
 async def get_grade_service(session: AsyncSession = Depends(get_db)) -> GradeService:
     repository = GradeRepository(session)
     return GradeService(repository)
 
 
+def _build_grade_notification(grade, subject_name: str | None) -> NotificationCreate:
+    if subject_name:
+        message = f"Ai primit nota {grade.value} la {subject_name}."
+    else:
+        message = f"Ai primit nota {grade.value}."
+    return NotificationCreate(
+        title="Notă nouă",
+        message=message,
+        notification_type=NotificationType.NEW_GRADE,
+        user_id=grade.student_id,
+    )
+
+
+def _grade_event(notif, grade) -> dict:
+    # WebSocket payload sent to the student for a new grade
+    return {
+        "type": "grade",
+        "event": "created",
+        "notification": {
+            "id": str(notif.id),
+            "title": notif.title,
+            "message": notif.message,
+            "notification_type": notif.notification_type,
+            "is_read": notif.is_read,
+            "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
+            "user_id": str(notif.user_id),
+        },
+        "grade": {
+            "id": str(grade.id),
+            "value": grade.value,
+            "types": grade.types,
+            "student_id": str(grade.student_id),
+            "teacher_id": str(grade.teacher_id),
+            "subject_id": str(grade.subject_id),
+            "subject": {
+                "id": str(grade.subject.id),
+                "name": grade.subject.name,
+            } if getattr(grade, "subject", None) is not None else None,
+            "created_at": grade.created_at.isoformat() if getattr(grade, "created_at", None) else None,
+        },
+    }
+
+
 @router.post("/", response_model=GradeRead, status_code=status.HTTP_201_CREATED)
 async def create_grade(
         grade_data: GradeCreate,
@@ -49,52 +98,11 @@ async def create_grade(
         except Exception:
             subject_name = None
 
-        title = "Notă nouă"
-        if subject_name:
-            message = f"Ai primit nota {grade.value} la {subject_name}."
-        else:
-            message = f"Ai primit nota {grade.value}."
-
         notif_repo = NotificationRepository(session)
-        notif = await notif_repo.create(
-            NotificationCreate(
-                title=title,
-                message=message,
-                notification_type=NotificationType.NEW_GRADE,
-                user_id=grade.student_id,
-            )
-        )
+        notif = await notif_repo.create(_build_grade_notification(grade, subject_name))
 
         # Emit real-time WebSocket event to the student (if connected)
-        await manager.send_personal_message(
-            {
-                "type": "grade",
-                "event": "created",
-                "notification": {
-                    "id": str(notif.id),
-                    "title": notif.title,
-                    "message": notif.message,
-                    "notification_type": notif.notification_type,
-                    "is_read": notif.is_read,
-                    "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
-                    "user_id": str(notif.user_id),
-                },
-                "grade": {
-                    "id": str(grade.id),
-                    "value": grade.value,
-                    "types": grade.types,
-                    "student_id": str(grade.student_id),
-                    "teacher_id": str(grade.teacher_id),
-                    "subject_id": str(grade.subject_id),
-                    "subject": {
-                        "id": str(grade.subject.id),
-                        "name": grade.subject.name,
-                    } if getattr(grade, "subject", None) is not None else None,
-                    "created_at": grade.created_at.isoformat() if getattr(grade, "created_at", None) else None,
-                },
-            },
-            user_id=str(grade.student_id),
-        )
+        await manager.send_personal_message(_grade_event(notif, grade), user_id=str(grade.student_id))
     except Exception:
         # Notification failures shouldn't fail the grade creation.
         pass
@@ -102,6 +110,52 @@ async def create_grade(
     return grade
 
 
+@router.post("/bulk", response_model=List[GradeRead], status_code=status.HTTP_201_CREATED)
+async def create_grades_bulk(
+        grades_data: List[GradeCreate],
+        current_user: dict = Depends(get_current_user),
+        service: GradeService = Depends(get_grade_service),
+        session: AsyncSession = Depends(get_db),
+):
+    """Create many grades at once, e.g. a test for a whole class (Teacher or Admin only).
+
+    Grades and their notifications are written in one transaction with multi-row
+    inserts; real-time events are pushed in the background after the commit.
+    """
+    if current_user.get("role") not in {"teacher", "admin"}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only teacher or admin can create grades",
+        )
+    if not grades_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No grades provided")
+    if len(grades_data) > GRADE_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {GRADE_BULK_MAX_ITEMS} grades can be created at once",
+        )
+
+    try:
+        grades = await service.bulk_create_grades(grades_data, commit=False)
+        notifications = await NotificationRepository(session).create_many(
+            [_build_grade_notification(g, g.subject.name if g.subject else None) for g in grades],
+            commit=False,
+        )
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown student, teacher or subject in grades",
+        )
+
+    dispatcher.dispatch([
+        (str(grade.student_id), _grade_event(notif, grade))
+        for grade, notif in zip(grades, notifications)
+    ])
+    return grades
+
+
 @router.get("/", dependencies=[Depends(admin_required)])
 async def get_all_grades(
         pagination: PaginationParams = Depends(),
@@ -111,58 +165,89 @@ async def get_all_grades(
     return await service.get_all_grades(pagination.skip, pagination.limit)
 
 
-@router.get("/my-grades", response_model=List[GradeRead])
+GradeList = Union[List[GradeRead], CursorPaginatedResponse[GradeRead]]
+
+
+@router.get("/my-grades", response_model=GradeList)
 async def get_my_grades(
         skip: int = Query(0, ge=0),
-        limit: int = Query(100, ge=1, le=200),
+        page: CursorParams = Depends(),
         current_user: dict = Depends(get_current_user),
         service: GradeService = Depends(get_grade_service)
 ):
-    """Get grades for the current student with pagination"""
+    """Get grades for the current student with pagination (pass `cursor` for keyset pages)"""
     user_id = uuid.UUID(current_user["id"])
-    items, total = await service.get_student_grades(user_id, skip, limit)
+    if page.enabled:
+        return await service.get_grades_page(page, student_id=user_id)
+    items, total = await service.get_student_grades(user_id, skip, page.limit)
     return items  # Return items directly for backward compatibility
 
 
-@router.get("/student/{student_id}", response_model=List[GradeRead])
+@router.get("/student/{student_id}", response_model=GradeList)
 async def get_student_grades(
         student_id: uuid.UUID,
         skip: int = Query(0, ge=0),
-        limit: int = Query(100, ge=1, le=200),
+        page: CursorParams = Depends(),
         current_user: dict = Depends(get_current_user),
         service: GradeService = Depends(get_grade_service)
 ):
     """Get grades for a specific student with pagination"""
-    items, total = await service.get_student_grades(student_id, skip, limit)
+    if page.enabled:
+        return await service.get_grades_page(page, student_id=student_id)
+    items, total = await service.get_student_grades(student_id, skip, page.limit)
     return items
 
 
-@router.get("/teacher/{teacher_id}", response_model=List[GradeRead])
+@router.get("/teacher/{teacher_id}", response_model=GradeList)
 async def get_teacher_grades(
         teacher_id: uuid.UUID,
         skip: int = Query(0, ge=0),
-        limit: int = Query(100, ge=1, le=200),
+        page: CursorParams = Depends(),
         current_user: dict = Depends(get_current_user),
         service: GradeService = Depends(get_grade_service)
 ):
     """Get all grades given by a specific teacher with pagination"""
-    items, total = await service.get_teacher_grades(teacher_id, skip, limit)
+    if page.enabled:
+        return await service.get_grades_page(page, teacher_id=teacher_id)
+    items, total = await service.get_teacher_grades(teacher_id, skip, page.limit)
     return items
 
 
-@router.get("/subject/{subject_id}", response_model=List[GradeRead])
+@router.get("/subject/{subject_id}", response_model=GradeList)
 async def get_subject_grades(
         subject_id: uuid.UUID,
         skip: int = Query(0, ge=0),
-        limit: int = Query(100, ge=1, le=200),
+        page: CursorParams = Depends(),
         current_user: dict = Depends(get_current_user),
         service: GradeService = Depends(get_grade_service)
 ):
     """Get all grades for a specific subject with pagination"""
-    items, total = await service.get_subject_grades(subject_id, skip, limit)
+    if page.enabled:
+        return await service.get_grades_page(page, subject_id=subject_id)
+    items, total = await service.get_subject_grades(subject_id, skip, page.limit)
     return items
 
 
+@router.get("/class/{class_id}/matrix")
+async def get_class_grade_matrix(
+        class_id: uuid.UUID,
+        date_from: Optional[date] = Query(None, description="First day to include"),
+        date_to: Optional[date] = Query(None, description="Last day to include"),
+        subject_id: Optional[uuid.UUID] = Query(None),
+        current_user: dict = Depends(get_current_user),
+        service: GradeService = Depends(get_grade_service)
+):
+    """Get a class gradebook (students x subjects) in one request (Teacher or Admin only)"""
+    if current_user.get("role") not in {"teacher", "admin"}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only teacher or admin can view class gradebooks",
+        )
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to")
+    return await service.get_class_matrix(class_id, date_from, date_to, subject_id)
+
+
 @router.get("/{grade_id}", response_model=GradeRead)
 async def get_grade(
         grade_id: uuid.UUID,
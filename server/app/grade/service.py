@@ -1,11 +1,12 @@
 import uuid
-from typing import List, Tuple
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
-from app.grade.models import GradeModel
+from app.grade.models import GradeModel, GradeTypes
 from app.grade.repository import GradeRepository
 from app.grade.schemas import GradeCreate, GradeUpdate
-from config.pagination import create_paginated_response
+from config.pagination import CursorParams, create_paginated_response
 
 
 class GradeService:
@@ -15,6 +16,9 @@ class GradeService:
     async def create_grade(self, grade_data: GradeCreate) -> GradeModel:
         return await self.repository.create(grade_data)
 
+    async def bulk_create_grades(self, grades_data: List[GradeCreate], commit: bool = True) -> List[GradeModel]:
+        return await self.repository.create_many(grades_data, commit=commit)
+
     async def get_grade(self, grade_id: uuid.UUID) -> GradeModel:
         grade = await self.repository.get_by_id(grade_id)
         if not grade:
@@ -37,6 +41,63 @@ class GradeService:
     async def get_subject_grades(self, subject_id: uuid.UUID, skip: int = 0, limit: int = 100) -> Tuple[List[GradeModel], int]:
         return await self.repository.get_by_subject(subject_id, skip, limit)
 
+    async def get_grades_page(
+        self,
+        params: CursorParams,
+        student_id: Optional[uuid.UUID] = None,
+        teacher_id: Optional[uuid.UUID] = None,
+        subject_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        return await self.repository.get_page(params, student_id=student_id, teacher_id=teacher_id, subject_id=subject_id)
+
+    async def get_class_matrix(
+        self,
+        class_id: uuid.UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        subject_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        """
+        Class gradebook as students x subjects matrices: row i is students[i], column j is
+        subjects[j]. grades[i][j] lists [id, value, type, created_at] in date order and
+        averages[i][j] is null when the student has no grade in that subject.
+        """
+        roster = await self.repository.get_class_roster(class_id)
+        cells = await self.repository.get_class_matrix_cells(
+            class_id,
+            date_from=datetime.combine(date_from, time.min) if date_from else None,
+            # date_to is inclusive
+            date_to=datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None,
+            subject_id=subject_id,
+        )
+
+        subjects = sorted({(cell[1], cell[2]) for cell in cells}, key=lambda s: s[1])
+        row_of = {student_id: i for i, (student_id, _) in enumerate(roster)}
+        col_of = {subject_id: j for j, (subject_id, _) in enumerate(subjects)}
+
+        averages: List[List[Optional[float]]] = [[None] * len(subjects) for _ in roster]
+        grades: List[List[list]] = [[[] for _ in subjects] for _ in roster]
+        for student_id, cell_subject_id, _, average, ids, values, types, created_ats in cells:
+            i = row_of.get(student_id)
+            if i is None:
+                continue
+            j = col_of[cell_subject_id]
+            averages[i][j] = round(float(average), 2)
+            grades[i][j] = [
+                [str(grade_id), value, GradeTypes[grade_type].value, created_at.isoformat()]
+                for grade_id, value, grade_type, created_at in zip(ids, values, types, created_ats)
+            ]
+
+        return {
+            "class_id": str(class_id),
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+            "students": [{"id": str(student_id), "username": username} for student_id, username in roster],
+            "subjects": [{"id": str(sid), "name": name} for sid, name in subjects],
+            "averages": averages,
+            "grades": grades,
+        }
+
     async def update_grade(self, grade_id: uuid.UUID, grade_data: GradeUpdate) -> GradeModel:
         grade = await self.repository.update(grade_id, grade_data)
         if not grade:
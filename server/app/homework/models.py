@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional, List
 
-from sqlalchemy import ForeignKey, Text, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
@@ -25,6 +25,9 @@ class HomeworkStatus(str, enum.Enum):
 
 class Homework(Base):
     __tablename__ = "homeworks"
+    __table_args__ = (
+        Index("ix_homeworks_class_due", "class_id", "due_date"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True
@@ -70,6 +73,8 @@ class HomeworkAssignment(Base):
     __tablename__ = "homework_assignments"
     __table_args__ = (
         UniqueConstraint("homework_id", "student_id", name="uq_homework_assignment"),
+        # The unique constraint leads with homework_id; "my homework" looks up by student
+        Index("ix_homework_assignments_student", "student_id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -1,11 +1,13 @@
 import uuid
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 
 from app.homework.models import Homework, HomeworkAssignment
 from app.homework.schemas import HomeworkCreate, HomeworkUpdate
+from config.conditional import collection_version
 from config.database import AsyncSession
+from config.pagination import CursorParams, paginate_keyset
 
 
 class HomeworkRepository:
@@ -51,6 +53,21 @@ class HomeworkRepository:
         # joinedload() over a collection requires unique() before scalars().all()
         return list(result.unique().scalars().all())
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        """Version of a class's homework (with subjects and assigned students), for ETags."""
+        assignments = (
+            select(func.count())
+            .select_from(HomeworkAssignment)
+            .join(Homework, Homework.id == HomeworkAssignment.homework_id)
+            .where(Homework.class_id == class_id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            collection_version(Homework, Homework.class_id == class_id, related=(Homework.subject,))
+            .add_columns(assignments)
+        )
+        return tuple(result.one())
+
     async def get_for_student(self, student_id: uuid.UUID, class_id: Optional[uuid.UUID]) -> List[Homework]:
         # Returns ONLY homework explicitly assigned to this specific student.
         # This filters by HomeworkAssignment records, so only homework created
@@ -66,6 +83,23 @@ class HomeworkRepository:
         result = await self.session.execute(stmt)
         return list(result.unique().scalars().all())
 
+    async def get_page(
+        self,
+        params: CursorParams,
+        class_id: Optional[uuid.UUID] = None,
+        student_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        """Cursor-paginated homework, newest first (by creation, not due date)."""
+        query = select(Homework).options(joinedload(Homework.subject), joinedload(Homework.assignments))
+        if class_id is not None:
+            query = query.where(Homework.class_id == class_id)
+        if student_id is not None:
+            query = (
+                query.join(HomeworkAssignment, HomeworkAssignment.homework_id == Homework.id)
+                .where(HomeworkAssignment.student_id == student_id)
+            )
+        return await paginate_keyset(self.session, query, Homework, params)
+
     async def update(self, homework_id: uuid.UUID, homework_data: HomeworkUpdate) -> Optional[Homework]:
         homework = await self.get_by_id(homework_id)
         if not homework:
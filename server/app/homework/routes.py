@@ -1,12 +1,14 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Union
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from app.homework.repository import HomeworkRepository
 from app.homework.schemas import HomeworkCreate, HomeworkRead, HomeworkUpdate
 from app.homework.service import HomeworkService
 from config.database import AsyncSession, get_db
+from config.conditional import check_etag
 from config.dependences import get_current_user
+from config.pagination import CursorPaginatedResponse, CursorParams
 
 # NEW: notification + websocket
 from sqlalchemy import select
@@ -14,7 +16,7 @@ from app.classes.models import Class
 from app.notification.repository import NotificationRepository
 from app.notification.schemas import NotificationCreate
 from app.notification.models import NotificationType
-from app.websocket.manager import manager
+from app.notification.dispatcher import dispatcher
 
 # NEW: student model
 from app.users.models.students import Student
@@ -93,67 +95,84 @@ def _serialize_homework_read(hw) -> dict:
     }
 
 
-@router.post("/", response_model=HomeworkRead, status_code=status.HTTP_201_CREATED)
-async def create_homework(
-    homework_data: HomeworkCreate,
-    current_user: dict = Depends(get_current_user),
-    service: HomeworkService = Depends(get_homework_service),
-    session: AsyncSession = Depends(get_db),
-):
-    hw = await service.create_homework(homework_data)
-
-    # Notify: if homework has explicit assignments -> notify only those students.
-    # Otherwise notify all students in the class.
+async def _notify_homework_created(session: AsyncSession, homeworks: list) -> None:
+    """Store one notification per recipient with a bulk insert, then push them in the background."""
     try:
-        assigned_ids = [str(a.student_id) for a in getattr(hw, 'assignments', []) or []]
-
-        user_ids: List[str] = []
-        class_name: str | None = None
-
-        if assigned_ids:
-            user_ids = assigned_ids
-        else:
-            result = await session.execute(select(Class).where(Class.id == hw.class_id))
-            cls = result.scalar_one_or_none()
-            if cls:
-                class_name = getattr(cls, "name", None)
-            if cls and getattr(cls, "students", None):
-                user_ids = [str(s.user_id) for s in cls.students if getattr(s, "user_id", None)]
-
-        if user_ids:
-            notif_repo = NotificationRepository(session)
-            title, message = _build_homework_notification_text(hw, class_name)
+        class_ids = {hw.class_id for hw in homeworks if not getattr(hw, 'assignments', None)}
+        class_names: dict = {}
+        class_students: dict = {}
+        if class_ids:
+            result = await session.execute(select(Class.id, Class.name).where(Class.id.in_(class_ids)))
+            class_names = {row[0]: row[1] for row in result.all()}
+            result = await session.execute(
+                select(Student.class_id, Student.user_id).where(Student.class_id.in_(class_ids))
+            )
+            for class_id, student_id in result.all():
+                class_students.setdefault(class_id, []).append(student_id)
+
+        notifications: List[NotificationCreate] = []
+        homework_for: List = []
+        for hw in homeworks:
+            assigned_ids = [a.student_id for a in getattr(hw, 'assignments', []) or []]
+            if assigned_ids:
+                user_ids, class_name = assigned_ids, None
+            else:
+                user_ids, class_name = class_students.get(hw.class_id, []), class_names.get(hw.class_id)
 
+            title, message = _build_homework_notification_text(hw, class_name)
             for uid in user_ids:
-                notif = await notif_repo.create(
+                notifications.append(
                     NotificationCreate(
                         title=title,
                         message=message,
                         notification_type=NotificationType.NEW_HOMEWORK,
-                        user_id=uuid.UUID(uid),
+                        user_id=uid,
                     )
                 )
-
-                await manager.send_personal_message(
-                    {
-                        "type": "homework",
-                        "event": "created",
-                        "notification": {
-                            "id": str(notif.id),
-                            "title": notif.title,
-                            "message": notif.message,
-                            "notification_type": notif.notification_type,
-                            "is_read": notif.is_read,
-                            "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
-                            "user_id": str(notif.user_id),
-                        },
-                        "homework": _serialize_homework_read(hw),
+                homework_for.append(hw)
+
+        if not notifications:
+            return
+
+        created = await NotificationRepository(session).create_many(notifications)
+
+        dispatcher.dispatch([
+            (
+                str(notif.user_id),
+                {
+                    "type": "homework",
+                    "event": "created",
+                    "notification": {
+                        "id": str(notif.id),
+                        "title": notif.title,
+                        "message": notif.message,
+                        "notification_type": notif.notification_type,
+                        "is_read": notif.is_read,
+                        "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
+                        "user_id": str(notif.user_id),
                     },
-                    user_id=str(uid),
-                )
+                    "homework": _serialize_homework_read(hw),
+                },
+            )
+            for notif, hw in zip(created, homework_for)
+        ])
     except Exception:
         pass
 
+
+@router.post("/", response_model=HomeworkRead, status_code=status.HTTP_201_CREATED)
+async def create_homework(
+    homework_data: HomeworkCreate,
+    current_user: dict = Depends(get_current_user),
+    service: HomeworkService = Depends(get_homework_service),
+    session: AsyncSession = Depends(get_db),
+):
+    hw = await service.create_homework(homework_data)
+
+    # Notify: if homework has explicit assignments -> notify only those students.
+    # Otherwise notify all students in the class.
+    await _notify_homework_created(session, [hw])
+
     return HomeworkRead.from_orm_with_assignments(hw)
 
 
@@ -167,68 +186,22 @@ async def create_homework_bulk(
     created = await service.bulk_create_homework(homeworks)
 
     # Notify students for each created homework
-    try:
-        notif_repo = NotificationRepository(session)
-
-        # Group by class id to avoid repeated Selects
-        class_ids = {c.class_id for c in created if getattr(c, "class_id", None)}
-        class_map = {}
-        for cid in class_ids:
-            result = await session.execute(select(Class).where(Class.id == cid))
-            class_map[cid] = result.scalar_one_or_none()
+    await _notify_homework_created(session, created)
 
-        for hw in created:
-            assigned_ids = [str(a.student_id) for a in getattr(hw, 'assignments', []) or []]
+    return [HomeworkRead.from_orm_with_assignments(hw) for hw in created]
 
-            user_ids: List[str] = []
-            class_name: str | None = None
 
-            if assigned_ids:
-                user_ids = assigned_ids
-            else:
-                cls = class_map.get(hw.class_id)
-                if not cls or not getattr(cls, "students", None):
-                    continue
-                class_name = getattr(cls, "name", None)
-                user_ids = [str(s.user_id) for s in cls.students if getattr(s, "user_id", None)]
+HomeworkList = Union[List[HomeworkRead], CursorPaginatedResponse[HomeworkRead]]
 
-            title, message = _build_homework_notification_text(hw, class_name)
 
-            for uid in user_ids:
-                notif = await notif_repo.create(
-                    NotificationCreate(
-                        title=title,
-                        message=message,
-                        notification_type=NotificationType.NEW_HOMEWORK,
-                        user_id=uuid.UUID(uid),
-                    )
-                )
-
-                await manager.send_personal_message(
-                    {
-                        "type": "homework",
-                        "event": "created",
-                        "notification": {
-                            "id": str(notif.id),
-                            "title": notif.title,
-                            "message": notif.message,
-                            "notification_type": notif.notification_type,
-                            "is_read": notif.is_read,
-                            "created_at": notif.created_at.isoformat() if getattr(notif, "created_at", None) else None,
-                            "user_id": str(notif.user_id),
-                        },
-                        "homework": _serialize_homework_read(hw),
-                    },
-                    user_id=str(uid),
-                )
-    except Exception:
-        pass
-
-    return [HomeworkRead.from_orm_with_assignments(hw) for hw in created]
+def _homework_page(page: dict) -> dict:
+    page["items"] = [HomeworkRead.from_orm_with_assignments(hw) for hw in page["items"]]
+    return page
 
 
-@router.get("/my", response_model=List[HomeworkRead])
+@router.get("/my", response_model=HomeworkList)
 async def get_my_homework(
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: HomeworkService = Depends(get_homework_service),
     session: AsyncSession = Depends(get_db),
@@ -236,6 +209,8 @@ async def get_my_homework(
     # For students: returns ONLY homework explicitly assigned to this student.
     # Only homework with a HomeworkAssignment entry for this student will be returned.
     user_id = uuid.UUID(current_user["id"])
+    if page.enabled:
+        return _homework_page(await service.get_homework_page(page, student_id=user_id))
     result = await session.execute(select(Student).where(Student.user_id == user_id))
     student = result.scalar_one_or_none()
     class_id = getattr(student, 'class_id', None) if student else None
@@ -244,12 +219,21 @@ async def get_my_homework(
     return [HomeworkRead.from_orm_with_assignments(hw) for hw in items]
 
 
-@router.get("/class/{class_id}", response_model=List[HomeworkRead])
+@router.get("/class/{class_id}", response_model=HomeworkList)
 async def get_class_homework(
     class_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: HomeworkService = Depends(get_homework_service)
 ):
+    """Homework of a class. Supports If-None-Match (304 when unchanged)."""
+    not_modified = check_etag(request, response, await service.get_class_version(class_id))
+    if not_modified:
+        return not_modified
+    if page.enabled:
+        return _homework_page(await service.get_homework_page(page, class_id=class_id))
     items = await service.get_class_homework(class_id)
     return [HomeworkRead.from_orm_with_assignments(hw) for hw in items]
 
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 from app.homework.models import Homework
 from app.homework.repository import HomeworkRepository
 from app.homework.schemas import HomeworkCreate, HomeworkUpdate
+from config.pagination import CursorParams
 
 
 class HomeworkService:
@@ -26,9 +27,20 @@ class HomeworkService:
     async def get_class_homework(self, class_id: uuid.UUID) -> List[Homework]:
         return await self.repository.get_by_class(class_id)
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        return await self.repository.get_class_version(class_id)
+
     async def get_student_homework(self, student_id: uuid.UUID, class_id: Optional[uuid.UUID]) -> List[Homework]:
         return await self.repository.get_for_student(student_id=student_id, class_id=class_id)
 
+    async def get_homework_page(
+        self,
+        params: CursorParams,
+        class_id: Optional[uuid.UUID] = None,
+        student_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        return await self.repository.get_page(params, class_id=class_id, student_id=student_id)
+
     async def update_homework(self, homework_id: uuid.UUID, homework_data: HomeworkUpdate) -> Homework:
         homework = await self.repository.update(homework_id, homework_data)
         if not homework:
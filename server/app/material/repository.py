@@ -5,7 +5,9 @@ from sqlalchemy.orm import joinedload
 
 from app.material.models import Material
 from app.material.schemas import MaterialCreate, MaterialUpdate
+from config.conditional import collection_version
 from config.database import AsyncSession
+from config.pagination import CursorParams, paginate_keyset
 
 
 class MaterialRepository:
@@ -36,6 +38,13 @@ class MaterialRepository:
         )
         return list(result.scalars().all())
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        """Version of a class's materials and the subject/teacher info in them, for ETags."""
+        result = await self.session.execute(
+            collection_version(Material, Material.class_id == class_id, related=(Material.subject, Material.teacher))
+        )
+        return tuple(result.one())
+
     async def get_by_subject(self, subject_id: uuid.UUID) -> List[Material]:
         result = await self.session.execute(
             select(Material)
@@ -54,6 +63,23 @@ class MaterialRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        params: CursorParams,
+        class_id: Optional[uuid.UUID] = None,
+        subject_id: Optional[uuid.UUID] = None,
+        teacher_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        """Cursor-paginated materials, newest first, optionally filtered."""
+        query = select(Material).options(joinedload(Material.subject), joinedload(Material.teacher))
+        if class_id is not None:
+            query = query.where(Material.class_id == class_id)
+        if subject_id is not None:
+            query = query.where(Material.subject_id == subject_id)
+        if teacher_id is not None:
+            query = query.where(Material.teacher_id == teacher_id)
+        return await paginate_keyset(self.session, query, Material, params)
+
     async def update(self, material_id: uuid.UUID, material_data: MaterialUpdate) -> Optional[Material]:
         material = await self.get_by_id(material_id)
         if not material:
@@ -1,15 +1,19 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Union
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from app.material.repository import MaterialRepository
 from app.material.schemas import MaterialCreate, MaterialRead, MaterialUpdate
 from app.material.service import MaterialService
 from config.database import AsyncSession, get_db
+from config.conditional import check_etag
 from config.dependences import get_current_user
+from config.pagination import CursorPaginatedResponse, CursorParams
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
+MaterialList = Union[List[MaterialRead], CursorPaginatedResponse[MaterialRead]]
+
 
 async def get_material_service(session: AsyncSession = Depends(get_db)) -> MaterialService:
     repository = MaterialRepository(session)
@@ -25,30 +29,45 @@ async def create_material(
     return await service.create_material(material_data)
 
 
-@router.get("/class/{class_id}", response_model=List[MaterialRead])
+@router.get("/class/{class_id}", response_model=MaterialList)
 async def get_class_materials(
     class_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: MaterialService = Depends(get_material_service)
 ):
+    """Materials of a class. Supports If-None-Match (304 when unchanged)."""
+    not_modified = check_etag(request, response, await service.get_class_version(class_id))
+    if not_modified:
+        return not_modified
+    if page.enabled:
+        return await service.get_materials_page(page, class_id=class_id)
     return await service.get_class_materials(class_id)
 
 
-@router.get("/subject/{subject_id}", response_model=List[MaterialRead])
+@router.get("/subject/{subject_id}", response_model=MaterialList)
 async def get_subject_materials(
     subject_id: uuid.UUID,
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: MaterialService = Depends(get_material_service)
 ):
+    if page.enabled:
+        return await service.get_materials_page(page, subject_id=subject_id)
     return await service.get_subject_materials(subject_id)
 
 
-@router.get("/teacher/{teacher_id}", response_model=List[MaterialRead])
+@router.get("/teacher/{teacher_id}", response_model=MaterialList)
 async def get_teacher_materials(
     teacher_id: uuid.UUID,
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: MaterialService = Depends(get_material_service)
 ):
+    if page.enabled:
+        return await service.get_materials_page(page, teacher_id=teacher_id)
     return await service.get_teacher_materials(teacher_id)
 
 
@@ -1,10 +1,11 @@
 import uuid
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.material.models import Material
 from app.material.repository import MaterialRepository
 from app.material.schemas import MaterialCreate, MaterialUpdate
+from config.pagination import CursorParams
 
 
 class MaterialService:
@@ -26,12 +27,24 @@ class MaterialService:
     async def get_class_materials(self, class_id: uuid.UUID) -> List[Material]:
         return await self.repository.get_by_class(class_id)
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        return await self.repository.get_class_version(class_id)
+
     async def get_subject_materials(self, subject_id: uuid.UUID) -> List[Material]:
         return await self.repository.get_by_subject(subject_id)
 
     async def get_teacher_materials(self, teacher_id: uuid.UUID) -> List[Material]:
         return await self.repository.get_by_teacher(teacher_id)
 
+    async def get_materials_page(
+        self,
+        params: CursorParams,
+        class_id: Optional[uuid.UUID] = None,
+        subject_id: Optional[uuid.UUID] = None,
+        teacher_id: Optional[uuid.UUID] = None,
+    ) -> dict:
+        return await self.repository.get_page(params, class_id=class_id, subject_id=subject_id, teacher_id=teacher_id)
+
     async def update_material(self, material_id: uuid.UUID, material_data: MaterialUpdate) -> Material:
         material = await self.repository.update(material_id, material_data)
         if not material:
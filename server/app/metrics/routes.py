@@ -0,0 +1,28 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from config.metrics import render
+
+router = APIRouter(tags=["Metrics"])
+http_bearer = HTTPBearer(auto_error=False)
+
+# Scrapers send it as a bearer token; leave unset when /metrics is only reachable internally
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def metrics_auth(credentials: HTTPAuthorizationCredentials = Depends(http_bearer)):
+    if METRICS_TOKEN and not (credentials and hmac.compare_digest(credentials.credentials, METRICS_TOKEN)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(metrics_auth)])
+async def get_metrics():
+    """Prometheus exposition of this worker's (or, in multiprocess mode, all workers') metrics"""
+    return Response(content=render(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,91 @@
+"""
+Background delivery of notification payloads over WebSocket.
+
+Routes persist notifications first and then hand the payloads to the dispatcher, so
+the HTTP response does not wait for one WebSocket send per recipient.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+
+from app.websocket.manager import manager
+from config.metrics import NOTIFICATION_FANOUT
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_DISPATCH_QUEUE_SIZE = int(os.getenv("NOTIFICATION_DISPATCH_QUEUE_SIZE", "1000"))
+# How long shutdown waits for queued batches to be published before dropping them
+NOTIFICATION_DISPATCH_DRAIN_TIMEOUT = float(os.getenv("NOTIFICATION_DISPATCH_DRAIN_TIMEOUT", "5"))
+
+# (user_id, message)
+Delivery = Tuple[str, dict]
+
+
+class NotificationDispatcher:
+    """Queue of delivery batches drained by a single background task."""
+
+    def __init__(self, max_batches: int = NOTIFICATION_DISPATCH_QUEUE_SIZE):
+        self.queue: asyncio.Queue[List[Delivery]] = asyncio.Queue(maxsize=max_batches)
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        # Started lazily so the queue and task belong to the running event loop
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def dispatch(self, deliveries: List[Delivery]) -> int:
+        """Queue payloads for online users; returns how many were queued.
+
+        Offline users are skipped: their notifications are already stored and will be
+        fetched through /notifications/my-notifications. With a multi-worker broker,
+        presence is only known per worker, so everything is published.
+        """
+        if deliveries:
+            NOTIFICATION_FANOUT.labels(deliveries[0][1].get("type", "other")).observe(len(deliveries))
+        batch = deliveries
+        if manager.broker.is_local:
+            batch = [(user_id, message) for user_id, message in deliveries if manager.is_user_online(user_id)]
+        if not batch:
+            return 0
+
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait(batch)
+        except asyncio.QueueFull:
+            logger.warning(f"Notification dispatch queue full, dropping {len(batch)} WebSocket messages")
+            return 0
+        return len(batch)
+
+    async def _run(self):
+        while True:
+            batch = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                await manager.send_many(batch)
+            except Exception as e:
+                logger.warning(f"Notification dispatch failed: {e}")
+            finally:
+                self.queue.task_done()
+            logger.info(f"Dispatched {len(batch)} WebSocket messages in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    async def stop(self, timeout: float = NOTIFICATION_DISPATCH_DRAIN_TIMEOUT):
+        """Publish what is still queued (up to `timeout` seconds), then stop the worker."""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Notification dispatch drain timed out, dropping {self.queue.qsize()} batches")
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+
+# Global dispatcher instance
+dispatcher = NotificationDispatcher()
@@ -1,15 +1,26 @@
+import logging
+import os
+import time
 import uuid
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, insert
 
 from app.notification.models import Notification
 from app.notification.schemas import NotificationCreate, NotificationUpdate
 from config.database import AsyncSession
+from config.pagination import CursorParams, paginate_keyset
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row INSERT; keeps each statement well below asyncpg's 32767 bind parameter limit
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "1000"))
 
 
 class NotificationRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Timings of the batches written by the last create_many() call
+        self.batch_timings: List[dict] = []
 
     async def create(self, notification_data: NotificationCreate) -> Notification:
         notification = Notification(**notification_data.model_dump())
@@ -18,6 +29,34 @@ class NotificationRepository:
         await self.session.refresh(notification)
         return notification
 
+    async def create_many(
+        self,
+        notifications_data: List[NotificationCreate],
+        commit: bool = True,
+        batch_size: int = NOTIFICATION_BATCH_SIZE,
+    ) -> List[Notification]:
+        """Insert notifications with one INSERT ... RETURNING per batch, in input order."""
+        self.batch_timings = []
+        created: List[Notification] = []
+        for start in range(0, len(notifications_data), batch_size):
+            batch = notifications_data[start:start + batch_size]
+            rows = [{"id": uuid.uuid4(), "is_read": False, **n.model_dump()} for n in batch]
+
+            started = time.perf_counter()
+            result = await self.session.scalars(
+                insert(Notification).values(rows).returning(Notification)
+            )
+            by_id = {n.id: n for n in result.all()}
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            created.extend(by_id[row["id"]] for row in rows)
+            self.batch_timings.append({"rows": len(rows), "ms": round(elapsed_ms, 2)})
+            logger.info(f"Inserted notification batch {len(self.batch_timings)}: {len(rows)} rows in {elapsed_ms:.1f} ms")
+
+        if commit and created:
+            await self.session.commit()
+        return created
+
     async def get_by_id(self, notification_id: uuid.UUID) -> Optional[Notification]:
         result = await self.session.execute(
             select(Notification).where(Notification.id == notification_id)
@@ -32,6 +71,10 @@ class NotificationRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page_by_user(self, user_id: uuid.UUID, params: CursorParams) -> dict:
+        query = select(Notification).where(Notification.user_id == user_id)
+        return await paginate_keyset(self.session, query, Notification, params)
+
     async def mark_as_read(self, notification_id: uuid.UUID) -> Optional[Notification]:
         notification = await self.get_by_id(notification_id)
         if not notification:
@@ -1,12 +1,17 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Union
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 
+from app.notification.dispatcher import dispatcher
+from app.notification.models import NotificationType
 from app.notification.repository import NotificationRepository
 from app.notification.schemas import NotificationCreate, NotificationRead
 from app.notification.service import NotificationService
 from config.database import AsyncSession, get_db
-from config.dependences import get_current_user
+from app.users.models import User, UserRole
+from config.dependences import get_current_user, get_teacher_flags
+from config.pagination import CursorPaginatedResponse, CursorParams
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -25,12 +30,18 @@ async def create_notification(
     return await service.create_notification(notification_data)
 
 
-@router.get("/my-notifications", response_model=List[NotificationRead])
+@router.get(
+    "/my-notifications",
+    response_model=Union[List[NotificationRead], CursorPaginatedResponse[NotificationRead]]
+)
 async def get_my_notifications(
+    page: CursorParams = Depends(),
     current_user: dict = Depends(get_current_user),
     service: NotificationService = Depends(get_notification_service)
 ):
     user_id = uuid.UUID(current_user["id"])
+    if page.enabled:
+        return await service.get_user_notifications_page(user_id, page)
     return await service.get_user_notifications(user_id)
 
 
@@ -55,71 +66,59 @@ async def broadcast_announcement(
     """
     Broadcast announcement to all users or specific roles (Director only).
     """
-    from sqlalchemy import select
-    from app.users.models.user import User, UserRole
-    from app.websocket.manager import manager
-
     # Check if user is director
-    user_id = uuid.UUID(current_user["id"])
-    from app.users.models.teachers import Teacher
-    result = await session.execute(
-        select(Teacher).where(Teacher.user_id == user_id)
-    )
-    teacher = result.scalar_one_or_none()
-
-    if not teacher or not teacher.is_director:
-        from fastapi import HTTPException
+    flags = await get_teacher_flags(current_user["id"], session)
+    if not flags or not flags["is_director"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only directors can broadcast announcements"
         )
 
-    # Get all users based on target roles
-    query = select(User)
+    # Get all user ids based on target roles
+    query = select(User.id)
     if target_roles:
         role_enums = [UserRole(role) for role in target_roles]
         query = query.where(User.role.in_(role_enums))
 
     result = await session.execute(query)
-    users = list(result.scalars().all())
-
-    # Create notifications for all users
-    notifications_created = 0
-    for user in users:
-        notif = await service.create_notification(
-            NotificationCreate(
-                title=title,
-                message=message,
-                notification_type=NotificationType.ANNOUNCEMENT,
-                user_id=user.id
-            )
+    user_ids = list(result.scalars().all())
+
+    # Create notifications for all users in bulk
+    repository = service.repository
+    notifications = await repository.create_many([
+        NotificationCreate(
+            title=title,
+            message=message,
+            notification_type=NotificationType.ANNOUNCEMENT,
+            user_id=uid
         )
-
-        # Send via WebSocket
-        try:
-            await manager.send_personal_message(
-                {
-                    "type": "announcement",
-                    "event": "created",
-                    "notification": {
-                        "id": str(notif.id),
-                        "title": notif.title,
-                        "message": notif.message,
-                        "notification_type": notif.notification_type,
-                        "created_at": notif.created_at.isoformat(),
-                    }
-                },
-                str(user.id)
-            )
-        except Exception:
-            pass
-
-        notifications_created += 1
+        for uid in user_ids
+    ])
+
+    # Send via WebSocket in the background
+    dispatcher.dispatch([
+        (
+            str(notif.user_id),
+            {
+                "type": "announcement",
+                "event": "created",
+                "notification": {
+                    "id": str(notif.id),
+                    "title": notif.title,
+                    "message": notif.message,
+                    "notification_type": notif.notification_type,
+                    "created_at": notif.created_at.isoformat(),
+                }
+            },
+        )
+        for notif in notifications
+    ])
 
     return {
         "success": True,
-        "message": f"Announcement sent to {notifications_created} users",
-        "count": notifications_created
+        "message": f"Announcement sent to {len(notifications)} users",
+        "count": len(notifications),
+        "batches": repository.batch_timings
     }
 
 
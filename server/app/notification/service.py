@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 from app.notification.models import Notification
 from app.notification.repository import NotificationRepository
 from app.notification.schemas import NotificationCreate
+from config.pagination import CursorParams
 
 
 class NotificationService:
@@ -26,6 +27,9 @@ class NotificationService:
     async def get_user_notifications(self, user_id: uuid.UUID) -> List[Notification]:
         return await self.repository.get_by_user(user_id)
 
+    async def get_user_notifications_page(self, user_id: uuid.UUID, params: CursorParams) -> dict:
+        return await self.repository.get_page_by_user(user_id, params)
+
     async def mark_as_read(self, notification_id: uuid.UUID) -> Notification:
         notification = await self.repository.mark_as_read(notification_id)
         if not notification:
@@ -0,0 +1,140 @@
+"""
+Argon2 password hashing off the event loop.
+
+Hashing and verifying a password takes tens of milliseconds of CPU. Running it inline
+in an async handler stalls every other request on the worker (including WebSocket
+pings), so all calls go through a small thread pool instead; argon2-cffi releases the
+GIL while hashing, so the threads run in parallel. A semaphore bounds how many hashes
+run at once and how long a request may wait for a slot, so a login burst queues
+briefly and then fails fast with 503 instead of piling up.
+
+Cost parameters come from ARGON2_TIME_COST / ARGON2_MEMORY_COST / ARGON2_PARALLELISM;
+tools/benchmark_argon2.py suggests values for a target latency on the host. Hashes
+made with other parameters keep verifying and are upgraded on the next login.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# Defaults are passlib's, so existing hashes are not upgraded until the costs are tuned
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+R = TypeVar("R")
+
+
+class PasswordHasher:
+    """Async facade over pwd_context with bounded concurrency and latency stats."""
+
+    def __init__(
+        self,
+        context: CryptContext,
+        concurrency: int = PASSWORD_HASH_CONCURRENCY,
+        queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT,
+    ):
+        self.context = context
+        self.concurrency = concurrency
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="argon2")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.total_hash_ms = 0.0
+        self.max_hash_ms = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        semaphore = self._get_semaphore()
+        queued = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Password hashing queue timed out after {self.queue_timeout}s ({self.waiting} waiting)")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again"
+            )
+        finally:
+            self.waiting -= 1
+
+        started = time.perf_counter()
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.running -= 1
+            self.calls += 1
+            self.total_wait_ms += (started - queued) * 1000
+            self.total_hash_ms += elapsed_ms
+            self.max_hash_ms = max(self.max_hash_ms, elapsed_ms)
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: Optional[str]) -> bool:
+        if not password_hash:
+            return False
+        return await self._run(self.context.verify, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Verify, and return a new hash when the stored one uses outdated parameters."""
+        if not password_hash:
+            return False, None
+        return await self._run(self.context.verify_and_update, password, password_hash)
+
+    def get_stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_timeout": self.queue_timeout,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait_ms / self.calls, 2) if self.calls else 0.0,
+            "avg_hash_ms": round(self.total_hash_ms / self.calls, 2) if self.calls else 0.0,
+            "max_hash_ms": round(self.max_hash_ms, 2),
+            "argon2": {
+                "time_cost": ARGON2_TIME_COST,
+                "memory_cost": ARGON2_MEMORY_COST,
+                "parallelism": ARGON2_PARALLELISM,
+            },
+        }
+
+
+# Global hasher instance
+password_hasher = PasswordHasher(pwd_context)
@@ -2,6 +2,7 @@ from fastapi import HTTPException, BackgroundTasks
 from datetime import datetime
 from app.password.repositories import PasswordRepository
 from app.password.schemas import ResetPasswordSchema, ChangePasswordSchema
+from app.password.hasher import password_hasher
 from app.password.utils import hash_password, send_email
 from app.password.template_email import build_reset_password_html
 
@@ -38,10 +39,10 @@ class PasswordService:
         ):
             raise HTTPException(status_code=400, detail="Cod invalid sau expirat")
 
-        if user.password and user.verify_password(data.password):
+        if user.password and await password_hasher.verify(data.password, user.password):
             raise HTTPException(status_code=400, detail="Parola nouă nu poate fi aceeași cu cea veche")
 
-        password_hash = hash_password(data.password)
+        password_hash = await hash_password(data.password)
         ok = await self.repo.reset_password(data.email, data.code, password_hash)
         if not ok:
             raise HTTPException(status_code=400, detail="Cod invalid sau email greșit")
@@ -80,7 +81,7 @@ class PasswordService:
         ):
             raise HTTPException(status_code=400, detail="Cod invalid sau expirat")
 
-        password_hash = hash_password(data.password)
+        password_hash = await hash_password(data.password)
         await self.repo.set_password_and_activate(user, password_hash)
         return {"message": "Parola a fost setată și contul activat"}
 
@@ -89,7 +90,7 @@ class PasswordService:
         if not user:
             raise HTTPException(status_code=404, detail="Utilizatorul nu a fost găsit")
 
-        if not user.verify_password(data.current_password):
+        if not await password_hasher.verify(data.current_password, user.password):
             raise HTTPException(status_code=400, detail="Parola curentă este incorectă")
 
         if data.current_password == data.new_password:
@@ -98,6 +99,6 @@ class PasswordService:
         if len(data.new_password) < 6:
             raise HTTPException(status_code=400, detail="Parola nouă trebuie să aibă minim 6 caractere")
 
-        new_password_hash = hash_password(data.new_password)
+        new_password_hash = await hash_password(data.new_password)
         await self.repo.change_password(user, new_password_hash)
         return {"message": "Parola a fost schimbată cu succes"}
@@ -1,4 +1,3 @@
-from passlib.context import CryptContext
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -7,6 +6,8 @@ from fastapi import HTTPException
 import os
 import logging
 
+from app.password.hasher import password_hasher
+
 try:
     from dotenv import load_dotenv
 
@@ -16,11 +17,10 @@ except Exception as e:
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 
-def hash_password(pwd: str):
-    return pwd_context.hash(pwd)
+async def hash_password(pwd: str) -> str:
+    return await password_hasher.hash(pwd)
 
 
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -0,0 +1,142 @@
+import uuid
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, func
+
+from app.classes.models import Class
+from app.grade.models import GradeModel
+from app.homework.models import Homework
+from app.stats.models import (
+    StudentSubjectGradeStats,
+    ClassSubjectGradeStats,
+    StudentAttendanceStats,
+    ClassAttendanceStats,
+)
+from app.subject.models import Subject
+from app.users.models.students import Student
+from app.users.models.teachers import Teacher
+from app.users.models.users import User
+from config.database import AsyncSession
+
+
+def _attendance_total(model):
+    return model.present_count + model.absent_count + model.late_count + model.excused_count
+
+
+class ReportsRepository:
+    """Set-based aggregation queries used by the reports endpoints.
+
+    Grade and attendance totals are read from the rollup tables maintained by the
+    grade/attendance repositories (see app.stats), so the amount of data read is
+    proportional to the number of classes or students, not to the number of rows.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_classes_with_student_counts(self, school_id: uuid.UUID) -> List[Tuple[uuid.UUID, str, int]]:
+        result = await self.session.execute(
+            select(Class.id, Class.name, func.count(Student.user_id))
+            .outerjoin(Student, Student.class_id == Class.id)
+            .where(Class.school_id == school_id)
+            .group_by(Class.id, Class.name)
+            .order_by(Class.name)
+        )
+        return [(row[0], row[1], row[2]) for row in result.all()]
+
+    async def get_grade_totals_by_class(self, school_id: uuid.UUID) -> Dict[uuid.UUID, Tuple[int, int]]:
+        """Return {class_id: (sum_of_values, grade_count)} from the class rollup table."""
+        result = await self.session.execute(
+            select(
+                ClassSubjectGradeStats.class_id,
+                func.sum(ClassSubjectGradeStats.grade_sum),
+                func.sum(ClassSubjectGradeStats.grade_count),
+            )
+            .join(Class, Class.id == ClassSubjectGradeStats.class_id)
+            .where(Class.school_id == school_id)
+            .group_by(ClassSubjectGradeStats.class_id)
+        )
+        return {row[0]: (int(row[1] or 0), int(row[2] or 0)) for row in result.all()}
+
+    async def get_attendance_totals_by_class(self, school_id: uuid.UUID) -> Dict[uuid.UUID, Tuple[int, int]]:
+        """Return {class_id: (present_count, total_count)} from the class rollup table."""
+        result = await self.session.execute(
+            select(ClassAttendanceStats.class_id, ClassAttendanceStats.present_count, _attendance_total(ClassAttendanceStats))
+            .join(Class, Class.id == ClassAttendanceStats.class_id)
+            .where(Class.school_id == school_id)
+        )
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
+    async def get_grade_totals_by_student(self, student_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[int, int]]:
+        """Return {student_id: (sum_of_values, grade_count)} from the student rollup table."""
+        if not student_ids:
+            return {}
+        result = await self.session.execute(
+            select(
+                StudentSubjectGradeStats.student_id,
+                func.sum(StudentSubjectGradeStats.grade_sum),
+                func.sum(StudentSubjectGradeStats.grade_count),
+            )
+            .where(StudentSubjectGradeStats.student_id.in_(student_ids))
+            .group_by(StudentSubjectGradeStats.student_id)
+        )
+        return {row[0]: (int(row[1] or 0), int(row[2] or 0)) for row in result.all()}
+
+    async def get_attendance_totals_by_student(self, student_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[int, int]]:
+        """Return {student_id: (present_count, total_count)} from the student rollup table."""
+        if not student_ids:
+            return {}
+        result = await self.session.execute(
+            select(StudentAttendanceStats.student_id, StudentAttendanceStats.present_count, _attendance_total(StudentAttendanceStats))
+            .where(StudentAttendanceStats.student_id.in_(student_ids))
+        )
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
+    async def get_recent_grades(self, student_ids: List[uuid.UUID], per_student: int = 5) -> Dict[uuid.UUID, List[dict]]:
+        """Return the latest `per_student` grades of each student, newest first."""
+        if not student_ids:
+            return {}
+        ranked = (
+            select(
+                GradeModel.student_id,
+                GradeModel.value,
+                GradeModel.types,
+                GradeModel.created_at,
+                Subject.name.label("subject_name"),
+                func.row_number().over(
+                    partition_by=GradeModel.student_id,
+                    order_by=GradeModel.created_at.desc(),
+                ).label("rn"),
+            )
+            .outerjoin(Subject, Subject.id == GradeModel.subject_id)
+            .where(GradeModel.student_id.in_(student_ids))
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(ranked).where(ranked.c.rn <= per_student).order_by(ranked.c.student_id, ranked.c.rn)
+        )
+        recent: Dict[uuid.UUID, List[dict]] = {}
+        for row in result.mappings().all():
+            recent.setdefault(row["student_id"], []).append({
+                "value": row["value"],
+                "subject_name": row["subject_name"] or "Unknown",
+                "type": row["types"].value,
+                "created_at": row["created_at"].isoformat()
+            })
+        return recent
+
+    async def count_teachers(self, school_id: uuid.UUID) -> int:
+        result = await self.session.scalar(
+            select(func.count(Teacher.user_id))
+            .join(User, User.id == Teacher.user_id)
+            .where(User.school_id == school_id)
+        )
+        return result or 0
+
+    async def count_homework(self, school_id: uuid.UUID) -> int:
+        result = await self.session.scalar(
+            select(func.count(Homework.id))
+            .join(Class, Class.id == Homework.class_id)
+            .where(Class.school_id == school_id)
+        )
+        return result or 0
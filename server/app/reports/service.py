@@ -0,0 +1,106 @@
+import uuid
+
+from app.classes.models import Class
+from app.reports.repository import ReportsRepository
+
+
+def _rate(part: int, total: int) -> float:
+    return (part / total * 100) if total > 0 else 0
+
+
+class ReportsService:
+    def __init__(self, repository: ReportsRepository):
+        self.repository = repository
+
+    async def get_homeroom_report(self, school_class: Class) -> dict:
+        """Build the homeroom report for a class whose students (and users) are loaded."""
+        student_ids = [s.user_id for s in school_class.students]
+        grade_totals = await self.repository.get_grade_totals_by_student(student_ids)
+        attendance_totals = await self.repository.get_attendance_totals_by_student(student_ids)
+        recent_grades = await self.repository.get_recent_grades(student_ids)
+
+        students_report = []
+        for student in school_class.students:
+            grade_sum, grade_count = grade_totals.get(student.user_id, (0, 0))
+            present_count, total_attendance = attendance_totals.get(student.user_id, (0, 0))
+            avg_grade = grade_sum / grade_count if grade_count else 0.0
+
+            students_report.append({
+                "student_id": str(student.user_id),
+                "username": student.user.username if student.user else "Unknown",
+                "email": student.user.email if student.user else "",
+                "average_grade": round(avg_grade, 2),
+                "total_grades": grade_count,
+                "attendance_rate": round(_rate(present_count, total_attendance), 1),
+                "present_count": present_count,
+                "total_attendance": total_attendance,
+                "recent_grades": recent_grades.get(student.user_id, [])
+            })
+
+        # Class-wide statistics
+        class_sum = sum(s for s, _ in grade_totals.values())
+        class_count = sum(c for _, c in grade_totals.values())
+        all_present = sum(p for p, _ in attendance_totals.values())
+        all_attendance = sum(t for _, t in attendance_totals.values())
+
+        return {
+            "class_info": {
+                "id": str(school_class.id),
+                "name": school_class.name,
+                "total_students": len(school_class.students)
+            },
+            "class_statistics": {
+                "average_grade": round(class_sum / class_count, 2) if class_count else 0,
+                "total_grades": class_count,
+                "attendance_rate": round(_rate(all_present, all_attendance), 1),
+                "present_count": all_present,
+                "total_attendance": all_attendance
+            },
+            "students": students_report
+        }
+
+    async def get_school_overview(self, school_id: uuid.UUID) -> dict:
+        classes = await self.repository.get_classes_with_student_counts(school_id)
+        grade_totals = await self.repository.get_grade_totals_by_class(school_id)
+        attendance_totals = await self.repository.get_attendance_totals_by_class(school_id)
+        total_teachers = await self.repository.count_teachers(school_id)
+        total_homework = await self.repository.count_homework(school_id)
+
+        classes_report = []
+        for class_id, name, student_count in classes:
+            grade_sum, grade_count = grade_totals.get(class_id, (0, 0))
+            present, total_att = attendance_totals.get(class_id, (0, 0))
+            avg_grade = grade_sum / grade_count if grade_count else 0.0
+
+            classes_report.append({
+                "class_id": str(class_id),
+                "name": name,
+                "total_students": student_count,
+                "average_grade": round(avg_grade, 2),
+                "total_grades": grade_count,
+                "attendance_rate": round(_rate(present, total_att), 1)
+            })
+
+        # Overall statistics are derived from the per-class totals (weighted, not averaged averages)
+        overall_sum = sum(s for s, _ in grade_totals.values())
+        overall_count = sum(c for _, c in grade_totals.values())
+        overall_present = sum(p for p, _ in attendance_totals.values())
+        overall_attendance = sum(t for _, t in attendance_totals.values())
+
+        return {
+            "school_statistics": {
+                "total_classes": len(classes),
+                "total_students": sum(count for _, _, count in classes),
+                "total_teachers": total_teachers,
+                "total_grades": overall_count,
+                "average_grade": round(overall_sum / overall_count, 2) if overall_count else 0,
+                "total_homework": total_homework,
+                "attendance_rate": round(_rate(overall_present, overall_attendance), 1)
+            },
+            "classes": classes_report,
+            "top_performing_classes": sorted(
+                [c for c in classes_report if c["average_grade"] > 0],
+                key=lambda x: x["average_grade"],
+                reverse=True
+            )[:5]
+        }
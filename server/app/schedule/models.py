@@ -3,7 +3,7 @@ import uuid
 from datetime import time, datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, CheckConstraint
+from sqlalchemy import ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
@@ -30,6 +30,8 @@ class Schedule(Base):
     __tablename__ = "schedules"
     __table_args__ = (
         CheckConstraint('period_number >= 1 AND period_number <= 10', name='period_number_range'),
+        Index("ix_schedules_class_slot", "class_id", "day_of_week", "period_number"),
+        Index("ix_schedules_teacher_slot", "teacher_id", "day_of_week", "period_number"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -6,6 +6,8 @@ from sqlalchemy.orm import joinedload
 from app.schedule.models import Schedule
 from app.schedule.schemas import ScheduleCreate, ScheduleUpdate
 from app.users.models.teacher_subjects import TeacherClassSubject
+from config.cache import invalidate, teacher_assignments_cache, teacher_home_cache
+from config.conditional import collection_version
 from config.database import AsyncSession
 
 
@@ -13,14 +15,14 @@ class ScheduleRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def _ensure_teacher_class_subject(self, *, teacher_id: uuid.UUID, class_id: uuid.UUID, subject_id: uuid.UUID) -> None:
-        """Upsert a TeacherClassSubject row for the given triple.
+    async def _ensure_teacher_class_subject(self, *, teacher_id: uuid.UUID, class_id: uuid.UUID, subject_id: uuid.UUID) -> bool:
+        """Upsert a TeacherClassSubject row for the given triple; True if one was added.
 
         This makes /teachers/me and subject dropdowns reliable even if the explicit assignments
         weren't created manually.
         """
         if not teacher_id or not class_id or not subject_id:
-            return
+            return False
 
         res = await self.session.execute(
             select(TeacherClassSubject).where(
@@ -31,18 +33,19 @@ class ScheduleRepository:
         )
         existing = res.scalar_one_or_none()
         if existing:
-            return
+            return False
 
         self.session.add(
             TeacherClassSubject(teacher_id=teacher_id, class_id=class_id, subject_id=subject_id)
         )
+        return True
 
     async def create(self, schedule_data: ScheduleCreate) -> Schedule:
         schedule = Schedule(**schedule_data.model_dump())
         self.session.add(schedule)
 
         # Keep teacher<->class<->subject assignments in sync
-        await self._ensure_teacher_class_subject(
+        assigned = await self._ensure_teacher_class_subject(
             teacher_id=schedule.teacher_id,
             class_id=schedule.class_id,
             subject_id=schedule.subject_id,
@@ -50,6 +53,9 @@ class ScheduleRepository:
 
         await self.session.commit()
         await self.session.refresh(schedule)
+        if assigned:
+            await invalidate(teacher_assignments_cache, str(schedule.teacher_id))
+        await invalidate(teacher_home_cache)
         return schedule
 
     async def get_by_id(self, schedule_id: uuid.UUID) -> Optional[Schedule]:
@@ -69,6 +75,13 @@ class ScheduleRepository:
         )
         return list(result.scalars().all())
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        """Version of a class timetable and the subject/class names in it, for ETags."""
+        result = await self.session.execute(
+            collection_version(Schedule, Schedule.class_id == class_id, related=(Schedule.subject, Schedule.class_))
+        )
+        return tuple(result.one())
+
     async def get_by_teacher(self, teacher_id: uuid.UUID) -> List[Schedule]:
         result = await self.session.execute(
             select(Schedule)
@@ -88,7 +101,7 @@ class ScheduleRepository:
             setattr(schedule, field, value)
 
         # If we changed the triple, ensure mapping exists
-        await self._ensure_teacher_class_subject(
+        assigned = await self._ensure_teacher_class_subject(
             teacher_id=schedule.teacher_id,
             class_id=schedule.class_id,
             subject_id=schedule.subject_id,
@@ -96,6 +109,9 @@ class ScheduleRepository:
 
         await self.session.commit()
         await self.session.refresh(schedule)
+        if assigned:
+            await invalidate(teacher_assignments_cache, str(schedule.teacher_id))
+        await invalidate(teacher_home_cache)
         return schedule
 
     async def delete(self, schedule_id: uuid.UUID) -> bool:
@@ -105,4 +121,5 @@ class ScheduleRepository:
 
         await self.session.delete(schedule)
         await self.session.commit()
+        await invalidate(teacher_home_cache)
         return True
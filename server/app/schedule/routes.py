@@ -1,11 +1,12 @@
 import uuid
 from typing import List
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from app.schedule.repository import ScheduleRepository
 from app.schedule.schemas import ScheduleCreate, ScheduleRead, ScheduleUpdate
 from app.schedule.service import ScheduleService
 from config.database import AsyncSession, get_db
+from config.conditional import check_etag
 from config.dependences import get_current_user, admin_required
 
 router = APIRouter(prefix="/schedules", tags=["Schedules"])
@@ -28,9 +29,15 @@ async def create_schedule(
 @router.get("/class/{class_id}", response_model=List[ScheduleRead])
 async def get_class_schedule(
     class_id: uuid.UUID,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     service: ScheduleService = Depends(get_schedule_service)
 ):
+    """Timetable of a class. Supports If-None-Match (304 when unchanged)."""
+    not_modified = check_etag(request, response, await service.get_class_version(class_id))
+    if not_modified:
+        return not_modified
     return await service.get_class_schedule(class_id)
 
 
@@ -26,6 +26,9 @@ class ScheduleService:
     async def get_class_schedule(self, class_id: uuid.UUID) -> List[Schedule]:
         return await self.repository.get_by_class(class_id)
 
+    async def get_class_version(self, class_id: uuid.UUID) -> tuple:
+        return await self.repository.get_class_version(class_id)
+
     async def get_teacher_schedule(self, teacher_id: uuid.UUID) -> List[Schedule]:
         return await self.repository.get_by_teacher(teacher_id)
 
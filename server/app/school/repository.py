@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 from app.school import SchoolRead, School, SchoolCreate, SchoolUpdate
+from config.cache import classes_cache, invalidate, schools_cache, teacher_assignments_cache
 from config.database import AsyncSession
 
 
@@ -13,9 +14,12 @@ class SchoolRepository:
         self.session = session
 
     async def get_all(self) -> List[SchoolRead]:
+        """All schools, read through schools_cache."""
+        return list(await schools_cache.get_or_load("all", self._load_all))
+
+    async def _load_all(self) -> tuple:
         result = await self.session.execute(select(School))
-        schools = result.scalars().all()
-        return [SchoolRead.model_validate(s) for s in schools]
+        return tuple(SchoolRead.model_validate(s) for s in result.scalars().all())
 
     async def get_by_id(self, id: uuid.UUID) -> SchoolRead:
         result = await self.session.execute(
@@ -47,6 +51,7 @@ class SchoolRepository:
         self.session.add(school)
         await self.session.commit()
         await self.session.refresh(school)
+        await invalidate(schools_cache)
         return SchoolRead.model_validate(school)
 
     async def update(self, id: uuid.UUID, school_update: SchoolUpdate) -> SchoolRead:
@@ -74,6 +79,7 @@ class SchoolRepository:
 
         await self.session.commit()
         await self.session.refresh(school)
+        await invalidate(schools_cache)
         return SchoolRead.model_validate(school)
 
     async def delete(self, id: uuid.UUID) -> bool:
@@ -87,4 +93,8 @@ class SchoolRepository:
 
         await self.session.delete(school)
         await self.session.commit()
+        # Its classes (and their assignments) go with it
+        await invalidate(schools_cache)
+        await invalidate(classes_cache)
+        await invalidate(teacher_assignments_cache)
         return True
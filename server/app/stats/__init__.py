@@ -0,0 +1,6 @@
+from .models import (
+    StudentSubjectGradeStats,
+    ClassSubjectGradeStats,
+    StudentAttendanceStats,
+    ClassAttendanceStats,
+)
@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import func
+
+from config.database import Base
+
+
+class StudentSubjectGradeStats(Base):
+    """Running grade totals per (student, subject), maintained by GradeRepository writes."""
+
+    __tablename__ = "student_subject_grade_stats"
+
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("students.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    subject_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("subjects.id", ondelete="CASCADE"), primary_key=True
+    )
+    grade_sum: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+
+class ClassSubjectGradeStats(Base):
+    """Running grade totals per (class, subject) over the class's current students."""
+
+    __tablename__ = "class_subject_grade_stats"
+
+    class_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True
+    )
+    subject_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("subjects.id", ondelete="CASCADE"), primary_key=True
+    )
+    grade_sum: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+
+class StudentAttendanceStats(Base):
+    """Attendance counts per status for a student, maintained by AttendanceRepository writes."""
+
+    __tablename__ = "student_attendance_stats"
+
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("students.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    present_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    absent_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    late_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    excused_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+
+class ClassAttendanceStats(Base):
+    """Attendance counts per status over a class's current students."""
+
+    __tablename__ = "class_attendance_stats"
+
+    class_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True
+    )
+    present_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    absent_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    late_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    excused_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,235 @@
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, delete, func, literal
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.sql import ColumnElement
+
+from app.attendance.models import Attendance, AttendanceStatus
+from app.grade.models import GradeModel
+from app.stats.models import (
+    StudentSubjectGradeStats,
+    ClassSubjectGradeStats,
+    StudentAttendanceStats,
+    ClassAttendanceStats,
+)
+from app.users.models.students import Student
+from config.database import AsyncSession
+
+# (student_id, subject_id, value_delta, count_delta)
+GradeDelta = Tuple[uuid.UUID, uuid.UUID, int, int]
+# (student_id, status, count_delta)
+AttendanceDelta = Tuple[uuid.UUID, AttendanceStatus, int]
+
+STATUS_COLUMNS = {
+    AttendanceStatus.PRESENT: "present_count",
+    AttendanceStatus.ABSENT: "absent_count",
+    AttendanceStatus.LATE: "late_count",
+    AttendanceStatus.EXCUSED: "excused_count",
+}
+
+
+class StatsRepository:
+    """Maintains the grade/attendance rollup tables.
+
+    Methods never commit: they are called from the repositories that write grades and
+    attendance so the rollups change in the same transaction as the source rows.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _get_class_ids(self, student_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, uuid.UUID]:
+        ids = list(set(student_ids))
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(Student.user_id, Student.class_id)
+            .where(Student.user_id.in_(ids), Student.class_id.is_not(None))
+        )
+        return {row[0]: row[1] for row in result.all()}
+
+    async def _upsert_grades(self, model, key_column: str, totals: Dict[Tuple[uuid.UUID, uuid.UUID], List[int]]) -> None:
+        if not totals:
+            return
+        stmt = pg_insert(model).values([
+            {key_column: key, "subject_id": subject_id, "grade_sum": value, "grade_count": count}
+            for (key, subject_id), (value, count) in totals.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column, "subject_id"],
+            set_={
+                "grade_sum": model.grade_sum + stmt.excluded.grade_sum,
+                "grade_count": model.grade_count + stmt.excluded.grade_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def _upsert_attendance(self, model, key_column: str, totals: Dict[uuid.UUID, Dict[str, int]]) -> None:
+        if not totals:
+            return
+        columns = list(STATUS_COLUMNS.values())
+        stmt = pg_insert(model).values([
+            {key_column: key, **{column: counts.get(column, 0) for column in columns}}
+            for key, counts in totals.items()
+        ])
+        set_ = {column: getattr(model, column) + getattr(stmt.excluded, column) for column in columns}
+        set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=[key_column], set_=set_)
+        await self.session.execute(stmt)
+
+    async def apply_grade_deltas(self, deltas: Iterable[GradeDelta]) -> None:
+        """Add value/count deltas to the per-student and per-class grade rollups."""
+        student_totals: Dict[Tuple[uuid.UUID, uuid.UUID], List[int]] = defaultdict(lambda: [0, 0])
+        for student_id, subject_id, value_delta, count_delta in deltas:
+            totals = student_totals[(student_id, subject_id)]
+            totals[0] += value_delta
+            totals[1] += count_delta
+        if not student_totals:
+            return
+
+        class_ids = await self._get_class_ids(student_id for student_id, _ in student_totals)
+        class_totals: Dict[Tuple[uuid.UUID, uuid.UUID], List[int]] = defaultdict(lambda: [0, 0])
+        for (student_id, subject_id), (value, count) in student_totals.items():
+            class_id = class_ids.get(student_id)
+            if class_id is None:
+                continue
+            totals = class_totals[(class_id, subject_id)]
+            totals[0] += value
+            totals[1] += count
+
+        await self._upsert_grades(StudentSubjectGradeStats, "student_id", student_totals)
+        await self._upsert_grades(ClassSubjectGradeStats, "class_id", class_totals)
+
+    async def apply_attendance_deltas(self, deltas: Iterable[AttendanceDelta]) -> None:
+        """Add per-status count deltas to the per-student and per-class attendance rollups."""
+        student_totals: Dict[uuid.UUID, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for student_id, attendance_status, count_delta in deltas:
+            student_totals[student_id][STATUS_COLUMNS[AttendanceStatus(attendance_status)]] += count_delta
+        if not student_totals:
+            return
+
+        class_ids = await self._get_class_ids(student_totals.keys())
+        class_totals: Dict[uuid.UUID, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for student_id, counts in student_totals.items():
+            class_id = class_ids.get(student_id)
+            if class_id is None:
+                continue
+            for column, count in counts.items():
+                class_totals[class_id][column] += count
+
+        await self._upsert_attendance(StudentAttendanceStats, "student_id", student_totals)
+        await self._upsert_attendance(ClassAttendanceStats, "class_id", class_totals)
+
+    async def remove_grades(self, condition: ColumnElement[bool]) -> None:
+        """Subtract the grades matching `condition` before they are deleted in bulk (e.g. by cascade)."""
+        result = await self.session.execute(
+            select(GradeModel.student_id, GradeModel.subject_id, func.sum(GradeModel.value), func.count(GradeModel.id))
+            .where(condition)
+            .group_by(GradeModel.student_id, GradeModel.subject_id)
+        )
+        await self.apply_grade_deltas(
+            (student_id, subject_id, -int(value_sum), -count)
+            for student_id, subject_id, value_sum, count in result.all()
+        )
+
+    async def remove_attendance(self, condition: ColumnElement[bool]) -> None:
+        """Subtract the attendance rows matching `condition` before they are deleted in bulk."""
+        result = await self.session.execute(
+            select(Attendance.student_id, Attendance.status, func.count(Attendance.id))
+            .where(condition)
+            .group_by(Attendance.student_id, Attendance.status)
+        )
+        await self.apply_attendance_deltas(
+            (student_id, attendance_status, -count)
+            for student_id, attendance_status, count in result.all()
+        )
+
+    async def _shift_class_totals(self, student_id: uuid.UUID, class_id: uuid.UUID, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) a student's rollups to/from a class's rollups."""
+        grades = select(
+            literal(class_id, UUID(as_uuid=True)),
+            StudentSubjectGradeStats.subject_id,
+            StudentSubjectGradeStats.grade_sum * sign,
+            StudentSubjectGradeStats.grade_count * sign,
+        ).where(StudentSubjectGradeStats.student_id == student_id)
+        stmt = pg_insert(ClassSubjectGradeStats).from_select(
+            ["class_id", "subject_id", "grade_sum", "grade_count"], grades
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["class_id", "subject_id"],
+            set_={
+                "grade_sum": ClassSubjectGradeStats.grade_sum + stmt.excluded.grade_sum,
+                "grade_count": ClassSubjectGradeStats.grade_count + stmt.excluded.grade_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+        columns = list(STATUS_COLUMNS.values())
+        attendance = select(
+            literal(class_id, UUID(as_uuid=True)),
+            *[getattr(StudentAttendanceStats, column) * sign for column in columns],
+        ).where(StudentAttendanceStats.student_id == student_id)
+        stmt = pg_insert(ClassAttendanceStats).from_select(["class_id", *columns], attendance)
+        set_ = {column: getattr(ClassAttendanceStats, column) + getattr(stmt.excluded, column) for column in columns}
+        set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=["class_id"], set_=set_)
+        await self.session.execute(stmt)
+
+    async def move_student(
+        self, student_id: uuid.UUID, old_class_id: Optional[uuid.UUID], new_class_id: Optional[uuid.UUID]
+    ) -> None:
+        """Move a student's contribution between class rollups when their class changes."""
+        if old_class_id == new_class_id:
+            return
+        if old_class_id is not None:
+            await self._shift_class_totals(student_id, old_class_id, -1)
+        if new_class_id is not None:
+            await self._shift_class_totals(student_id, new_class_id, 1)
+
+    async def rebuild(self) -> None:
+        """Recompute every rollup table from the grades and attendances tables (backfill)."""
+        for model in (StudentSubjectGradeStats, ClassSubjectGradeStats, StudentAttendanceStats, ClassAttendanceStats):
+            await self.session.execute(delete(model))
+
+        grade_columns = ["subject_id", "grade_sum", "grade_count"]
+        await self.session.execute(
+            pg_insert(StudentSubjectGradeStats).from_select(
+                ["student_id", *grade_columns],
+                select(GradeModel.student_id, GradeModel.subject_id, func.sum(GradeModel.value), func.count(GradeModel.id))
+                .group_by(GradeModel.student_id, GradeModel.subject_id),
+            )
+        )
+        await self.session.execute(
+            pg_insert(ClassSubjectGradeStats).from_select(
+                ["class_id", *grade_columns],
+                select(Student.class_id, GradeModel.subject_id, func.sum(GradeModel.value), func.count(GradeModel.id))
+                .join(Student, Student.user_id == GradeModel.student_id)
+                .where(Student.class_id.is_not(None))
+                .group_by(Student.class_id, GradeModel.subject_id),
+            )
+        )
+
+        columns = list(STATUS_COLUMNS.values())
+        status_counts = [
+            func.count(Attendance.id).filter(Attendance.status == attendance_status)
+            for attendance_status in STATUS_COLUMNS
+        ]
+        await self.session.execute(
+            pg_insert(StudentAttendanceStats).from_select(
+                ["student_id", *columns],
+                select(Attendance.student_id, *status_counts).group_by(Attendance.student_id),
+            )
+        )
+        await self.session.execute(
+            pg_insert(ClassAttendanceStats).from_select(
+                ["class_id", *columns],
+                select(Student.class_id, *status_counts)
+                .join(Student, Student.user_id == Attendance.student_id)
+                .where(Student.class_id.is_not(None))
+                .group_by(Student.class_id),
+            )
+        )
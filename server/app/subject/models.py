@@ -1,7 +1,9 @@
 import uuid
+from datetime import datetime
 from typing import List, TYPE_CHECKING
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import func
 
 from config.database import Base
 
@@ -21,6 +23,9 @@ class Subject(Base):
     )
     name: Mapped[str] = mapped_column(nullable=False, index=True)
 
+    # Version of the subject list and of the names embedded in other responses (ETags)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
     # Relationships
     grades: Mapped[List["GradeModel"]] = relationship("GradeModel", back_populates="subject", cascade="all, delete-orphan")
     schedules: Mapped[List["Schedule"]] = relationship("Schedule", back_populates="subject", cascade="all, delete-orphan")
@@ -3,7 +3,12 @@ from typing import List, Optional
 from sqlalchemy import select
 
 from app.subject.models import Subject
-from app.subject.schemas import SubjectCreate, SubjectUpdate
+from app.subject.schemas import SubjectCreate, SubjectRead, SubjectUpdate
+from app.attendance.models import Attendance
+from app.grade.models import GradeModel
+from app.stats.repository import StatsRepository
+from config.cache import invalidate, subjects_cache, teacher_assignments_cache, teacher_home_cache
+from config.conditional import collection_version
 from config.database import AsyncSession
 
 
@@ -16,6 +21,7 @@ class SubjectRepository:
         self.session.add(subject)
         await self.session.commit()
         await self.session.refresh(subject)
+        await invalidate(subjects_cache)
         return subject
 
     async def get_by_id(self, subject_id: uuid.UUID) -> Optional[Subject]:
@@ -24,9 +30,24 @@ class SubjectRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self) -> List[Subject]:
+    async def get_all(self, version: Optional[tuple] = None) -> List[SubjectRead]:
+        """
+        All subjects, read through subjects_cache. Entries are keyed by the SQL version
+        (pass the one already read for the ETag), so a worker that missed an
+        invalidation reloads instead of serving an old list under a new ETag.
+        """
+        if version is None:
+            version = await self.get_version()
+        return list(await subjects_cache.get_or_load(version, self._load_all))
+
+    async def get_version(self) -> tuple:
+        """(count, max(updated_at)) of subjects, for the /subjects ETag."""
+        result = await self.session.execute(collection_version(Subject))
+        return tuple(result.one())
+
+    async def _load_all(self) -> tuple:
         result = await self.session.execute(select(Subject))
-        return list(result.scalars().all())
+        return tuple(SubjectRead.model_validate(s) for s in result.scalars().all())
 
     async def update(self, subject_id: uuid.UUID, subject_data: SubjectUpdate) -> Optional[Subject]:
         subject = await self.get_by_id(subject_id)
@@ -39,6 +60,9 @@ class SubjectRepository:
 
         await self.session.commit()
         await self.session.refresh(subject)
+        await invalidate(subjects_cache)
+        await invalidate(teacher_assignments_cache)
+        await invalidate(teacher_home_cache)
         return subject
 
     async def delete(self, subject_id: uuid.UUID) -> bool:
@@ -46,6 +70,12 @@ class SubjectRepository:
         if not subject:
             return False
 
+        stats = StatsRepository(self.session)
+        await stats.remove_grades(GradeModel.subject_id == subject_id)
+        await stats.remove_attendance(Attendance.subject_id == subject_id)
         await self.session.delete(subject)
         await self.session.commit()
+        await invalidate(subjects_cache)
+        await invalidate(teacher_assignments_cache)
+        await invalidate(teacher_home_cache)
         return True
\ No newline at end of file
@@ -1,11 +1,12 @@
 import uuid
 from typing import List
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from app.subject.repository import SubjectRepository
 from app.subject.schemas import SubjectCreate, SubjectRead, SubjectUpdate
 from app.subject.service import SubjectService
 from config.database import AsyncSession, get_db
+from config.conditional import check_etag
 from config.dependences import get_current_user, admin_required
 
 router = APIRouter(prefix="/subjects", tags=["Subjects"])
@@ -27,11 +28,17 @@ async def create_subject(
 
 @router.get("/", response_model=List[SubjectRead])
 async def get_all_subjects(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     service: SubjectService = Depends(get_subject_service)
 ):
-    """Get all subjects"""
-    return await service.get_all_subjects()
+    """Get all subjects. Supports If-None-Match (304 when unchanged)."""
+    version = await service.get_version()
+    not_modified = check_etag(request, response, version)
+    if not_modified:
+        return not_modified
+    return await service.get_all_subjects(version)
 
 
 @router.get("/{subject_id}", response_model=SubjectRead)
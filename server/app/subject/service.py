@@ -1,10 +1,10 @@
 import uuid
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.subject.models import Subject
 from app.subject.repository import SubjectRepository
-from app.subject.schemas import SubjectCreate, SubjectUpdate
+from app.subject.schemas import SubjectCreate, SubjectRead, SubjectUpdate
 
 
 class SubjectService:
@@ -23,8 +23,11 @@ class SubjectService:
             )
         return subject
 
-    async def get_all_subjects(self) -> List[Subject]:
-        return await self.repository.get_all()
+    async def get_all_subjects(self, version: Optional[tuple] = None) -> List[SubjectRead]:
+        return await self.repository.get_all(version)
+
+    async def get_version(self) -> tuple:
+        return await self.repository.get_version()
 
     async def update_subject(self, subject_id: uuid.UUID, subject_data: SubjectUpdate) -> Subject:
         subject = await self.repository.update(subject_id, subject_data)
@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Type
+
+from sqlalchemy import Index, String, event, inspect
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.sql.functions import func
+
+from app.attendance.models import Attendance
+from app.grade.models import GradeModel
+from app.homework.models import Homework, HomeworkAssignment
+from app.notification.models import Notification
+from app.schedule.models import Schedule
+from config.database import Base
+
+
+class Tombstone(Base):
+    """Marker left behind by a deleted row, so /sync can tell clients to drop it.
+
+    The audience columns are copied from the deleted row and carry no foreign keys:
+    a tombstone has to outlive the student, class or teacher it was addressed to.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_deleted", "user_id", "deleted_at", "id"),
+        Index("ix_tombstones_class_deleted", "class_id", "deleted_at", "id"),
+        Index("ix_tombstones_teacher_deleted", "teacher_id", "deleted_at", "id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    class_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    teacher_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    deleted_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+# Synced model -> (entity name, attribute holding the synced id,
+#                 tombstone audience column -> model attribute)
+TRACKED_MODELS: Dict[Type, Tuple[str, str, Dict[str, str]]] = {
+    GradeModel: ("grades", "id", {"user_id": "student_id", "teacher_id": "teacher_id"}),
+    Attendance: ("attendance", "id", {"user_id": "student_id", "teacher_id": "teacher_id"}),
+    Homework: ("homework", "id", {"class_id": "class_id", "teacher_id": "teacher_id"}),
+    # Students get homework through their assignments: unassigning removes it for them
+    HomeworkAssignment: ("homework", "homework_id", {"user_id": "student_id"}),
+    Notification: ("notifications", "id", {"user_id": "user_id"}),
+    Schedule: ("schedule", "id", {"class_id": "class_id", "teacher_id": "teacher_id"}),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _record_tombstones(session, flush_context, instances):
+    # Covers every ORM delete, including relationship cascades; bulk DELETE statements
+    # and database-level ON DELETE CASCADE bypass the session and leave no tombstone.
+    for obj in session.deleted:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked is not None:
+            entity, id_attr, audience = tracked
+            session.add(Tombstone(
+                entity=entity,
+                entity_id=getattr(obj, id_attr),
+                **{column: getattr(obj, attr) for column, attr in audience.items()},
+            ))
+
+    # A row whose audience changes (a slot given to another teacher, homework moved to
+    # another class) drops out of the old audience's feed, so they get a tombstone
+    for obj in session.dirty:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked is None:
+            continue
+        entity, id_attr, audience = tracked
+        state = inspect(obj)
+        previous = {}
+        for column, attr in audience.items():
+            history = state.attrs[attr].history
+            if history.deleted and history.deleted[0] is not None and history.deleted[0] != getattr(obj, attr):
+                previous[column] = history.deleted[0]
+        if previous:
+            session.add(Tombstone(entity=entity, entity_id=getattr(obj, id_attr), **previous))
@@ -0,0 +1,100 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.attendance.models import Attendance
+from app.grade.models import GradeModel
+from app.homework.models import Homework, HomeworkAssignment
+from app.notification.models import Notification
+from app.schedule.models import Schedule
+from app.sync.models import Tombstone
+from app.users.models.students import Student
+
+# Position in a change feed: (timestamp, id) of the last row handed out
+Cursor = Tuple[datetime, uuid.UUID]
+
+
+class SyncRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_now(self) -> datetime:
+        # Naive, like the timestamp columns it is compared with
+        return await self.session.scalar(select(func.localtimestamp()))
+
+    async def get_student_class_id(self, student_id: uuid.UUID) -> Optional[uuid.UUID]:
+        return await self.session.scalar(select(Student.class_id).where(Student.user_id == student_id))
+
+    async def _changes(self, query: Select, model, column, cursor: Cursor, limit: int) -> list:
+        """Rows after `cursor` in (column, id) order; fetches limit + 1 to detect more."""
+        query = (
+            query.where(tuple_(column, model.id) > tuple_(*cursor))
+            .order_by(column.asc(), model.id.asc())
+            .limit(limit + 1)
+        )
+        result = await self.session.execute(query)
+        return list(result.unique().scalars().all())
+
+    async def get_grades(self, cursor: Cursor, limit: int, student_id=None, teacher_id=None) -> List[GradeModel]:
+        query = select(GradeModel).options(joinedload(GradeModel.subject))
+        if student_id is not None:
+            query = query.where(GradeModel.student_id == student_id)
+        if teacher_id is not None:
+            query = query.where(GradeModel.teacher_id == teacher_id)
+        return await self._changes(query, GradeModel, GradeModel.updated_at, cursor, limit)
+
+    async def get_attendance(self, cursor: Cursor, limit: int, student_id=None, teacher_id=None) -> List[Attendance]:
+        query = select(Attendance).options(joinedload(Attendance.subject))
+        if student_id is not None:
+            query = query.where(Attendance.student_id == student_id)
+        if teacher_id is not None:
+            query = query.where(Attendance.teacher_id == teacher_id)
+        return await self._changes(query, Attendance, Attendance.updated_at, cursor, limit)
+
+    async def get_homework(self, cursor: Cursor, limit: int, student_id=None, teacher_id=None) -> List[Homework]:
+        # Students see the homework assigned to them, as in /homework/my
+        query = select(Homework).options(joinedload(Homework.subject), joinedload(Homework.assignments))
+        if student_id is not None:
+            query = query.where(
+                Homework.id.in_(select(HomeworkAssignment.homework_id).where(HomeworkAssignment.student_id == student_id))
+            )
+        if teacher_id is not None:
+            query = query.where(Homework.teacher_id == teacher_id)
+        return await self._changes(query, Homework, Homework.updated_at, cursor, limit)
+
+    async def get_notifications(self, cursor: Cursor, limit: int, user_id: uuid.UUID) -> List[Notification]:
+        query = select(Notification).where(Notification.user_id == user_id)
+        return await self._changes(query, Notification, Notification.updated_at, cursor, limit)
+
+    async def get_schedule(self, cursor: Cursor, limit: int, class_id=None, teacher_id=None) -> List[Schedule]:
+        query = select(Schedule).options(joinedload(Schedule.subject), joinedload(Schedule.class_))
+        if class_id is not None:
+            query = query.where(Schedule.class_id == class_id)
+        if teacher_id is not None:
+            query = query.where(Schedule.teacher_id == teacher_id)
+        return await self._changes(query, Schedule, Schedule.updated_at, cursor, limit)
+
+    async def get_tombstones(
+        self,
+        cursor: Cursor,
+        limit: int,
+        user_id: uuid.UUID,
+        class_id: Optional[uuid.UUID] = None,
+        teacher_id: Optional[uuid.UUID] = None,
+    ) -> List[Tombstone]:
+        audience = [Tombstone.user_id == user_id]
+        if class_id is not None:
+            audience.append(Tombstone.class_id == class_id)
+        if teacher_id is not None:
+            audience.append(Tombstone.teacher_id == teacher_id)
+        query = select(Tombstone).where(or_(*audience))
+        return await self._changes(query, Tombstone, Tombstone.deleted_at, cursor, limit)
+
+    async def delete_tombstones_before(self, before: datetime) -> int:
+        result = await self.session.execute(Tombstone.__table__.delete().where(Tombstone.deleted_at < before))
+        await self.session.commit()
+        return result.rowcount
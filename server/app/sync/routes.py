@@ -0,0 +1,37 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.sync.repository import SyncRepository
+from app.sync.schemas import SyncResponse
+from app.sync.service import SYNC_PAGE_SIZE, SyncService
+from config.database import AsyncSession, get_db
+from config.dependences import get_current_user
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+async def get_sync_service(session: AsyncSession = Depends(get_db)) -> SyncService:
+    repository = SyncRepository(session)
+    return SyncService(repository)
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+        since: Optional[str] = Query(None, description="sync_token from the previous response; omit for a full sync"),
+        limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=SYNC_PAGE_SIZE),
+        current_user: dict = Depends(get_current_user),
+        service: SyncService = Depends(get_sync_service),
+):
+    """
+    Everything that changed for the current user since `since`.
+
+    Returns the grades, homework, attendance, notifications and schedule entries
+    created or updated since the token, plus the ids deleted since then (`deleted`,
+    by entity). Store `sync_token` and pass it next time; while `has_more` is true,
+    call again right away. Apply `deleted` before merging the changed rows. `reset`
+    means the token was missing, too old or taken in another class: replace local
+    data with this response instead of merging it.
+    """
+    return await service.sync(uuid.UUID(current_user["id"]), current_user["role"], since, limit)
@@ -0,0 +1,26 @@
+import uuid
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from app.attendance.schemas import AttendanceRead
+from app.grade.schemas import GradeRead
+from app.homework.schemas import HomeworkRead
+from app.notification.schemas import NotificationRead
+from app.schedule.schemas import ScheduleRead
+
+
+class SyncResponse(BaseModel):
+    """Rows created or updated since the client's token, and ids deleted since then."""
+    sync_token: str
+    # More changes are waiting: call again right away with sync_token
+    has_more: bool
+    # The token was missing, or too old to replay deletes: drop local data and store this instead
+    reset: bool
+    grades: List[GradeRead] = []
+    homework: List[HomeworkRead] = []
+    attendance: List[AttendanceRead] = []
+    notifications: List[NotificationRead] = []
+    schedule: List[ScheduleRead] = []
+    # Entity name (grades, homework, ...) -> ids deleted since the token
+    deleted: Dict[str, List[uuid.UUID]] = {}
@@ -0,0 +1,149 @@
+import base64
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.attendance.schemas import AttendanceRead
+from app.grade.schemas import GradeRead
+from app.homework.schemas import HomeworkRead
+from app.notification.schemas import NotificationRead
+from app.schedule.schemas import ScheduleRead
+from app.sync.repository import Cursor, SyncRepository
+
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+# Rows are stamped with their transaction's start time, so one that commits late can
+# carry an older updated_at than rows already synced. Tokens never move closer to the
+# present than this window, so such rows are picked up (clients upsert by id).
+SYNC_LOOKBACK = timedelta(seconds=int(os.getenv("SYNC_LOOKBACK_SECONDS", "5")))
+# Tombstones older than this are pruned (scripts/prune_tombstones.py); older tokens get a reset
+SYNC_TOMBSTONE_RETENTION = timedelta(days=int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90")))
+
+DOMAINS = ["grades", "homework", "attendance", "notifications", "schedule"]
+_START: Cursor = (datetime(1970, 1, 1), uuid.UUID(int=0))
+
+
+def encode_token(user_id: uuid.UUID, class_id: Optional[uuid.UUID], cursors: Dict[str, Cursor]) -> str:
+    payload = {
+        "u": str(user_id),
+        "k": str(class_id) if class_id else None,
+        "c": {name: [ts.isoformat(), str(row_id)] for name, (ts, row_id) in cursors.items()},
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        cursors = {
+            name: (datetime.fromisoformat(ts), uuid.UUID(row_id))
+            for name, (ts, row_id) in payload["c"].items()
+        }
+        class_id = uuid.UUID(payload["k"]) if payload.get("k") else None
+        return uuid.UUID(payload["u"]), class_id, cursors
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+
+class SyncService:
+    def __init__(self, repository: SyncRepository):
+        self.repository = repository
+
+    async def sync(self, user_id: uuid.UUID, role: str, token: Optional[str], limit: int = SYNC_PAGE_SIZE) -> dict:
+        """Changes for the user's grades, homework, attendance, notifications and schedule.
+
+        Students get their own rows (and their class's schedule), teachers the rows they
+        own. Each domain is read in (updated_at, id) order after its cursor in the token;
+        a domain that has more than `limit` changes stops there and sets has_more.
+        """
+        class_id = None
+        if role == "student":
+            class_id = await self.repository.get_student_class_id(user_id)
+            scope = {"student_id": user_id}
+            schedule_scope = {"class_id": class_id} if class_id else None
+            tombstone_scope = {"class_id": class_id}
+        elif role == "teacher":
+            scope = {"teacher_id": user_id}
+            schedule_scope = {"teacher_id": user_id}
+            tombstone_scope = {"teacher_id": user_id}
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Sync is available to students and teachers"
+            )
+
+        now = await self.repository.get_now()
+        horizon: Cursor = (now - SYNC_LOOKBACK, uuid.UUID(int=0))
+
+        cursors: Optional[Dict[str, Cursor]] = None
+        if token:
+            token_user, token_class, cursors = decode_token(token)
+            deleted_cursor = cursors.get("deleted", _START)
+            # A student who changed class keeps the old class's timetable locally, and
+            # no tombstone reaches them for it: start over
+            if (
+                token_user != user_id
+                or token_class != class_id
+                or deleted_cursor[0] < now - SYNC_TOMBSTONE_RETENTION
+            ):
+                cursors = None
+        reset = cursors is None
+        cursors = cursors or {}
+
+        fetchers = {
+            "grades": lambda c: self.repository.get_grades(c, limit, **scope),
+            "homework": lambda c: self.repository.get_homework(c, limit, **scope),
+            "attendance": lambda c: self.repository.get_attendance(c, limit, **scope),
+            "notifications": lambda c: self.repository.get_notifications(c, limit, user_id=user_id),
+            "schedule": lambda c: self.repository.get_schedule(c, limit, **schedule_scope),
+        }
+        if schedule_scope is None:
+            # A student without a class has no timetable
+            del fetchers["schedule"]
+
+        response = {name: [] for name in DOMAINS}
+        new_cursors: Dict[str, Cursor] = {}
+        has_more = False
+        for name, fetch in fetchers.items():
+            cursor = cursors.get(name, _START)
+            rows = await fetch(cursor)
+            more = len(rows) > limit
+            rows = rows[:limit]
+            response[name] = rows
+            last = (rows[-1].updated_at, rows[-1].id) if rows else cursor
+            new_cursors[name] = last if more else min(last, horizon)
+            has_more = has_more or more
+
+        deleted: Dict[str, list] = {}
+        if reset:
+            # Fresh local data has nothing to delete
+            new_cursors["deleted"] = horizon
+        else:
+            cursor = cursors.get("deleted", _START)
+            tombstones = await self.repository.get_tombstones(cursor, limit, user_id=user_id, **tombstone_scope)
+            more = len(tombstones) > limit
+            tombstones = tombstones[:limit]
+            for tombstone in tombstones:
+                deleted.setdefault(tombstone.entity, []).append(tombstone.entity_id)
+            # Without more, nothing exists past the cursor: move it to the horizon even
+            # when there were no tombstones, so quiet clients don't age into a reset
+            new_cursors["deleted"] = (tombstones[-1].deleted_at, tombstones[-1].id) if more else horizon
+            has_more = has_more or more
+
+        return {
+            "sync_token": encode_token(user_id, class_id, new_cursors),
+            "has_more": has_more,
+            "reset": reset,
+            "grades": [GradeRead.model_validate(g) for g in response["grades"]],
+            "homework": [HomeworkRead.from_orm_with_assignments(h) for h in response["homework"]],
+            "attendance": [AttendanceRead.model_validate(a) for a in response["attendance"]],
+            "notifications": [NotificationRead.model_validate(n) for n in response["notifications"]],
+            "schedule": [ScheduleRead.model_validate(s) for s in response["schedule"]],
+            "deleted": deleted,
+        }
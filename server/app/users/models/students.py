@@ -25,7 +25,7 @@ class Student(Base):
 
     user: Mapped["User"] = relationship("User", back_populates="student", uselist=False)
     class_id: Mapped[Optional[uuid.UUID]] = mapped_column(
-        ForeignKey("classes.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("classes.id", ondelete="SET NULL"), nullable=True, index=True
     )
 
     class_: Mapped[Optional["Class"]] = relationship("Class", back_populates="students",
@@ -1,7 +1,6 @@
 import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING, List
-from passlib.context import CryptContext
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
@@ -9,6 +8,7 @@ from sqlalchemy import ForeignKey
 from sqlalchemy.sql.sqltypes import Integer, DateTime, String
 
 from app.classes import Class
+from app.password.hasher import pwd_context
 from app.users.enums import UserRole
 from config.database import Base
 
@@ -17,9 +17,6 @@ if TYPE_CHECKING:
     from app.school.models import School
     from app.notification.models import Notification
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
-
 class User(Base):
     __tablename__ = "users"
 
@@ -66,6 +63,7 @@ class User(Base):
         "Notification", back_populates="user", cascade="all, delete-orphan"
     )
 
+    # Synchronous helpers for scripts; request handlers use app.password.hasher.password_hasher
     def set_password(self, plain_password: str):
         self.password = pwd_context.hash(plain_password)
 
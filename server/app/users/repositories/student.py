@@ -3,13 +3,24 @@ from datetime import datetime
 from http.client import HTTPException
 from typing import List, Optional
 from fastapi import HTTPException, status
+from sqlalchemy import Row, func
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
+from app.attendance.models import Attendance
+from app.classes.models import Class
+from app.grade.models import GradeModel
+from app.homework.models import Homework, HomeworkAssignment
+from app.notification.models import Notification
+from app.schedule.models import Schedule
+from app.stats.models import StudentAttendanceStats, StudentSubjectGradeStats
+from app.subject.models import Subject
 from app.users.models import Student, User
 from app.users.enums import UserRole
 from app.users.schemas.student import StudentCreate, StudentRead
+from app.stats.repository import StatsRepository
+from config.cache import invalidate, teacher_home_cache
 from config.database import AsyncSession
 
 
@@ -29,6 +40,149 @@ class StudentRepository:
         student = result.scalars().first()
         return StudentRead.model_validate(student) if student else None
 
+    # --- /students/me/home -------------------------------------------------
+
+    async def get_with_class(self, student_id: uuid.UUID) -> Optional[Student]:
+        result = await self.session.execute(
+            select(Student)
+            .options(joinedload(Student.user), joinedload(Student.class_))
+            .where(Student.user_id == student_id)
+        )
+        return result.scalars().first()
+
+    async def get_home_version(self, student_id: uuid.UUID) -> Optional[tuple]:
+        """
+        Version of everything /students/me/home shows: count and max(updated_at) of the
+        student's grades, attendance, notifications and assigned homework and of the class
+        timetable, the profile/class/subject timestamps, and today's date (the homework
+        list is "due from today"). One row of aggregates; None if there is no student.
+        """
+        def count_and_max(model, *criteria) -> list:
+            return [
+                select(func.count(model.id)).where(*criteria).scalar_subquery(),
+                select(func.max(model.updated_at)).where(*criteria).scalar_subquery(),
+            ]
+
+        assigned = select(HomeworkAssignment.homework_id).where(HomeworkAssignment.student_id == student_id)
+        result = await self.session.execute(
+            select(
+                # The URL is the same for every student; a shared device must not get another's 304
+                Student.user_id,
+                Student.updated_at,
+                User.updated_at,
+                Class.updated_at,
+                func.current_date(),
+                select(func.max(Subject.updated_at)).scalar_subquery(),
+                *count_and_max(GradeModel, GradeModel.student_id == student_id),
+                *count_and_max(Attendance, Attendance.student_id == student_id),
+                *count_and_max(Notification, Notification.user_id == student_id),
+                *count_and_max(Homework, Homework.id.in_(assigned)),
+                *count_and_max(Schedule, Schedule.class_id == Student.class_id),
+            )
+            .select_from(Student)
+            .join(User, User.id == Student.user_id)
+            .outerjoin(Class, Class.id == Student.class_id)
+            .where(Student.user_id == student_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_home_counts(self, student_id: uuid.UUID) -> Optional[Row]:
+        """Unread notifications, upcoming homework and the grade/attendance rollups in one row."""
+        unread = (
+            select(func.count())
+            .select_from(Notification)
+            .where(Notification.user_id == student_id, Notification.is_read.is_(False))
+            .scalar_subquery()
+        )
+        upcoming = (
+            select(func.count())
+            .select_from(HomeworkAssignment)
+            .join(Homework, Homework.id == HomeworkAssignment.homework_id)
+            .where(HomeworkAssignment.student_id == student_id, Homework.due_date >= func.current_date())
+            .scalar_subquery()
+        )
+        grade_sum = (
+            select(func.coalesce(func.sum(StudentSubjectGradeStats.grade_sum), 0))
+            .where(StudentSubjectGradeStats.student_id == student_id)
+            .scalar_subquery()
+        )
+        grade_count = (
+            select(func.coalesce(func.sum(StudentSubjectGradeStats.grade_count), 0))
+            .where(StudentSubjectGradeStats.student_id == student_id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(
+                unread.label("unread_notifications"),
+                upcoming.label("upcoming_homework"),
+                grade_sum.label("grade_sum"),
+                grade_count.label("grade_count"),
+                func.coalesce(StudentAttendanceStats.present_count, 0).label("present"),
+                func.coalesce(StudentAttendanceStats.absent_count, 0).label("absent"),
+                func.coalesce(StudentAttendanceStats.late_count, 0).label("late"),
+                func.coalesce(StudentAttendanceStats.excused_count, 0).label("excused"),
+            )
+            .select_from(Student)
+            .outerjoin(StudentAttendanceStats, StudentAttendanceStats.student_id == Student.user_id)
+            .where(Student.user_id == student_id)
+        )
+        return result.first()
+
+    async def get_recent_grades(self, student_id: uuid.UUID, limit: int) -> List[GradeModel]:
+        result = await self.session.execute(
+            select(GradeModel)
+            .options(joinedload(GradeModel.subject))
+            .where(GradeModel.student_id == student_id)
+            .order_by(GradeModel.created_at.desc(), GradeModel.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_recent_attendance(self, student_id: uuid.UUID, limit: int) -> List[Attendance]:
+        result = await self.session.execute(
+            select(Attendance)
+            .options(joinedload(Attendance.subject))
+            .where(Attendance.student_id == student_id)
+            .order_by(Attendance.attendance_date.desc(), Attendance.created_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_upcoming_homework(self, student_id: uuid.UUID, limit: int) -> List[Homework]:
+        # Assigned to this student (as in /homework/my) and due today or later, soonest first
+        result = await self.session.execute(
+            select(Homework)
+            .options(joinedload(Homework.subject), joinedload(Homework.assignments))
+            .where(
+                Homework.id.in_(
+                    select(HomeworkAssignment.homework_id).where(HomeworkAssignment.student_id == student_id)
+                ),
+                Homework.due_date >= func.current_date(),
+            )
+            .order_by(Homework.due_date.asc(), Homework.id.asc())
+            .limit(limit)
+        )
+        return list(result.unique().scalars().all())
+
+    async def get_recent_notifications(self, student_id: uuid.UUID, limit: int) -> List[Notification]:
+        result = await self.session.execute(
+            select(Notification)
+            .where(Notification.user_id == student_id)
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_class_schedule(self, class_id: uuid.UUID) -> List[Schedule]:
+        result = await self.session.execute(
+            select(Schedule)
+            .options(joinedload(Schedule.subject), joinedload(Schedule.class_))
+            .where(Schedule.class_id == class_id)
+            .order_by(Schedule.day_of_week, Schedule.period_number)
+        )
+        return list(result.scalars().all())
+
     async def create(self, student_create: StudentCreate) -> StudentRead:
         try:
             async with self.session.begin():
@@ -49,6 +203,7 @@ class StudentRepository:
                 )
                 self.session.add(student)
             await self.session.refresh(student)
+            await invalidate(teacher_home_cache)
             return StudentRead.model_validate(student)
 
         except Exception as e:
@@ -76,11 +231,15 @@ class StudentRepository:
                 if student_data.email:
                     student.user.email = str(student_data.email)
                 if student_data.class_id is not None:
+                    await StatsRepository(self.session).move_student(
+                        student.user_id, student.class_id, student_data.class_id
+                    )
                     student.class_id = student_data.class_id
                 if student_data.school_id is not None:
                     student.school_id = student_data.school_id
 
             await self.session.refresh(student)
+            await invalidate(teacher_home_cache)
             return StudentRead.model_validate(student)
 
         except IntegrityError as e:
@@ -110,7 +269,10 @@ class StudentRepository:
                 student = result.scalars().first()
                 if not student:
                     return False
+                # Per-student rollups cascade with the row; the class rollups must be adjusted here
+                await StatsRepository(self.session).move_student(student.user_id, student.class_id, None)
                 await self.session.delete(student)
+            await invalidate(teacher_home_cache)
             return True
         except SQLAlchemyError:
             await self.session.rollback()
@@ -6,9 +6,18 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy import or_, func
 
+from app.classes.models import Class
+from app.schedule.models import Schedule
+from app.subject.models import Subject
 from app.users.models import Teacher, User
+from app.users.models.students import Student
+from app.users.models.teacher_subjects import TeacherClassSubject
 from app.users.enums import UserRole
 from app.users.schemas.teacher import TeacherCreate, TeacherRead, TeacherUpdate
+from app.attendance.models import Attendance
+from app.grade.models import GradeModel
+from app.stats.repository import StatsRepository
+from config.cache import invalidate, teacher_assignments_cache, teacher_flags_cache, teacher_home_cache
 from config.database import AsyncSession
 
 
@@ -42,6 +51,91 @@ class TeacherRepository:
             select(Teacher).where(Teacher.user_id == user_id)
         )
 
+    async def get_flags(self, user_id: uuid.UUID) -> dict | None:
+        """Authorization flags of a teacher, or None if the user is not a teacher."""
+        result = await self.session.execute(
+            select(Teacher.is_director, Teacher.is_homeroom, Teacher.class_id, User.school_id)
+            .join(User, User.id == Teacher.user_id)
+            .where(Teacher.user_id == user_id)
+        )
+        row = result.first()
+        if not row:
+            return None
+        return {
+            "is_director": row.is_director,
+            "is_homeroom": row.is_homeroom,
+            "class_id": row.class_id,
+            "school_id": row.school_id,
+        }
+
+    async def get_with_user(self, user_id: uuid.UUID):
+        """Return (Teacher, User) for a teacher, or None."""
+        result = await self.session.execute(
+            select(Teacher, User).join(User, User.id == Teacher.user_id).where(Teacher.user_id == user_id)
+        )
+        return result.first()
+
+    async def get_assigned_subjects(self, teacher_id: uuid.UUID) -> list:
+        """
+        (class_id, subject_id, subject_name) from explicit teacher<->class<->subject
+        assignments, read through teacher_assignments_cache.
+        """
+        async def load() -> tuple:
+            result = await self.session.execute(
+                select(TeacherClassSubject.class_id, Subject.id, Subject.name)
+                .join(Subject, Subject.id == TeacherClassSubject.subject_id)
+                .where(TeacherClassSubject.teacher_id == teacher_id)
+            )
+            return tuple(tuple(row) for row in result.all())
+
+        return list(await teacher_assignments_cache.get_or_load(str(teacher_id), load))
+
+    async def get_scheduled_subjects(
+        self, teacher_id: uuid.UUID | None = None, class_ids: list[uuid.UUID] | None = None
+    ) -> list:
+        """Distinct (class_id, subject_id, subject_name) from schedules of a teacher or of classes."""
+        query = (
+            select(Schedule.class_id, Subject.id, Subject.name)
+            .join(Subject, Subject.id == Schedule.subject_id)
+            .distinct()
+        )
+        if teacher_id is not None:
+            query = query.where(Schedule.teacher_id == teacher_id)
+        if class_ids is not None:
+            if not class_ids:
+                return []
+            query = query.where(Schedule.class_id.in_(class_ids))
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def get_classes(
+        self,
+        class_ids: list[uuid.UUID] | None = None,
+        homeroom_teacher_id: uuid.UUID | None = None,
+        school_id: uuid.UUID | None = None,
+    ) -> list[Class]:
+        query = select(Class).order_by(Class.name)
+        if class_ids is not None:
+            query = query.where(Class.id.in_(class_ids))
+        if homeroom_teacher_id is not None:
+            query = query.where(Class.teacher_id == homeroom_teacher_id)
+        if school_id is not None:
+            query = query.where(Class.school_id == school_id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_class_students(self, class_ids: list[uuid.UUID]) -> list:
+        """(class_id, student_id, username, email) for every student of the given classes."""
+        if not class_ids:
+            return []
+        result = await self.session.execute(
+            select(Student.class_id, Student.user_id, User.username, User.email)
+            .join(User, User.id == Student.user_id)
+            .where(Student.class_id.in_(class_ids))
+            .order_by(User.username)
+        )
+        return list(result.all())
+
     async def get_by_id(self, id: uuid.UUID) -> TeacherRead | None:
         result = await self.session.execute(
             select(Teacher)
@@ -109,8 +203,10 @@ class TeacherRepository:
         if hasattr(data, "email") and data.email:
             teacher.user.email = str(data.email)
 
-        await self.session.flush()
+        await self.session.commit()
         await self.session.refresh(teacher)
+        await invalidate(teacher_flags_cache, str(id))
+        await invalidate(teacher_home_cache, str(id))
 
         return TeacherRead.model_validate(teacher)
 
@@ -120,8 +216,15 @@ class TeacherRepository:
         if not user:
             return False
 
+        # Grades and attendance given by this teacher are removed by ON DELETE CASCADE
+        stats = StatsRepository(self.session)
+        await stats.remove_grades(GradeModel.teacher_id == id)
+        await stats.remove_attendance(Attendance.teacher_id == id)
         await self.session.delete(user)
         await self.session.commit()
+        await invalidate(teacher_flags_cache, str(id))
+        await invalidate(teacher_home_cache, str(id))
+        await invalidate(teacher_assignments_cache, str(id))
         return True
 
     async def get_students_for_teacher(self, teacher_id: uuid.UUID):
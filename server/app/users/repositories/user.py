@@ -1,10 +1,15 @@
 import uuid
 from datetime import datetime
 
+from sqlalchemy import or_
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from app.attendance.models import Attendance
+from app.grade.models import GradeModel
+from app.stats.repository import StatsRepository
 from app.users.models import User
 from app.users.schemas.user_base import UserCreate, UserRead
+from config.cache import invalidate, teacher_flags_cache, teacher_home_cache
 from config.database import AsyncSession
 
 
@@ -57,6 +62,8 @@ class UserRepository:
         user.school_id = data.school_id
         await self.session.commit()
         await self.session.refresh(user)
+        await invalidate(teacher_flags_cache, str(user_id))
+        await invalidate(teacher_home_cache)
         return UserRead.model_validate(user)
 
     async def delete(self, user_id: uuid.UUID) -> bool:
@@ -64,6 +71,12 @@ class UserRepository:
         user = result.scalars().first()
         if not user:
             return False
+        # Keep the rollups in sync with the grades/attendance removed by ON DELETE CASCADE
+        stats = StatsRepository(self.session)
+        await stats.remove_grades(or_(GradeModel.student_id == user_id, GradeModel.teacher_id == user_id))
+        await stats.remove_attendance(or_(Attendance.student_id == user_id, Attendance.teacher_id == user_id))
         await self.session.delete(user)
         await self.session.commit()
+        await invalidate(teacher_flags_cache, str(user_id))
+        await invalidate(teacher_home_cache)
         return True
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
 from typing import List
+import os
 import uuid
 from sqlalchemy import select
 
 from app.users.repositories import StudentRepository
 from app.users.schemas.student import StudentRead, StudentCreate
+from app.users.schemas.student_home import StudentHome
 from app.users.services import StudentService
 from app.users.models import Student
 from app.classes.models import Class
+from config.cache import invalidate, teacher_home_cache
+from config.conditional import check_etag
 from config.database import AsyncSession, get_db
 from config.dependences import get_current_user, admin_required
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
+# Size of the recent/upcoming lists in /students/me/home
+STUDENT_HOME_ITEMS = int(os.getenv("STUDENT_HOME_ITEMS", "10"))
+
 
 async def get_student_service(session: AsyncSession = Depends(get_db)) -> StudentService:
     repository = StudentRepository(session)
@@ -38,25 +45,63 @@ async def get_current_student(
     student = await service.repository.get_by_id(user_uuid)
 
     if not student:
-        result = await session.execute(select(Class))
-        first_class = result.scalars().first()
-
-        if not first_class:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="No classes available. Please contact administrator."
-            )
-        new_student = Student(
-            user_id=user_uuid,
-            class_id=first_class.id
-        )
-        session.add(new_student)
-        await session.commit()
-        await session.refresh(new_student)
+        await _create_student_record(user_uuid, session)
         student = await service.repository.get_by_id(user_uuid)
     return student
 
 
+@router.get("/me/home", response_model=StudentHome)
+async def get_current_student_home(
+        request: Request,
+        response: Response,
+        limit: int = Query(STUDENT_HOME_ITEMS, ge=1, le=50, description="Size of the recent/upcoming lists"),
+        current_user: dict = Depends(get_current_user),
+        service: StudentService = Depends(get_student_service),
+        session: AsyncSession = Depends(get_db)
+):
+    """
+    Profile, timetable, recent grades/attendance/notifications and upcoming homework
+    in one round trip (replaces /students/me, /grades/my-grades, /homework/my,
+    /schedules/class/{id}, /notifications/my-notifications and /attendance/student/{id}
+    on launch). Send the ETag back as If-None-Match to get 304 when nothing changed.
+    """
+    if current_user["role"] != "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only students have a home screen")
+    try:
+        user_uuid = uuid.UUID(current_user["id"])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID in token")
+
+    version = await service.get_home_version(user_uuid)
+    if version is None:
+        await _create_student_record(user_uuid, session)
+        version = await service.get_home_version(user_uuid)
+    not_modified = check_etag(request, response, version)
+    if not_modified:
+        return not_modified
+    return await service.get_home(user_uuid, limit)
+
+
+async def _create_student_record(user_id: uuid.UUID, session: AsyncSession) -> None:
+    # Student users created before their student row existed get one on first access
+    result = await session.execute(select(Class))
+    first_class = result.scalars().first()
+
+    if not first_class:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No classes available. Please contact administrator."
+        )
+    new_student = Student(
+        user_id=user_id,
+        class_id=first_class.id
+    )
+    session.add(new_student)
+    await session.commit()
+    await session.refresh(new_student)
+    await invalidate(teacher_home_cache)
+
+
 @router.get("/{student_id}", response_model=StudentRead)
 async def get_student_by_id(student_id: uuid.UUID, service: StudentService = Depends(get_student_service)):
     return await service.get_student_by_id(student_id)
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Depends, status, UploadFile, File, HTTPException
 from typing import List, Optional
 from pydantic import BaseModel
@@ -8,6 +9,7 @@ from app.users.schemas.user_base import UserCreate, UserRead
 from app.users.models import User as UserModel
 from app.users.repositories.user import UserRepository
 from app.users.services.user import UserService
+from config.cache import invalidate, teacher_home_cache
 from config.database import AsyncSession, get_db
 from config.dependences import admin_required, get_current_user
 
@@ -87,10 +89,16 @@ async def update_my_profile(
 
     await session.commit()
     await session.refresh(user_obj)
+    await invalidate(teacher_home_cache)
 
     return UserRead.model_validate(user_obj)
 
 
+def _write_file(path: str, contents: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(contents)
+
+
 @router.post("/{user_id}/avatar", response_model=UserRead)
 async def upload_avatar(
         user_id: uuid.UUID,
@@ -120,8 +128,8 @@ async def upload_avatar(
     ext = "jpg" if file.content_type == "image/jpeg" else "png"
     filename = f"{uuid.uuid4()}.{ext}"
     filepath = os.path.join(uploads_dir, filename)
-    with open(filepath, "wb") as f:
-        f.write(contents)
+    # Disk writes block; keep them off the event loop
+    await asyncio.to_thread(_write_file, filepath, contents)
 
     # Update user avatar_url
     repo = UserRepository(session)
@@ -140,5 +148,6 @@ async def upload_avatar(
     user_obj.avatar_url = f"/uploads/{filename}"
     await session.commit()
     await session.refresh(user_obj)
+    await invalidate(teacher_home_cache, str(user_id))
 
     return UserRead.model_validate(user_obj)
@@ -1,3 +1,4 @@
 from .user_base import UserRead, UserCreate, UserBase
 from .student import StudentRead, StudentCreate
+from .student_home import StudentHome
 from .teacher import TeacherRead, TeacherCreate
\ No newline at end of file
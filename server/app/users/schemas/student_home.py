@@ -0,0 +1,53 @@
+import uuid
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.attendance.schemas import AttendanceRead
+from app.grade.schemas import GradeRead
+from app.homework.schemas import HomeworkRead
+from app.notification.schemas import NotificationRead
+from app.schedule.schemas import ScheduleRead
+from app.users.schemas.student import StudentRead
+
+
+class ClassInfo(BaseModel):
+    id: uuid.UUID
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class HomeGrades(BaseModel):
+    average: Optional[float] = None
+    count: int
+    recent: List[GradeRead]
+
+
+class HomeAttendance(BaseModel):
+    present: int
+    absent: int
+    late: int
+    excused: int
+    recent: List[AttendanceRead]
+
+
+class HomeHomework(BaseModel):
+    upcoming_count: int
+    upcoming: List[HomeworkRead]
+
+
+class HomeNotifications(BaseModel):
+    unread_count: int
+    recent: List[NotificationRead]
+
+
+class StudentHome(BaseModel):
+    """Everything the student app shows on launch, in one response."""
+    student: StudentRead
+    school_class: Optional[ClassInfo] = None
+    schedule: List[ScheduleRead]
+    grades: HomeGrades
+    attendance: HomeAttendance
+    homework: HomeHomework
+    notifications: HomeNotifications
@@ -2,8 +2,14 @@ import uuid
 from typing import List, Optional
 from fastapi import HTTPException, status
 
+from app.attendance.schemas import AttendanceRead
+from app.grade.schemas import GradeRead
+from app.homework.schemas import HomeworkRead
+from app.notification.schemas import NotificationRead
+from app.schedule.schemas import ScheduleRead
 from app.users.repositories import StudentRepository
 from app.users.schemas.student import StudentCreate, StudentRead
+from app.users.schemas.student_home import ClassInfo, StudentHome
 
 
 class StudentService:
@@ -25,6 +31,53 @@ class StudentService:
             )
         return student
 
+    async def get_home_version(self, student_id: uuid.UUID) -> Optional[tuple]:
+        return await self.repository.get_home_version(student_id)
+
+    async def get_home(self, student_id: uuid.UUID, limit: int) -> Optional[StudentHome]:
+        """
+        The student app's launch screen: profile, class timetable, the `limit` most recent
+        grades, attendance records and notifications, the next `limit` homework due, and
+        totals (averages and attendance counts come from the rollup tables). None if the
+        user has no student record yet.
+        """
+        student = await self.repository.get_with_class(student_id)
+        if not student:
+            return None
+
+        counts = await self.repository.get_home_counts(student_id)
+        grades = await self.repository.get_recent_grades(student_id, limit)
+        attendance = await self.repository.get_recent_attendance(student_id, limit)
+        homework = await self.repository.get_upcoming_homework(student_id, limit)
+        notifications = await self.repository.get_recent_notifications(student_id, limit)
+        schedule = await self.repository.get_class_schedule(student.class_id) if student.class_id else []
+
+        return StudentHome(
+            student=StudentRead.model_validate(student),
+            school_class=ClassInfo.model_validate(student.class_) if student.class_ else None,
+            schedule=[ScheduleRead.model_validate(s) for s in schedule],
+            grades={
+                "average": round(counts.grade_sum / counts.grade_count, 2) if counts.grade_count else None,
+                "count": counts.grade_count,
+                "recent": [GradeRead.model_validate(g) for g in grades],
+            },
+            attendance={
+                "present": counts.present,
+                "absent": counts.absent,
+                "late": counts.late,
+                "excused": counts.excused,
+                "recent": [AttendanceRead.model_validate(a) for a in attendance],
+            },
+            homework={
+                "upcoming_count": counts.upcoming_homework,
+                "upcoming": [HomeworkRead.from_orm_with_assignments(h) for h in homework],
+            },
+            notifications={
+                "unread_count": counts.unread_notifications,
+                "recent": [NotificationRead.model_validate(n) for n in notifications],
+            },
+        )
+
     async def create_student(self, student_create: StudentCreate) -> StudentRead:
         return await self.repository.create(student_create)
 
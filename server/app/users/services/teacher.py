@@ -4,10 +4,28 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 
+from app.users.models import Teacher
 from app.users.repositories.teacher import TeacherRepository
 from app.users.repositories.user import UserRepository
 from app.users.schemas import TeacherRead
 from app.users.schemas.teacher import TeacherCreate, TeacherRead, TeacherUpdate
+from config.cache import teacher_home_cache
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _subject(subject_id, name) -> dict:
+    return {'id': str(subject_id), 'name': name}
+
+
+def _group_subjects(rows) -> dict:
+    """{class_id: [subject, ...]} from (class_id, subject_id, subject_name) rows, deduplicated."""
+    grouped: dict = {}
+    for class_id, subject_id, name in rows:
+        grouped.setdefault(class_id, {})[subject_id] = _subject(subject_id, name)
+    return {class_id: list(subjects.values()) for class_id, subjects in grouped.items()}
 
 
 class TeacherService:
@@ -96,3 +114,124 @@ class TeacherService:
 
     async def get_students_for_teacher(self, teacher_id: uuid.UUID):
         return await self.repository.get_students_for_teacher(teacher_id)
+
+    async def get_home(self, user_id: uuid.UUID) -> dict:
+        """
+        The /teachers/me payload, assembled from a few set-based queries and cached per
+        user (invalidated by schedule, class, assignment, student and teacher writes).
+        """
+        return await teacher_home_cache.get_or_load(str(user_id), lambda: self._build_home(user_id))
+
+    async def _build_home(self, user_id: uuid.UUID) -> dict:
+        row = await self.repository.get_with_user(user_id)
+        if not row:
+            self.repository.session.add(Teacher(user_id=user_id))
+            await self.repository.session.commit()
+            row = await self.repository.get_with_user(user_id)
+        teacher, user = row
+
+        # SPECIAL CASE: If director, load ALL classes from their school
+        if teacher.is_director and user.school_id:
+            return await self._build_director_home(teacher, user)
+
+        # NORMAL CASE: Regular teacher or homeroom teacher
+        # Prefer explicit teacher<->class<->subject assignments, fall back to schedules
+        assigned = await self.repository.get_assigned_subjects(user_id)
+        if assigned:
+            pairs = assigned
+            classes = await self.repository.get_classes(class_ids=sorted({class_id for class_id, _, _ in assigned}))
+        else:
+            pairs = await self.repository.get_scheduled_subjects(teacher_id=user_id)
+            classes = await self.repository.get_classes(homeroom_teacher_id=user_id)
+
+        subjects = {subject_id: _subject(subject_id, name) for _, subject_id, name in pairs}
+        class_subjects = _group_subjects(pairs)
+
+        students_by_class: dict = {}
+        for class_id, student_id, username, email in await self.repository.get_class_students([c.id for c in classes]):
+            students_by_class.setdefault(class_id, []).append((student_id, username, email))
+
+        serialized_classes = []
+        for c in classes:
+            class_id = str(c.id)
+            school_id = str(c.school_id) if c.school_id else None
+            students = []
+            for student_id, username, email in students_by_class.get(c.id, []):
+                serialized_user = {
+                    'id': str(student_id),
+                    'username': username or '',
+                    'name': username or '',
+                    'email': email or '',
+                    'class_id': class_id,
+                    'school_id': school_id,
+                }
+                students.append({
+                    'user_id': str(student_id),
+                    'class_id': class_id,
+                    'parent_id': None,
+                    # provide nested user object to match client expectations
+                    'user': serialized_user,
+                    # backward-compatible top-level fields
+                    'username': serialized_user['username'],
+                    'email': serialized_user['email'],
+                })
+            serialized_classes.append({
+                'id': class_id,
+                'name': c.name,
+                'school_id': school_id,
+                'created_at': _iso(c.created_at),
+                'updated_at': _iso(c.updated_at),
+                'teacher_id': str(c.teacher_id) if c.teacher_id else None,
+                'students': students,
+                # subjects this teacher teaches in this class
+                'subjects': class_subjects.get(c.id, []),
+            })
+
+        return {
+            'user_id': str(teacher.user_id),
+            'subject': teacher.subject,
+            'is_homeroom': teacher.is_homeroom,
+            'is_director': teacher.is_director,
+            'class_id': str(teacher.class_id) if teacher.class_id else None,
+            'school_id': str(user.school_id) if user.school_id else None,
+            'user': {
+                'id': str(user.id),
+                'username': user.username or '',
+                'email': user.email or '',
+                'avatar_url': user.avatar_url,
+                'school_id': str(user.school_id) if user.school_id else None,
+            },
+            'classes': serialized_classes,
+            # distinct subjects this teacher teaches
+            'subjects': list(subjects.values()),
+            'created_at': _iso(teacher.created_at),
+            'updated_at': _iso(teacher.updated_at),
+        }
+
+    async def _build_director_home(self, teacher: Teacher, user) -> dict:
+        classes = await self.repository.get_classes(school_id=user.school_id)
+        # Subjects per class from the school's schedules, grouped in one pass
+        class_subjects = _group_subjects(
+            await self.repository.get_scheduled_subjects(class_ids=[c.id for c in classes])
+        )
+
+        payload = {
+            'user_id': teacher.user_id,
+            'user': user,
+            'subject': teacher.subject,
+            'is_homeroom': teacher.is_homeroom,
+            'is_director': teacher.is_director,
+            'created_at': teacher.created_at,
+            'updated_at': teacher.updated_at,
+            'classes': [
+                {
+                    'id': c.id,
+                    'name': c.name,
+                    'school_id': c.school_id,
+                    'teacher_id': c.teacher_id,
+                    'subjects': class_subjects.get(c.id, []),
+                }
+                for c in classes
+            ],
+        }
+        return TeacherRead.model_validate(payload).model_dump(mode="json")
@@ -1,22 +1,70 @@
 """
 WebSocket connection manager for real-time notifications.
 """
+import asyncio
 import json
 import logging
-from typing import Dict, List, Set
+import os
+from typing import Dict, List, Optional, Set, Tuple
 from fastapi import WebSocket
 
+from config.broker import Broker, broker as default_broker
+
 logger = logging.getLogger(__name__)
 
 
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "100"))
+# What to do when a client's outbound queue is full: "drop" the oldest queued message,
+# or "disconnect" the client (it reconnects and refetches state over HTTP).
+WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "drop").lower()
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+
+# Close code used when a slow client is disconnected (1013 = Try Again Later)
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+# Broker channel carrying messages to the connections held by every worker
+WS_CHANNEL = "ws_messages"
+
+
+class _Connection:
+    """One WebSocket with its bounded outbound queue and the task that drains it."""
+
+    def __init__(self, websocket: WebSocket, user_id: str, queue_size: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
 class ConnectionManager:
-    """Manages WebSocket connections for real-time communication."""
+    """Manages WebSocket connections for real-time communication.
+
+    Sends never await the socket: messages are put on a per-connection queue and
+    written by that connection's writer task, so one slow client cannot delay
+    delivery to the others.
 
-    def __init__(self):
+    send_* and broadcast publish on the broker, and every worker delivers the message
+    to the sockets it holds, so users connected to another process are reached too.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        overflow_policy: str = WS_OVERFLOW_POLICY,
+        broker: Optional[Broker] = None,
+    ):
         # Map of user_id to their active connections
         self.active_connections: Dict[str, List[WebSocket]] = {}
         # Set of all connected websockets for broadcast
         self.all_connections: Set[WebSocket] = set()
+        self.connections: Dict[WebSocket, _Connection] = {}
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.dropped_messages = 0
+        self.slow_disconnects = 0
+        self.broker = broker or default_broker
+        self.broker.subscribe(WS_CHANNEL, self._on_broker_message)
 
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept a new WebSocket connection."""
@@ -25,6 +73,10 @@ class ConnectionManager:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
         self.all_connections.add(websocket)
+
+        conn = _Connection(websocket, user_id, self.queue_size)
+        conn.writer = asyncio.create_task(self._writer(conn))
+        self.connections[websocket] = conn
         logger.info(f"User {user_id} connected. Total connections: {len(self.all_connections)}")
 
     def disconnect(self, websocket: WebSocket, user_id: str):
@@ -35,46 +87,130 @@ class ConnectionManager:
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
         self.all_connections.discard(websocket)
+
+        conn = self.connections.pop(websocket, None)
+        if conn is None:
+            return
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
         logger.info(f"User {user_id} disconnected. Total connections: {len(self.all_connections)}")
 
+    async def _writer(self, conn: _Connection):
+        while True:
+            message = await conn.queue.get()
+            try:
+                await asyncio.wait_for(conn.websocket.send_json(message), timeout=WS_SEND_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Close the socket too: the client's receive loop would otherwise keep it
+                # "connected" while every later push and pong is dropped, and it would never
+                # reconnect and refetch its state over HTTP
+                self.slow_disconnects += 1
+                logger.warning(f"Failed to send to user {conn.user_id}, disconnecting: {e!r}")
+                self.disconnect(conn.websocket, conn.user_id)
+                asyncio.create_task(self._close(conn.websocket))
+                return
+
+    def _enqueue(self, conn: _Connection, message: dict):
+        try:
+            conn.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow_policy == "disconnect":
+            self.slow_disconnects += 1
+            logger.warning(f"Outbound queue full for user {conn.user_id}, disconnecting slow client")
+            self.disconnect(conn.websocket, conn.user_id)
+            asyncio.create_task(self._close(conn.websocket))
+            return
+
+        # "drop": discard the oldest queued message to make room for the newest
+        conn.queue.get_nowait()
+        conn.queue.put_nowait(message)
+        conn.dropped += 1
+        self.dropped_messages += 1
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=SLOW_CLIENT_CLOSE_CODE, reason="Client too slow")
+        except Exception:
+            pass
+
+    def send_to_socket(self, message: dict, websocket: WebSocket):
+        """Queue a message for one connection (replies to that client's own requests)."""
+        conn = self.connections.get(websocket)
+        if conn is not None:
+            self._enqueue(conn, message)
+
+    def _deliver_local(self, message: dict, user_id: str):
+        for websocket in list(self.active_connections.get(user_id, [])):
+            self.send_to_socket(message, websocket)
+
+    async def _on_broker_message(self, payload: dict):
+        if "broadcast" in payload:
+            for conn in list(self.connections.values()):
+                self._enqueue(conn, payload["broadcast"])
+        elif "to" in payload:
+            for user_id in payload["to"]:
+                self._deliver_local(payload["message"], user_id)
+        else:
+            for user_id, message in payload.get("deliveries", []):
+                self._deliver_local(message, user_id)
+        # Let writer tasks run between messages of a burst so healthy clients keep up
+        await asyncio.sleep(0)
+
     async def send_personal_message(self, message: dict, user_id: str):
         """Send a message to a specific user."""
-        if user_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send to user {user_id}: {e}")
-                    disconnected.append(connection)
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.disconnect(conn, user_id)
+        await self.broker.publish(WS_CHANNEL, {"to": [user_id], "message": message})
 
     async def send_to_users(self, message: dict, user_ids: List[str]):
         """Send a message to multiple users."""
-        for user_id in user_ids:
-            await self.send_personal_message(message, user_id)
+        await self.broker.publish(WS_CHANNEL, {"to": list(user_ids), "message": message})
+
+    async def send_many(self, deliveries: List[Tuple[str, dict]]):
+        """Send a different message to each user, packing as many as fit in one publish."""
+        limit = self.broker.max_payload_bytes
+        if limit is None:
+            await self.broker.publish(WS_CHANNEL, {"deliveries": [list(d) for d in deliveries]})
+            return
+
+        chunk: list = []
+        size = 0
+        for user_id, message in deliveries:
+            item_size = len(json.dumps([user_id, message], default=str).encode()) + 1
+            if chunk and size + item_size > limit:
+                await self.broker.publish(WS_CHANNEL, {"deliveries": chunk})
+                chunk, size = [], 0
+            chunk.append([user_id, message])
+            size += item_size
+        if chunk:
+            await self.broker.publish(WS_CHANNEL, {"deliveries": chunk})
 
     async def broadcast(self, message: dict):
         """Send a message to all connected clients."""
-        disconnected = []
-        for connection in self.all_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"Broadcast failed: {e}")
-                disconnected.append(connection)
-        # Clean up disconnected connections
-        for conn in disconnected:
-            self.all_connections.discard(conn)
+        await self.broker.publish(WS_CHANNEL, {"broadcast": message})
+
+    def get_stats(self) -> dict:
+        """Outbound queue metrics for the admin dashboard."""
+        depths = [conn.queue.qsize() for conn in self.connections.values()]
+        return {
+            "queue_size_limit": self.queue_size,
+            "overflow_policy": self.overflow_policy,
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "full_queues": sum(1 for depth in depths if depth >= self.queue_size),
+            "dropped_messages": self.dropped_messages,
+            "slow_client_disconnects": self.slow_disconnects,
+        }
 
     def get_online_users(self) -> List[str]:
         """Get list of currently connected user IDs."""
         return list(self.active_connections.keys())
 
     def is_user_online(self, user_id: str) -> bool:
-        """Check if a user is currently connected."""
+        """Check if a user is currently connected to this worker."""
         return user_id in self.active_connections
 
 
@@ -5,7 +5,8 @@ import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from jose import jwt, JWTError
 
-from config.security import SECRET_KEY, ALGORITHM
+from config.security import SECRET_KEY, ALGORITHM, get_token_id
+from config.token_blacklist import is_token_revoked
 from app.websocket.manager import manager
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,8 @@ def verify_ws_token(token: str) -> dict | None:
     """Verify JWT token for WebSocket connection."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if is_token_revoked(get_token_id(token, payload)):
+            return None
         user_id = payload.get("sub")
         role = payload.get("role")
         if user_id and role:
@@ -47,11 +50,11 @@ async def websocket_endpoint(
 
     try:
         # Send connection confirmation
-        await websocket.send_json({
+        manager.send_to_socket({
             "type": "connected",
             "message": "Connected to notification service",
             "user_id": user_id
-        })
+        }, websocket)
 
         # Keep connection alive and listen for messages
         while True:
@@ -60,16 +63,16 @@ async def websocket_endpoint(
 
                 # Handle ping/pong for keep-alive
                 if data.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    manager.send_to_socket({"type": "pong"}, websocket)
 
                 # Handle other message types as needed
                 elif data.get("type") == "subscribe":
                     # Client wants to subscribe to specific channels
                     channels = data.get("channels", [])
-                    await websocket.send_json({
+                    manager.send_to_socket({
                         "type": "subscribed",
                         "channels": channels
-                    })
+                    }, websocket)
 
             except Exception as e:
                 logger.warning(f"Error processing message: {e}")
@@ -88,5 +91,6 @@ async def get_online_users():
     """Get count of online users (for admin dashboard)."""
     return {
         "online_count": len(manager.all_connections),
-        "users_online": len(manager.active_connections)
+        "users_online": len(manager.active_connections),
+        "delivery": manager.get_stats()
     }
@@ -0,0 +1,209 @@
+"""
+Pub/sub between API worker processes.
+
+Each process keeps its own WebSocket connections, so anything that must reach every
+worker (real-time messages, later cache/token invalidations) is published on a channel
+and delivered to the handlers subscribed to it in every process.
+
+Backends (BROKER_BACKEND):
+- "memory" (default): in-process only, for a single uvicorn worker.
+- "postgres": LISTEN/NOTIFY on the application database, no extra infrastructure.
+  Payloads too large for NOTIFY are stored in broker_payloads and only their id is
+  notified; every worker reads the body back from the table.
+"""
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import BigInteger, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import func
+
+from config.database import Base, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASS
+
+logger = logging.getLogger(__name__)
+
+BROKER_BACKEND = os.getenv("BROKER_BACKEND", "memory").lower()
+# How long an oversized payload stays in broker_payloads for the workers to read it
+BROKER_PAYLOAD_TTL_SECONDS = int(os.getenv("BROKER_PAYLOAD_TTL_SECONDS", "300"))
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class Broker(ABC):
+    """Channel-based publish/subscribe; payloads are JSON-serialisable dicts."""
+
+    # True when every subscriber lives in this process
+    is_local = True
+    # Maximum encoded payload size per publish, None for unlimited
+    max_payload_bytes: Optional[int] = None
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, channel: str, handler: Handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: dict):
+        """Deliver payload to the handlers subscribed to channel in every process."""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def _deliver(self, channel: str, payload: dict):
+        for handler in self.handlers.get(channel, []):
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.warning(f"Broker handler for '{channel}' failed: {e}")
+
+
+class BrokerPayload(Base):
+    """Body of a publish too large for a NOTIFY payload, read back by id by every worker."""
+
+    __tablename__ = "broker_payloads"
+    __table_args__ = (Index("ix_broker_payloads_created_at", "created_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    channel: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+class InProcessBroker(Broker):
+    async def publish(self, channel: str, payload: dict):
+        await self._deliver(channel, payload)
+
+
+class PostgresBroker(Broker):
+    """LISTEN/NOTIFY over the application's PostgreSQL database.
+
+    Each process keeps two dedicated asyncpg connections: one listening, reconnected
+    if it drops, and one for publishing (pg_notify in autocommit), so a publish costs
+    one round trip and never takes a connection from the request pool. A payload over
+    max_payload_bytes is stored in broker_payloads and notified as {"_ref": id}.
+    """
+
+    is_local = False
+    # NOTIFY payloads must be shorter than 8000 bytes
+    max_payload_bytes = 7900
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        super().__init__()
+        self.reconnect_delay = reconnect_delay
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncpg.Connection] = None
+        self._publisher_lock = asyncio.Lock()
+
+    def subscribe(self, channel: str, handler: Handler):
+        is_new = channel not in self.handlers
+        super().subscribe(channel, handler)
+        if is_new and self._connection is not None and not self._connection.is_closed():
+            asyncio.create_task(self._connection.add_listener(channel, self._on_notify))
+
+    async def _connect(self) -> asyncpg.Connection:
+        return await asyncpg.connect(
+            host=DB_HOST, port=DB_PORT, database=DB_NAME, user=DB_USER, password=DB_PASS
+        )
+
+    async def _execute(self, method: str, query: str, *args):
+        """Run a query on the publisher connection, reconnecting once if it was lost."""
+        async with self._publisher_lock:
+            for attempt in range(2):
+                if self._publisher is None or self._publisher.is_closed():
+                    self._publisher = await self._connect()
+                try:
+                    return await getattr(self._publisher, method)(query, *args)
+                except (asyncpg.ConnectionDoesNotExistError, asyncpg.InterfaceError):
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    async def publish(self, channel: str, payload: dict):
+        data = json.dumps(payload, default=str)
+        if len(data.encode()) > self.max_payload_bytes:
+            ref = await self._execute(
+                "fetchval",
+                f"WITH expired AS (DELETE FROM {BrokerPayload.__tablename__} "
+                f"WHERE created_at < now() - make_interval(secs => $3)) "
+                f"INSERT INTO {BrokerPayload.__tablename__} (channel, payload) VALUES ($1, $2) RETURNING id",
+                channel, data, BROKER_PAYLOAD_TTL_SECONDS,
+            )
+            data = json.dumps({"_ref": ref})
+        await self._execute("execute", "SELECT pg_notify($1, $2)", channel, data)
+
+    def _on_notify(self, connection, pid, channel, data):
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring malformed notification on '{channel}'")
+            return
+        if isinstance(payload, dict) and set(payload) == {"_ref"}:
+            asyncio.create_task(self._deliver_stored(channel, payload["_ref"]))
+        else:
+            asyncio.create_task(self._deliver(channel, payload))
+
+    async def _deliver_stored(self, channel: str, ref: int):
+        try:
+            data = await self._execute(
+                "fetchval", f"SELECT payload FROM {BrokerPayload.__tablename__} WHERE id = $1", ref
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read stored broker payload {ref} for '{channel}': {e}")
+            return
+        if data is None:
+            logger.warning(f"Stored broker payload {ref} for '{channel}' has expired")
+            return
+        await self._deliver(channel, json.loads(data))
+
+    async def _listen(self):
+        while True:
+            try:
+                self._connection = await self._connect()
+                closed = asyncio.Event()
+                self._connection.add_termination_listener(lambda _: closed.set())
+                for channel in self.handlers:
+                    await self._connection.add_listener(channel, self._on_notify)
+                logger.info(f"Broker listening on {list(self.handlers)}")
+                await closed.wait()
+                logger.warning("Broker connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Broker connection failed: {e}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+        if self._publisher is not None and not self._publisher.is_closed():
+            await self._publisher.close()
+        self._publisher = None
+
+
+def create_broker(backend: str = BROKER_BACKEND) -> Broker:
+    if backend == "postgres":
+        return PostgresBroker()
+    return InProcessBroker()
+
+
+# Global broker instance; subscribe handlers at import time, start it in the app lifespan
+broker = create_broker()
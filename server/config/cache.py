@@ -0,0 +1,177 @@
+"""
+Small in-process TTL + LRU caches with single-flight loading and cross-worker invalidation.
+
+Cached values are per worker; writes that change them call invalidate(), which drops
+the entry locally and publishes the invalidation on the broker so other workers drop
+their copy too. The TTL bounds staleness if an invalidation is ever missed.
+
+get_or_load() is the read-through path: on a miss only the first caller runs the
+loader, and concurrent callers for the same key wait for its result instead of
+issuing the same query (single-flight). A load that overlaps an invalidation is
+returned to its callers but not stored. Values are shared between requests, so cache
+immutable data (tuples, pydantic read models) and never mutate what you get back.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from config.broker import broker
+
+logger = logging.getLogger(__name__)
+
+CACHE_CHANNEL = "cache_invalidation"
+
+MISSING = object()
+
+
+class TTLCache:
+    """Dict with per-entry expiry and a size bound (least recently used entries are evicted first)."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 10000):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        # Bumped by every discard(), so loads that raced an invalidation are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        _caches[name] = self
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, or the result of loader(), run once for all concurrent misses."""
+        value = self.get(key)
+        while value is MISSING:
+            future = self._loading.get(key)
+            if future is None:
+                return await self._load(key, loader)
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The request running the load was cancelled; load it ourselves
+                value = self.get(key)
+        return value
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't warn when there were none
+            future.exception()
+            raise
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+        if generation == self._generation:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def discard(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key locally, or everything when key is None."""
+        self._generation += 1
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "coalesced": self.coalesced,
+            "loading": len(self._loading),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def get_stats() -> Dict[str, dict]:
+    """Counters of every cache in this worker, by cache name."""
+    return {name: cache.get_stats() for name, cache in _caches.items()}
+
+
+async def invalidate(cache: TTLCache, key: Optional[Hashable] = None) -> None:
+    """Drop a key (or the whole cache) in this worker and in every other worker."""
+    cache.discard(key)
+    try:
+        await broker.publish(CACHE_CHANNEL, {"cache": cache.name, "key": key})
+    except Exception as e:
+        # The entry still expires on the other workers after the TTL
+        logger.warning(f"Failed to publish invalidation for cache '{cache.name}': {e}")
+
+
+async def _on_invalidation(payload: dict) -> None:
+    cache = _caches.get(payload.get("cache"))
+    if cache is not None:
+        cache.discard(payload.get("key"))
+
+
+broker.subscribe(CACHE_CHANNEL, _on_invalidation)
+
+
+# Teacher authorization flags (is_director, is_homeroom, class_id, school_id) by user id
+TEACHER_FLAGS_TTL = float(os.getenv("TEACHER_FLAGS_CACHE_TTL", "300"))
+teacher_flags_cache = TTLCache("teacher_flags", ttl=TEACHER_FLAGS_TTL)
+
+# Assembled /teachers/me payloads by user id; cleared on schedule, class, assignment and roster writes
+TEACHER_HOME_TTL = float(os.getenv("TEACHER_HOME_CACHE_TTL", "120"))
+teacher_home_cache = TTLCache("teacher_home", ttl=TEACHER_HOME_TTL)
+
+# Reference data: read on almost every screen, written by admins. One key per list
+# (subjects: per list version, old versions fall out of the LRU).
+REFERENCE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "600"))
+subjects_cache = TTLCache("subjects", ttl=REFERENCE_TTL, maxsize=16)
+classes_cache = TTLCache("classes", ttl=REFERENCE_TTL, maxsize=16)
+schools_cache = TTLCache("schools", ttl=REFERENCE_TTL, maxsize=16)
+
+# (class_id, subject_id, subject_name) assignments by teacher id
+teacher_assignments_cache = TTLCache("teacher_assignments", ttl=REFERENCE_TTL)
@@ -0,0 +1,67 @@
+"""
+Conditional GET (ETag / If-None-Match) from cheap SQL version checks.
+
+A collection's version is the row count plus max(updated_at) of the rows, and of the
+rows whose names are embedded in the response (subject, class, teacher). Inserts
+and updates move the max, deletes change the count. The version query is one
+aggregate over an index, with no rows loaded. max(updated_at) alone cannot see
+deletes, so it is not sent as Last-Modified.
+
+A route computes the version first and returns the 304 from check_etag() before it
+loads or serializes anything:
+
+    not_modified = check_etag(request, response, await repository.get_class_version(class_id))
+    if not_modified:
+        return not_modified
+"""
+import hashlib
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Clients may keep the body but must revalidate before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def collection_version(model: Any, *criteria, related: Iterable[InstrumentedAttribute] = ()) -> Select:
+    """
+    count and max(updated_at) of the `model` rows matching `criteria`, plus
+    max(updated_at) of each many-to-one relationship in `related`.
+    """
+    query = select(func.count(model.id), func.max(model.updated_at)).select_from(model).where(*criteria)
+    for relationship in related:
+        target = relationship.property.mapper.class_
+        query = query.outerjoin(relationship).add_columns(func.max(target.updated_at))
+    return query
+
+
+def make_etag(request: Request, version: Any) -> str:
+    """Strong ETag for this URL (path and query) at the given data version."""
+    key = repr((request.url.path, request.url.query, version)).encode()
+    return f'"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check with weak comparison, as RFC 9110 requires for it."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def check_etag(request: Request, response: Response, version: Any) -> Optional[Response]:
+    """
+    Set ETag on the response, and return a 304 response when the client's copy is
+    current (the caller returns it as is).
+    """
+    etag = make_etag(request, version)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
@@ -1,10 +1,14 @@
 import logging
+import uuid
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError, ExpiredSignatureError
 
-from config.security import SECRET_KEY, ALGORITHM
-from config.token_blacklist import is_token_blacklisted
+from config.cache import teacher_flags_cache
+from config.database import AsyncSession, get_db
+from config.security import SECRET_KEY, ALGORITHM, get_token_id
+from config.token_blacklist import is_token_revoked
 
 logger = logging.getLogger(__name__)
 http_bearer_scheme = HTTPBearer(auto_error=False)
@@ -19,15 +23,16 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(http_be
 
     token = credentials.credentials
 
-    # Check if token is blacklisted
-    if is_token_blacklisted(token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked"
-        )
-
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+        # Check if token has been revoked
+        if is_token_revoked(get_token_id(token, payload)):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+
         user_id: str = payload.get("sub")
         role: str = payload.get("role")
 
@@ -59,15 +64,25 @@ def admin_required(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-async def director_required(current_user: dict = Depends(get_current_user)):
+async def get_teacher_flags(user_id: str, session: AsyncSession) -> dict | None:
     """
-    Verifies that the current user is a teacher with director privileges.
+    Teacher authorization flags (is_director, is_homeroom, class_id, school_id), or None
+    for non-teachers. Served from a TTL cache that teacher/user updates invalidate.
     """
-    from config.database import get_db
-    from sqlalchemy import select
-    from app.users.models import Teacher
-    import uuid
+    from app.users.repositories.teacher import TeacherRepository
+
+    return await teacher_flags_cache.get_or_load(
+        user_id, lambda: TeacherRepository(session).get_flags(uuid.UUID(user_id))
+    )
 
+
+async def director_required(
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Verifies that the current user is a teacher with director privileges.
+    """
     if current_user["role"] != "teacher":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -75,21 +90,11 @@ async def director_required(current_user: dict = Depends(get_current_user)):
         )
 
     # Check if this teacher is marked as director
-    async for session in get_db():
-        try:
-            user_id = uuid.UUID(current_user["id"])
-            result = await session.execute(
-                select(Teacher).where(Teacher.user_id == user_id)
-            )
-            teacher = result.scalar_one_or_none()
-
-            if not teacher or not teacher.is_director:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Only directors can access this resource"
-                )
-
-            return current_user
-        finally:
-            break
+    flags = await get_teacher_flags(current_user["id"], session)
+    if not flags or not flags["is_director"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only directors can access this resource"
+        )
 
+    return current_user
@@ -0,0 +1,155 @@
+"""
+Event-loop stall detection and an on-demand sampling profiler.
+
+A heartbeat task on the loop records when it last ran; a watchdog thread checks it.
+When the heartbeat is late by more than LOOP_STALL_THRESHOLD the loop is blocked
+*right now*, so the watchdog grabs the loop thread's stack (the code that is blocking)
+and the request the running task belongs to. When the loop recovers the stall is
+logged with its duration, route and stack. Lag samples also feed the
+event_loop_lag_seconds histogram.
+
+profile() samples the loop thread's stack for a few seconds and returns collapsed
+stacks ("frame;frame;frame count" lines) that flamegraph.pl or speedscope can render.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Deque, Dict, Optional
+
+from config.metrics import LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "0.25"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+RECENT_STALLS = 20
+
+
+class LoopMonitor:
+    """Heartbeat task plus watchdog thread for one event loop."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, threshold: float = LOOP_STALL_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self._last_beat = time.perf_counter()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._profile_lock = threading.Lock()
+        # Request label ("GET /route") of every task currently serving an HTTP request
+        self.requests: Dict[asyncio.Task, str] = {}
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.recent: Deque[dict] = deque(maxlen=RECENT_STALLS)
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def request_started(self, label: str) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self.requests[task] = label
+
+    def request_finished(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self.requests.pop(task, None)
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - expected)
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        stall: Optional[dict] = None
+        while not self._stopping.wait(self.interval / 2):
+            late = time.perf_counter() - self._last_beat - self.interval
+            if late > self.threshold and stall is None:
+                # Still blocked: whatever is on the loop thread's stack is the culprit
+                stall = self._capture()
+            elif late <= self.threshold and stall is not None:
+                # The heartbeat ran again as soon as the loop was free
+                stall["duration_ms"] = round((self._last_beat - stall.pop("_expected")) * 1000, 1)
+                self._report(stall)
+                stall = None
+
+    def _capture(self) -> dict:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        task = asyncio.current_task(self.loop) if self.loop is not None else None
+        return {
+            "_expected": self._last_beat + self.interval,
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "route": self.requests.get(task) if task is not None else None,
+            "task": task.get_name() if task is not None else None,
+            "stack": "".join(traceback.format_stack(frame)) if frame is not None else "",
+        }
+
+    def _report(self, stall: dict):
+        self.stalls += 1
+        self.recent.append(stall)
+        logger.warning(
+            f"Event loop blocked for {stall['duration_ms']} ms "
+            f"(route: {stall['route'] or 'none'}, task: {stall['task'] or 'none'}):\n{stall['stack']}"
+        )
+
+    def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """Sample the loop thread for `seconds`; blocking, run it off the loop."""
+        if not self._profile_lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            samples: Counter = Counter()
+            deadline = time.perf_counter() + min(seconds, PROFILE_MAX_SECONDS)
+            while time.perf_counter() < deadline:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame)
+                    samples[";".join(f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})" for f in stack)] += 1
+                time.sleep(interval)
+            return "\n".join(f"{stack} {count}" for stack, count in samples.most_common())
+        finally:
+            self._profile_lock.release()
+
+    def get_stats(self) -> dict:
+        return {
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "in_flight_requests": len(self.requests),
+            "recent_stalls": list(self.recent),
+        }
+
+
+# Global monitor instance
+loop_monitor = LoopMonitor()
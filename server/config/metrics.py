@@ -0,0 +1,131 @@
+"""
+Prometheus metrics for the API.
+
+Request count and latency are recorded for every route by
+middleware.RequestStatsMiddleware, so routers need no per-handler code. SQL latency
+comes from the engine events in config/query_stats.py. Notification fan-out and
+event-loop lag (config/loop_monitor.py) are observed where they happen. Pool, WebSocket, cache and hashing gauges are
+read from the existing get_stats() helpers only when /metrics is scraped. Updating a
+counter or histogram is a lock plus an add, so instrumentation can stay on in
+production.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+that all workers share. /metrics then aggregates the counters and histograms of every
+worker; the scrape-time gauges describe only the worker that answered.
+"""
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", multiprocess_mode="livesum"
+)
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements per HTTP request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency", buckets=QUERY_BUCKETS)
+NOTIFICATION_FANOUT = Histogram(
+    "notification_fanout_recipients", "Recipients per notification dispatch", ["kind"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of a scheduled callback on the event loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+class RuntimeCollector:
+    """Gauges read from the pool, WebSocket manager and password hasher at scrape time."""
+
+    def describe(self):
+        # Keeps register() from calling collect() at import time
+        return []
+
+    def collect(self):
+        # Imported here: these modules import config.metrics themselves
+        from app.notification.dispatcher import dispatcher
+        from config import cache
+        from app.password.hasher import password_hasher
+        from app.websocket.manager import manager
+        from config.database import get_pool_stats
+
+        pool = get_pool_stats()
+        yield _gauge("db_pool_size", "Configured pool size", pool["pool_size"])
+        yield _gauge("db_pool_checked_out", "Connections in use", pool["checked_out"])
+        yield _gauge("db_pool_overflow", "Overflow connections open", pool["overflow"])
+        if "checkouts" in pool:
+            yield _counter("db_pool_checkouts", "Pool checkouts", pool["checkouts"])
+            yield _counter("db_pool_saturated_checkouts", "Checkouts that found the pool exhausted",
+                           pool["saturated_checkouts"])
+            yield _counter("db_pool_timeouts", "Checkouts that timed out", pool["timeouts"])
+
+        ws = manager.get_stats()
+        yield _gauge("websocket_connections", "Open WebSocket connections", len(manager.connections))
+        yield _gauge("websocket_online_users", "Users with an open WebSocket", len(manager.active_connections))
+        yield _gauge("websocket_queued_messages", "Messages waiting in outbound queues", ws["queued_messages"])
+        yield _gauge("websocket_max_queue_depth", "Deepest outbound queue", ws["max_queue_depth"])
+        yield _gauge("websocket_full_queues", "Outbound queues at their limit", ws["full_queues"])
+        yield _counter("websocket_dropped_messages", "Messages dropped from full queues", ws["dropped_messages"])
+        yield _counter("websocket_slow_client_disconnects", "Clients disconnected for full queues",
+                       ws["slow_client_disconnects"])
+        yield _gauge("notification_dispatch_queue_depth", "Delivery batches waiting for the dispatcher",
+                     dispatcher.queue.qsize())
+
+        caches = cache.get_stats()
+        for name, documentation, key, family in (
+            ("cache_hits", "Cache lookups that found a fresh entry", "hits", CounterMetricFamily),
+            ("cache_misses", "Cache lookups that found no fresh entry", "misses", CounterMetricFamily),
+            ("cache_coalesced_loads", "Misses that waited for another caller's load", "coalesced", CounterMetricFamily),
+            ("cache_evictions", "Entries evicted to stay within maxsize", "evictions", CounterMetricFamily),
+            ("cache_entries", "Entries currently cached", "size", GaugeMetricFamily),
+        ):
+            metric = family(name, documentation, labels=["cache"])
+            for cache_name, stats in caches.items():
+                metric.add_metric([cache_name], stats[key])
+            yield metric
+
+        hasher = password_hasher.get_stats()
+        yield _gauge("password_hash_running", "Password hashes running", hasher["running"])
+        yield _gauge("password_hash_queue_depth", "Password hashes waiting for a slot", hasher["queue_depth"])
+        yield _counter("password_hash_timeouts", "Password hashes rejected after waiting", hasher["timeouts"])
+
+
+def _gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+def _counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+def render() -> bytes:
+    """Exposition text for /metrics."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        registry.register(RuntimeCollector())
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def observe_request(method: str, route: str, status: int, duration: float, db_queries: int) -> None:
+    HTTP_REQUESTS.labels(method, route, str(status)).inc()
+    HTTP_LATENCY.labels(method, route).observe(duration)
+    HTTP_DB_QUERIES.labels(method, route).observe(db_queries)
+
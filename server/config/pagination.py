@@ -1,10 +1,17 @@
 """
 Pagination utilities for FastAPI endpoints.
-Provides standardized pagination parameters and response format.
+Provides standardized pagination parameters and response format,
+with offset (skip/limit) and keyset (cursor) variants.
 """
-from typing import TypeVar, Generic, List, Optional
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, TypeVar, Generic, List, Optional, Tuple
 from pydantic import BaseModel
-from fastapi import Query
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar('T')
 
@@ -49,3 +56,96 @@ def create_paginated_response(
         "limit": limit,
         "has_more": skip + len(items) < total
     }
+
+
+# --- Keyset (cursor) pagination ---------------------------------------------
+#
+# Pages are ordered newest first on (created_at, id) and each page continues strictly
+# after the last row of the previous one, so every page costs one indexed range scan
+# no matter how deep it is, and no separate count() is needed.
+
+class CursorParams:
+    """
+    Dependency for opt-in cursor pagination.
+    Cursor mode is enabled when the `cursor` query parameter is present: send it
+    empty for the first page, then pass back `next_cursor` until it is null.
+    Usage: page: CursorParams = Depends()
+    """
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; empty for the first page"),
+        limit: int = Query(100, ge=1, le=200, description="Number of records to return (max 200)"),
+        with_total: bool = Query(False, description="Include the planner's estimate of the total row count"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.with_total = with_total
+
+    @property
+    def enabled(self) -> bool:
+        return self.cursor is not None
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Cursor-paginated response format."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_more: bool
+    limit: int
+    estimated_total: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def estimate_count(session: AsyncSession, query: Select, model: Any) -> int:
+    """Row estimate from the query planner (EXPLAIN), without scanning the rows."""
+    stmt = query.with_only_columns(model.id).order_by(None)
+    sql = stmt.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate_keyset(session: AsyncSession, query: Select, model: Any, params: CursorParams) -> dict:
+    """
+    Run one page of `query` (a select of `model`, filtered but not ordered) in
+    (created_at, id) descending order and build a CursorPaginatedResponse dict.
+    """
+    page_query = query.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1)
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor)
+        page_query = page_query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+
+    result = await session.execute(page_query)
+    # unique() is required when the query joinedloads a collection
+    rows = list(result.unique().scalars().all())
+    has_more = len(rows) > params.limit
+    items = rows[:params.limit]
+
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1].created_at, items[-1].id) if has_more else None,
+        "has_more": has_more,
+        "limit": params.limit,
+        "estimated_total": await estimate_count(session, query, model) if params.with_total else None,
+    }
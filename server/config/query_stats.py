@@ -0,0 +1,104 @@
+"""
+Per-request SQL accounting and N+1 detection.
+
+Engine events count every statement executed while a request is being handled, sum
+its DB time and group statements by shape (the SQL text with bind parameters and IN
+lists collapsed), so a handler that runs the same query in a loop shows up as one
+shape executed many times. middleware.RequestStatsMiddleware opens the tracking scope,
+logs the totals for every request and warns when a shape repeats more than
+QUERY_REPEAT_THRESHOLD times; with QUERY_STATS_HEADERS=1 (debug) the totals are also
+returned as X-DB-* response headers.
+
+The scope is a context variable, so concurrent requests on the same event loop are
+accounted separately, and SQLAlchemy's greenlets inherit it from the request task.
+"""
+import contextvars
+import os
+import re
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from config.database import engine
+from config.metrics import DB_QUERY_LATENCY
+
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "0").strip().lower() in ("1", "true", "yes", "on")
+
+_BIND_LIST = re.compile(r"\$\d+(?:::[\w\[\]]+)?(?:\s*,\s*\$\d+(?:::[\w\[\]]+)?)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL text with bind parameters and IN lists collapsed, so loops share one shape."""
+    return _WHITESPACE.sub(" ", _BIND_LIST.sub("?", statement)).strip()
+
+
+class QueryStats:
+    """Statements executed within one tracking scope (usually one HTTP request)."""
+
+    __slots__ = ("count", "total_ms", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Shapes executed more than `threshold` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    @property
+    def duplicates(self) -> int:
+        """Executions beyond the first of every shape."""
+        return self.count - len(self.shapes)
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+
+def start_tracking() -> Tuple[QueryStats, contextvars.Token]:
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop_tracking(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    # Every statement feeds the latency histogram, also outside HTTP requests
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed * 1000)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = context.connection
+    started = connection.info.get("query_started") if connection is not None else None
+    if started:
+        started.pop()
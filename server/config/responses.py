@@ -0,0 +1,95 @@
+"""
+Fast JSON responses for the whole API.
+
+FastJSONResponse (the app's default_response_class) renders with orjson, which
+handles UUID, datetime/date/time, enums and dataclasses natively, so handlers do not
+need str()/isoformat() before returning.
+
+By default FastAPI serializes a route's return value twice: pydantic (or, without a
+response_model, jsonable_encoder walking every value in Python) first builds plain
+dicts and lists, and the response class then encodes those. use_fast_json() skips the
+intermediate step for every route: routes with a response_model are serialized by
+pydantic straight to JSON bytes (dump_json), the others by orjson. Validation and
+include/exclude options still apply, and the OpenAPI schema does not change.
+
+tools/benchmark_json.py compares both paths on payloads shaped like the heaviest
+endpoints.
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import FastAPI
+from fastapi._compat.v2 import ModelField
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, request_response
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+
+class RenderedJSON(bytes):
+    """A response body that is already JSON."""
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not know, encoded like jsonable_encoder did
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, RenderedJSON):
+            return content
+        return dumps(content)
+
+
+class _ModelJSONField(ModelField):
+    """Response field that serializes the validated value to JSON bytes in one pass."""
+
+    def serialize(self, value: Any, *, mode: str = "json", **kwargs) -> RenderedJSON:
+        return RenderedJSON(self._type_adapter.dump_json(value, **kwargs))
+
+
+class _AnyJSONField(ModelField):
+    """Stand-in response field for routes without a response_model."""
+
+    def validate(self, value: Any, values: dict = {}, *, loc: tuple = ()):  # noqa: B006
+        return value, None
+
+    def serialize(self, value: Any, *, mode: str = "json", **kwargs) -> RenderedJSON:
+        return RenderedJSON(dumps(value))
+
+
+def use_fast_json(app: FastAPI) -> None:
+    """Serialize the responses of every FastJSONResponse route straight to bytes.
+
+    Call after all routers are included.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        response_class = route.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if not issubclass(response_class, FastJSONResponse):
+            continue
+
+        field = route.secure_cloned_response_field
+        if field is not None:
+            fast_field = _ModelJSONField(field_info=field.field_info, name=field.name, mode=field.mode)
+        else:
+            fast_field = _AnyJSONField(field_info=FieldInfo(annotation=Any), name="response", mode="serialization")
+        route.secure_cloned_response_field = fast_field
+        route.app = request_response(route.get_route_handler())
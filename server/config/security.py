@@ -1,4 +1,6 @@
+import hashlib
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from typing import Optional, Tuple
@@ -15,7 +17,7 @@ REFRESH_TOKEN_EXPIRE_DAYS = os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS")
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES)))
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -25,7 +27,8 @@ def create_refresh_token(data: dict) -> str:
     expire = datetime.now(timezone.utc) + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
     to_encode.update({
         "exp": expire,
-        "type": "refresh"
+        "type": "refresh",
+        "jti": uuid.uuid4().hex
     })
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -57,3 +60,20 @@ def get_token_expiry(token: str) -> Optional[datetime]:
     except JWTError:
         pass
     return None
+
+
+def get_token_id(token: str, payload: dict) -> str:
+    """Return the token's jti, or a digest of the token for tokens issued without one."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_token_revocation_info(token: str) -> Optional[Tuple[str, datetime]]:
+    """Get (token id, expiry) of a token, used to revoke it; None if it cannot be decoded."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False})
+    except JWTError:
+        return None
+    exp = payload.get("exp")
+    if not exp:
+        return None
+    return get_token_id(token, payload), datetime.fromtimestamp(exp, tz=timezone.utc)
@@ -1,43 +1,137 @@
 """
-Simple in-memory token blacklist.
-For production, use Redis or a database table.
+Token revocation store shared by all API workers.
+
+Revoked tokens are identified by their jti claim and persisted in the revoked_tokens
+table until they would expire anyway. Every worker keeps the unexpired entries in a
+local dict, so checking a token is a single lock-free dict lookup:
+- entries are loaded from the database at startup and re-synced periodically,
+- new revocations are published on the broker so other workers learn them immediately,
+- expired entries leave the dict lazily through a min-heap ordered by expiry.
 """
-from datetime import datetime, timezone
-from typing import Set, Dict
-import threading
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.auth.models import RevokedToken
+from config.broker import broker
+from config.database import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "token_revocations"
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "60"))
+
+# jti -> expiry (unix timestamp); only mutated from the event loop
+_revoked: Dict[str, float] = {}
+_expiry_heap: List[Tuple[float, str]] = []
+_last_sync: Optional[datetime] = None
+_sync_task: Optional[asyncio.Task] = None
+
+
+def is_token_revoked(jti: str) -> bool:
+    """Check if a token id has been revoked (hot path, O(1), no locking)."""
+    exp = _revoked.get(jti)
+    return exp is not None and exp > time.time()
+
+
+def _remember(jti: str, expires_at: float) -> None:
+    if expires_at <= time.time() or _revoked.get(jti) == expires_at:
+        return
+    _revoked[jti] = expires_at
+    heapq.heappush(_expiry_heap, (expires_at, jti))
+    _prune_expired()
+
 
-# Thread-safe set for blacklisted tokens
-_blacklisted_tokens: Set[str] = set()
-_token_expiry: Dict[str, datetime] = {}
-_lock = threading.Lock()
+def _prune_expired() -> None:
+    """Drop entries whose token has expired, cheapest first (amortised O(log n))."""
+    now = time.time()
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        exp, jti = heapq.heappop(_expiry_heap)
+        if _revoked.get(jti) == exp:
+            del _revoked[jti]
 
 
-def blacklist_token(token: str, expires_at: datetime) -> None:
-    """Add a token to the blacklist."""
-    with _lock:
-        _blacklisted_tokens.add(token)
-        _token_expiry[token] = expires_at
+async def blacklist_token(jti: str, expires_at: datetime) -> None:
+    """Revoke a token: persist it, then tell every worker."""
+    async with AsyncSession() as session:
+        await session.execute(
+            pg_insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        await session.commit()
 
+    _remember(jti, expires_at.timestamp())
+    try:
+        await broker.publish(REVOCATION_CHANNEL, {"jti": jti, "exp": expires_at.timestamp()})
+    except Exception as e:
+        # Other workers still pick the row up on their next sync
+        logger.warning(f"Failed to publish token revocation: {e}")
 
-def is_token_blacklisted(token: str) -> bool:
-    """Check if a token is blacklisted."""
-    with _lock:
-        # Clean up expired tokens
-        _cleanup_expired_tokens()
-        return token in _blacklisted_tokens
 
+async def _on_revocation(payload: dict) -> None:
+    _remember(payload["jti"], float(payload["exp"]))
 
-def _cleanup_expired_tokens() -> None:
-    """Remove expired tokens from the blacklist."""
+
+broker.subscribe(REVOCATION_CHANNEL, _on_revocation)
+
+
+async def sync_revoked_tokens() -> None:
+    """Load revocations added since the last sync and purge expired rows."""
+    global _last_sync
     now = datetime.now(timezone.utc)
-    expired = [t for t, exp in _token_expiry.items() if exp < now]
-    for token in expired:
-        _blacklisted_tokens.discard(token)
-        _token_expiry.pop(token, None)
+    async with AsyncSession() as session:
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+        if _last_sync is not None:
+            # Overlap one interval so rows committed during the previous sync are not missed
+            query = query.where(RevokedToken.created_at >= _last_sync)
+        result = await session.execute(query)
+        for jti, expires_at in result.all():
+            _remember(jti, expires_at.timestamp())
+
+        await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await session.commit()
+    _last_sync = now - timedelta(seconds=REVOCATION_SYNC_SECONDS)
+    _prune_expired()
+
+
+async def _sync_loop() -> None:
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await sync_revoked_tokens()
+        except Exception as e:
+            logger.warning(f"Token revocation sync failed: {e}")
+
+
+async def start_revocation_sync() -> None:
+    """Bootstrap the local cache from the database and keep it in sync (app lifespan)."""
+    global _sync_task
+    try:
+        await sync_revoked_tokens()
+    except Exception as e:
+        logger.warning(f"Could not load revoked tokens: {e}")
+    if _sync_task is None:
+        _sync_task = asyncio.create_task(_sync_loop())
+
+
+async def stop_revocation_sync() -> None:
+    global _sync_task
+    if _sync_task is not None:
+        _sync_task.cancel()
+        _sync_task = None
 
 
 def clear_blacklist() -> None:
-    """Clear all blacklisted tokens (for testing)."""
-    with _lock:
-        _blacklisted_tokens.clear()
-        _token_expiry.clear()
+    """Clear the local revocation cache (for testing)."""
+    global _last_sync
+    _revoked.clear()
+    _expiry_heap.clear()
+    _last_sync = None
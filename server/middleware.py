@@ -1,9 +1,16 @@
+import logging
 import os
+import time
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from config import metrics, query_stats
+from config.loop_monitor import loop_monitor
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 def setup_cors(app):
     # Get allowed origins from environment variable or use defaults for development
@@ -24,3 +31,64 @@ def setup_cors(app):
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         allow_headers=["*"],
     )
+
+
+class RequestStatsMiddleware:
+    """Per-request metrics and SQL accounting: logs each request, flags repeated statements
+    (N+1) and feeds the Prometheus request counters and latency histograms."""
+
+    def __init__(self, app, headers: bool = query_stats.QUERY_STATS_HEADERS,
+                 repeat_threshold: int = query_stats.QUERY_REPEAT_THRESHOLD):
+        self.app = app
+        self.headers = headers
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats, token = query_stats.start_tracking()
+        metrics.HTTP_IN_PROGRESS.inc()
+        loop_monitor.request_started(f"{scope['method']} {scope['path']}")
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_stats(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.headers:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-time-ms", f"{stats.total_ms:.1f}".encode()),
+                        (b"x-db-duplicate-queries", str(stats.duplicates).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.stop_tracking(token)
+            metrics.HTTP_IN_PROGRESS.dec()
+            loop_monitor.request_finished()
+            # Route templates keep label cardinality bounded; unknown paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            elapsed = time.perf_counter() - started
+            metrics.observe_request(scope["method"], route, status_code, elapsed, stats.count)
+            elapsed_ms = elapsed * 1000
+            fields = {
+                "method": scope["method"], "route": route if route != "unmatched" else scope["path"], "status": status_code,
+                "duration_ms": round(elapsed_ms, 1), "db_queries": stats.count,
+                "db_time_ms": round(stats.total_ms, 1), "db_duplicate_queries": stats.duplicates,
+            }
+            logger.info(" ".join(f"{key}={value}" for key, value in fields.items()), extra=fields)
+            for shape, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    f"Possible N+1: {scope['method']} {fields['route']} ran the same statement {count} times: {shape[:300]}",
+                    extra={**fields, "statement": shape, "repeat_count": count},
+                )
+
+
+def setup_request_stats(app):
+    # Added after CORS so it wraps the whole stack and sees every request
+    app.add_middleware(RequestStatsMiddleware)
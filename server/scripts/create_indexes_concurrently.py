@@ -0,0 +1,79 @@
+"""
+Create the indexes declared on the models without locking writes.
+
+A plain CREATE INDEX (what an autogenerated migration emits) blocks inserts and
+updates on the table while it builds, which on grades/attendances/notifications means
+minutes of failed requests. This script builds every declared index that is missing
+with CREATE INDEX CONCURRENTLY, outside a transaction, and rebuilds indexes left
+INVALID by an interrupted concurrent build. It is idempotent.
+
+Run it before generating the migration so autogenerate finds the indexes already in
+place and only records the remaining changes:
+  python scripts/create_indexes_concurrently.py            # list what would be built
+  python scripts/create_indexes_concurrently.py --apply
+  alembic revision --autogenerate -m "..." && alembic upgrade head
+"""
+
+import asyncio
+import sys
+
+# IMPORTANT: import models to ensure SQLAlchemy relationships are registered
+from app.school.models import School  # noqa: F401
+from app.users.models import User  # noqa: F401
+from app.users.models.teachers import Teacher  # noqa: F401
+from app.users.models.students import Student  # noqa: F401
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: F401
+from app.classes.models import Class  # noqa: F401
+from app.subject.models import Subject  # noqa: F401
+from app.schedule.models import Schedule  # noqa: F401
+from app.homework.models import Homework  # noqa: F401
+from app.material.models import Material  # noqa: F401
+from app.attendance.models import Attendance  # noqa: F401
+from app.grade.models import GradeModel  # noqa: F401
+from app.notification.models import Notification  # noqa: F401
+from app.stats.models import StudentSubjectGradeStats  # noqa: F401
+from app.auth.models import RevokedToken  # noqa: F401
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from config.database import Base, engine
+
+
+async def create_indexes(apply: bool):
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        result = await conn.execute(text(
+            "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        ))
+        existing = {name: valid for name, valid in result.all()}
+        result = await conn.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"))
+        tables = set(result.scalars().all())
+
+        for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+            if table.name not in tables:
+                # New tables get their indexes from the migration that creates them
+                continue
+            for index in sorted(table.indexes, key=lambda ix: ix.name):
+                valid = existing.get(index.name)
+                if valid:
+                    continue
+
+                index.dialect_kwargs["postgresql_concurrently"] = True
+                ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+                if not apply:
+                    print(f"would build: {ddl}")
+                    continue
+
+                if valid is False:
+                    print(f"dropping invalid index {index.name}")
+                    await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+                print(f"building {index.name} on {table.name} ...")
+                await conn.execute(text(ddl))
+
+    await engine.dispose()
+    print("✅ Done" if apply else "Re-run with --apply to build them")
+
+
+if __name__ == '__main__':
+    asyncio.run(create_indexes(apply="--apply" in sys.argv))
@@ -0,0 +1,68 @@
+"""
+Remove duplicate attendance rows before adding the (student_id, subject_id, attendance_date)
+unique constraint used by roll calls.
+
+For every student/subject/day with more than one row, the most recently updated row
+is kept and the others are deleted; the attendance rollups are adjusted in the same
+transaction. Run it before applying the migration that creates
+uq_attendance_student_subject_date (alembic revision --autogenerate && alembic upgrade head).
+
+Run:
+  python scripts/dedupe_attendance.py            # report only
+  python scripts/dedupe_attendance.py --apply    # delete the duplicates
+"""
+
+import asyncio
+import sys
+
+# IMPORTANT: import models to ensure SQLAlchemy relationships are registered
+from app.school.models import School  # noqa: F401
+from app.users.models import User  # noqa: F401
+from app.users.models.teachers import Teacher  # noqa: F401
+from app.users.models.students import Student  # noqa: F401
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: F401
+from app.classes.models import Class  # noqa: F401
+from app.subject.models import Subject  # noqa: F401
+from app.schedule.models import Schedule  # noqa: F401
+from app.homework.models import Homework  # noqa: F401
+from app.material.models import Material  # noqa: F401
+from app.attendance.models import Attendance  # noqa: F401
+from app.grade.models import GradeModel  # noqa: F401
+from app.notification.models import Notification  # noqa: F401
+
+from sqlalchemy import select, delete, func
+
+from app.stats.repository import StatsRepository
+from config.database import AsyncSession
+
+
+def duplicate_ids():
+    ranked = select(
+        Attendance.id,
+        func.row_number().over(
+            partition_by=(Attendance.student_id, Attendance.subject_id, Attendance.attendance_date),
+            order_by=(Attendance.updated_at.desc(), Attendance.created_at.desc(), Attendance.id.desc()),
+        ).label("rn"),
+    ).subquery()
+    return select(ranked.c.id).where(ranked.c.rn > 1)
+
+
+async def dedupe(apply: bool):
+    async with AsyncSession() as session:
+        count = await session.scalar(select(func.count()).select_from(duplicate_ids().subquery()))
+        if not count:
+            print("✅ No duplicate attendance rows")
+            return
+        if not apply:
+            print(f"Found {count} duplicate attendance rows; re-run with --apply to delete them")
+            return
+
+        condition = Attendance.id.in_(duplicate_ids())
+        await StatsRepository(session).remove_attendance(condition)
+        await session.execute(delete(Attendance).where(condition))
+        await session.commit()
+        print(f"✅ Deleted {count} duplicate attendance rows")
+
+
+if __name__ == '__main__':
+    asyncio.run(dedupe(apply="--apply" in sys.argv))
@@ -0,0 +1,370 @@
+"""
+Generate a large, reproducible synthetic district for load and performance testing.
+
+Builds N schools with classes, students, teachers (one homeroom teacher per class and
+one director per school), weekly schedules, and several school years of grades,
+attendance roll calls, homework (assigned to every student of the class) and
+notifications. Rows are streamed into PostgreSQL with COPY (asyncpg
+copy_records_to_table) in batches, so millions of rows load in seconds instead of
+the hours per-row ORM inserts would take. The grade/attendance
+rollups are rebuilt and the tables ANALYZEd at the end.
+
+The same --seed and sizing arguments always produce the same data. Emails embed the
+seed, so generate additional districts into the same database with different seeds.
+Every generated user can log in with --password.
+
+Run (defaults: ~5 schools, ~1.7k students, ~270k grades):
+  python scripts/generate_dataset.py
+  python scripts/generate_dataset.py --schools 20 --years 3 --seed 7     # ~1.6M grades
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time as timer
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# IMPORTANT: import models to ensure SQLAlchemy relationships are registered
+from app.school.models import School  # noqa: F401,E402
+from app.users.models import User  # noqa: F401,E402
+from app.users.models.teachers import Teacher  # noqa: F401,E402
+from app.users.models.students import Student  # noqa: F401,E402
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: F401,E402
+from app.classes.models import Class  # noqa: F401,E402
+from app.subject.models import Subject  # noqa: F401,E402
+from app.schedule.models import Schedule, DayOfWeek  # noqa: F401,E402
+from app.homework.models import Homework, HomeworkAssignment, HomeworkStatus  # noqa: F401,E402
+from app.material.models import Material  # noqa: F401,E402
+from app.attendance.models import Attendance, AttendanceStatus  # noqa: F401,E402
+from app.grade.models import GradeModel, GradeTypes  # noqa: F401,E402
+from app.notification.models import Notification, NotificationType  # noqa: F401,E402
+from app.stats.models import StudentSubjectGradeStats  # noqa: F401,E402
+from app.password.hasher import pwd_context  # noqa: E402
+from app.users.enums import UserRole  # noqa: E402
+
+from sqlalchemy import select, text  # noqa: E402
+
+from app.stats.repository import StatsRepository  # noqa: E402
+from config.database import AsyncSession, engine  # noqa: E402
+
+SUBJECTS = [
+    "Matematică", "Limba română", "Limba engleză", "Fizică", "Chimie",
+    "Biologie", "Istorie", "Geografie", "Informatică", "Educație fizică",
+]
+# Weekly lessons per subject; sums to the 30 slots of a 5 x 6 timetable
+WEEKLY_LESSONS = [5, 5, 3, 3, 2, 2, 3, 2, 3, 2]
+DAYS = [DayOfWeek.MONDAY, DayOfWeek.TUESDAY, DayOfWeek.WEDNESDAY, DayOfWeek.THURSDAY, DayOfWeek.FRIDAY]
+PERIODS_PER_DAY = 6
+FIRST_NAMES = ["Andrei", "Maria", "Ioana", "Alexandru", "Elena", "Mihai", "Ana", "David", "Sofia", "Matei",
+               "Daria", "Luca", "Irina", "Victor", "Bianca", "Tudor", "Carla", "Radu", "Eva", "Stefan"]
+LAST_NAMES = ["Popescu", "Ionescu", "Rusu", "Munteanu", "Ciobanu", "Ceban", "Lungu", "Rotaru", "Cojocaru",
+              "Sârbu", "Moraru", "Botnaru", "Țurcanu", "Bivol", "Gheorghiu", "Vasile", "Stan", "Dumitru"]
+ATTENDANCE_WEIGHTS = [(AttendanceStatus.PRESENT, 0.90), (AttendanceStatus.LATE, 0.04),
+                      (AttendanceStatus.ABSENT, 0.05), (AttendanceStatus.EXCUSED, 0.01)]
+
+# Column order of the COPY for each table (server defaults fill the rest)
+COLUMNS = {
+    "schools": ["id", "name", "location", "email", "is_active"],
+    "users": ["id", "username", "email", "password", "role", "is_activated", "school_id"],
+    "subjects": ["id", "name"],
+    "teachers": ["user_id", "subject", "is_homeroom", "is_director", "class_id"],
+    "classes": ["id", "name", "school_id", "teacher_id"],
+    "students": ["user_id", "class_id"],
+    "teacher_subjects": ["id", "teacher_id", "subject_id"],
+    "teacher_class_subjects": ["id", "teacher_id", "class_id", "subject_id"],
+    "schedules": ["id", "day_of_week", "period_number", "start_time", "end_time", "room",
+                  "class_id", "subject_id", "teacher_id"],
+    "grades": ["id", "value", "types", "created_at", "updated_at", "student_id", "teacher_id", "subject_id"],
+    "attendances": ["id", "attendance_date", "status", "created_at", "updated_at",
+                    "student_id", "subject_id", "teacher_id"],
+    "homeworks": ["id", "title", "due_date", "status", "created_at", "updated_at",
+                  "subject_id", "class_id", "teacher_id"],
+    "homework_assignments": ["id", "homework_id", "student_id", "created_at"],
+    "notifications": ["id", "title", "message", "notification_type", "is_read", "created_at", "user_id"],
+}
+# Parents before children; classes go in before teachers get their homeroom class_id
+LOAD_ORDER = ["schools", "users", "subjects", "teachers", "classes", "students",
+              "teacher_subjects", "teacher_class_subjects", "schedules", "grades", "attendances", "homeworks",
+              "homework_assignments", "notifications"]
+
+
+class Loader:
+    """Buffers rows per table and COPYs them in batches over one raw asyncpg connection."""
+
+    def __init__(self, connection, batch_size: int):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[tuple]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    async def add(self, table: str, row: tuple):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            await self.flush(table)
+
+    async def flush(self, table: str):
+        # Parent rows still buffered must land first or the child COPY breaks their FKs
+        for parent in LOAD_ORDER[:LOAD_ORDER.index(table)]:
+            if self.buffers.get(parent):
+                await self.flush(parent)
+        rows = self.buffers.pop(table, [])
+        if rows:
+            await self.connection.copy_records_to_table(table, records=rows, columns=COLUMNS[table])
+            self.counts[table] += len(rows)
+
+    async def flush_all(self):
+        for table in LOAD_ORDER:
+            await self.flush(table)
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.password_hash = pwd_context.hash(args.password)
+        self.now = datetime.combine(date(args.start_year + args.years, 6, 30), time(12))
+        self.user_counter = 0
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def person(self) -> Tuple[uuid.UUID, str, str]:
+        self.user_counter += 1
+        name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+        return self.new_id(), name, f"u{self.user_counter}.s{self.args.seed}@dataset.schoolapp.example.com"
+
+    def school_days(self, year: int) -> List[date]:
+        day, end, days = date(year, 9, 1), date(year + 1, 6, 15), []
+        while day <= end:
+            if day.weekday() < 5 and not (day.month == 12 and day.day > 22) and not (day.month == 1 and day.day < 8):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def lesson_time(self, day: date, period: int) -> datetime:
+        start = datetime.combine(day, time(8)) + timedelta(hours=period - 1)
+        return start + timedelta(minutes=self.rng.randint(5, 50))
+
+    async def build_structure(self, loader: Loader, subject_ids: List[uuid.UUID]) -> list:
+        """Schools, people, classes, assignments and timetables; returns per-class context."""
+        args, rng = self.args, self.rng
+        classes = []
+        for s in range(args.schools):
+            school_id = self.new_id()
+            await loader.add("schools", (school_id, f"Liceul Teoretic nr. {s + 1} (set {args.seed})",
+                                         rng.choice(["Chișinău", "Bălți", "Cahul", "Orhei", "Ungheni"]),
+                                         f"school{s + 1}.s{args.seed}@dataset.schoolapp.example.com", True))
+
+            # Two teachers per subject per school, plus one director
+            teachers_by_subject: Dict[int, List[uuid.UUID]] = defaultdict(list)
+            for subject_index in range(len(SUBJECTS)):
+                for _ in range(args.teachers_per_subject):
+                    user_id, name, email = self.person()
+                    await loader.add("users", (user_id, name, email, self.password_hash, UserRole.TEACHER.name, True, school_id))
+                    await loader.add("teachers", (user_id, SUBJECTS[subject_index], False, False, None))
+                    await loader.add("teacher_subjects", (self.new_id(), user_id, subject_ids[subject_index]))
+                    teachers_by_subject[subject_index].append(user_id)
+            director_id, name, email = self.person()
+            await loader.add("users", (director_id, name, email, self.password_hash, UserRole.TEACHER.name, True, school_id))
+            await loader.add("teachers", (director_id, None, False, True, None))
+
+            all_teachers = [t for ts in teachers_by_subject.values() for t in ts]
+            for c in range(args.classes_per_school):
+                class_id = self.new_id()
+                homeroom_id = all_teachers[c % len(all_teachers)]
+                await loader.add("classes", (class_id, f"{5 + c // 3}{'ABC'[c % 3]}", school_id, homeroom_id))
+
+                students = []
+                for _ in range(args.students_per_class):
+                    user_id, name, email = self.person()
+                    await loader.add("users", (user_id, name, email, self.password_hash, UserRole.STUDENT.name, True, school_id))
+                    await loader.add("students", (user_id, class_id))
+                    # Per-student ability drives realistic grade spreads
+                    students.append((user_id, rng.gauss(7.5, 1.3)))
+
+                subject_teacher = {}
+                for subject_index, subject_id in enumerate(subject_ids):
+                    teacher_id = teachers_by_subject[subject_index][c % args.teachers_per_subject]
+                    subject_teacher[subject_index] = teacher_id
+                    await loader.add("teacher_class_subjects", (self.new_id(), teacher_id, class_id, subject_id))
+
+                slots = [i for i, n in enumerate(WEEKLY_LESSONS) for _ in range(n)]
+                rng.shuffle(slots)
+                timetable = defaultdict(list)  # weekday -> [(period, subject_index)]
+                for slot, subject_index in enumerate(slots):
+                    weekday, period = divmod(slot, PERIODS_PER_DAY)
+                    period += 1
+                    timetable[weekday].append((period, subject_index))
+                    start = time(7 + period)
+                    await loader.add("schedules", (
+                        self.new_id(), DAYS[weekday].name, period, start, time(start.hour, 50),
+                        f"{100 + c}", class_id, subject_ids[subject_index], subject_teacher[subject_index],
+                    ))
+
+                classes.append({
+                    "id": class_id, "students": students, "subject_teacher": subject_teacher,
+                    "timetable": timetable, "homeroom_id": homeroom_id,
+                })
+        return classes
+
+    async def build_activity(self, loader: Loader, classes: list, subject_ids: List[uuid.UUID]):
+        """Grades, attendance, homework and notifications for every school year."""
+        args, rng = self.args, self.rng
+        statuses = [s for s, _ in ATTENDANCE_WEIGHTS]
+        weights = [w for _, w in ATTENDANCE_WEIGHTS]
+        grade_types = [GradeTypes.TEST, GradeTypes.EXAM, GradeTypes.HOMEWORK, GradeTypes.ASSIGNMENT, GradeTypes.OTHER]
+        read_before = self.now - timedelta(days=14)
+
+        for year in range(args.start_year, args.start_year + args.years):
+            days = self.school_days(year)
+            for cls in classes:
+                lessons = [(day, period, subject_index) for day in days
+                           for period, subject_index in cls["timetable"][day.weekday()]]
+
+                # Grades: spread over the subject's lessons of the year
+                for subject_index, teacher_id in cls["subject_teacher"].items():
+                    subject_lessons = [(d, p) for d, p, s in lessons if s == subject_index]
+                    for student_id, ability in cls["students"]:
+                        for day, period in rng.sample(subject_lessons, min(args.grades_per_subject, len(subject_lessons))):
+                            value = max(2, min(10, round(rng.gauss(ability, 1.2))))
+                            created_at = self.lesson_time(day, period)
+                            await loader.add("grades", (
+                                self.new_id(), value, rng.choice(grade_types).name, created_at, created_at,
+                                student_id, teacher_id, subject_ids[subject_index],
+                            ))
+                            if args.notifications:
+                                await loader.add("notifications", (
+                                    self.new_id(), "Notă nouă", f"Ai primit nota {value} la {SUBJECTS[subject_index]}.",
+                                    NotificationType.NEW_GRADE.name, created_at < read_before, created_at, student_id,
+                                ))
+
+                # Attendance: roll calls for a sample of lessons, one per subject per day
+                taken = set()
+                for day, period, subject_index in lessons:
+                    if (day, subject_index) in taken or rng.random() >= args.attendance_rate:
+                        continue
+                    taken.add((day, subject_index))
+                    created_at = self.lesson_time(day, period)
+                    for student_id, _ in cls["students"]:
+                        attendance_status = rng.choices(statuses, weights)[0]
+                        await loader.add("attendances", (
+                            self.new_id(), day, attendance_status.name, created_at, created_at,
+                            student_id, subject_ids[subject_index], cls["subject_teacher"][subject_index],
+                        ))
+                        if args.notifications and attendance_status != AttendanceStatus.PRESENT:
+                            await loader.add("notifications", (
+                                self.new_id(), "Prezență",
+                                f"Status: {attendance_status.value} la {SUBJECTS[subject_index]} ({day:%d.%m.%Y}).",
+                                NotificationType.ATTENDANCE.name, created_at < read_before, created_at, student_id,
+                            ))
+
+                # Homework: roughly one per subject per week
+                for day, period, subject_index in lessons:
+                    if rng.random() >= args.homework_rate:
+                        continue
+                    created_at = self.lesson_time(day, period)
+                    due = datetime.combine(day + timedelta(days=7), time(8))
+                    hw_status = HomeworkStatus.COMPLETED if due < self.now else HomeworkStatus.PENDING
+                    homework_id = self.new_id()
+                    await loader.add("homeworks", (
+                        homework_id, f"Tema {SUBJECTS[subject_index]} {day:%d.%m}", due, hw_status.name,
+                        created_at, created_at, subject_ids[subject_index], cls["id"],
+                        cls["subject_teacher"][subject_index],
+                    ))
+                    # Students see homework through their assignment rows, one per student of the class
+                    for student_id, _ in cls["students"]:
+                        await loader.add("homework_assignments", (self.new_id(), homework_id, student_id, created_at))
+            print(f"  school year {year}/{year + 1} generated")
+
+
+async def get_subject_ids(loader: Loader, generator: Generator) -> List[uuid.UUID]:
+    """Reuse subjects with the standard names, create the missing ones."""
+    async with AsyncSession() as session:
+        result = await session.execute(select(Subject.name, Subject.id).where(Subject.name.in_(SUBJECTS)))
+        existing = {name: subject_id for name, subject_id in result.all()}
+    ids = []
+    for name in SUBJECTS:
+        if name not in existing:
+            existing[name] = generator.new_id()
+            await loader.add("subjects", (existing[name], name))
+        ids.append(existing[name])
+    return ids
+
+
+async def generate(args):
+    started = timer.perf_counter()
+    generator = Generator(args)
+
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        loader = Loader(raw, args.batch_size)
+
+        subject_ids = await get_subject_ids(loader, generator)
+        classes = await generator.build_structure(loader, subject_ids)
+        await loader.flush_all()
+        # Homeroom teachers point back at their class (circular FK, so set after both exist)
+        await raw.execute("""
+            UPDATE teachers t SET class_id = c.id, is_homeroom = true
+            FROM classes c WHERE c.teacher_id = t.user_id AND c.id = ANY($1::uuid[])
+        """, [c["id"] for c in classes])
+        await conn.commit()
+        print(f"Structure loaded: {dict(loader.counts)}")
+
+        await generator.build_activity(loader, classes, subject_ids)
+        await loader.flush_all()
+        await conn.commit()
+
+    print("Rebuilding rollups and analyzing ...")
+    async with AsyncSession() as session:
+        await StatsRepository(session).rebuild()
+        await session.commit()
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in LOAD_ORDER:
+            await conn.execute(text(f"ANALYZE {table}"))
+    await engine.dispose()
+
+    elapsed = timer.perf_counter() - started
+    print(f"✅ Loaded in {elapsed:.1f}s:")
+    for table in LOAD_ORDER:
+        if loader.counts.get(table):
+            print(f"  {table:<24} {loader.counts[table]:>10,}")
+    print(f"Log in as any generated user with password '{args.password}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1, help="Random seed; also tags emails so sets can coexist")
+    parser.add_argument("--schools", type=int, default=5)
+    parser.add_argument("--classes-per-school", type=int, default=12)
+    parser.add_argument("--students-per-class", type=int, default=28)
+    parser.add_argument("--teachers-per-subject", type=int, default=2, help="Per school")
+    parser.add_argument("--years", type=int, default=2, help="School years of activity")
+    parser.add_argument("--start-year", type=int, default=date.today().year - 2,
+                        help="First school year (September); pin it for reproducible dates")
+    parser.add_argument("--grades-per-subject", type=int, default=8, help="Per student, subject and year")
+    parser.add_argument("--attendance-rate", type=float, default=0.2,
+                        help="Share of lessons with a recorded roll call")
+    parser.add_argument("--homework-rate", type=float, default=0.25, help="Share of lessons that assign homework")
+    parser.add_argument("--no-notifications", dest="notifications", action="store_false")
+    parser.add_argument("--password", default="dataset123")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows per COPY")
+    args = parser.parse_args()
+
+    grades = args.schools * args.classes_per_school * args.students_per_class * len(SUBJECTS) \
+        * args.grades_per_subject * args.years
+    print(f"Generating seed={args.seed}: {args.schools} schools, "
+          f"{args.schools * args.classes_per_school * args.students_per_class:,} students, ~{grades:,} grades")
+    asyncio.run(generate(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS (default 90).
+
+/sync answers tokens older than the retention window with a full reset, so these
+tombstones can no longer be handed out. Run it daily, e.g. from cron.
+
+Run:
+  python scripts/prune_tombstones.py
+"""
+
+import asyncio
+
+# IMPORTANT: import models to ensure SQLAlchemy relationships are registered
+from app.school.models import School  # noqa: F401
+from app.users.models import User  # noqa: F401
+from app.users.models.teachers import Teacher  # noqa: F401
+from app.users.models.students import Student  # noqa: F401
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: F401
+from app.classes.models import Class  # noqa: F401
+from app.subject.models import Subject  # noqa: F401
+from app.schedule.models import Schedule  # noqa: F401
+from app.homework.models import Homework  # noqa: F401
+from app.material.models import Material  # noqa: F401
+from app.attendance.models import Attendance  # noqa: F401
+from app.grade.models import GradeModel  # noqa: F401
+from app.notification.models import Notification  # noqa: F401
+
+from app.sync.repository import SyncRepository
+from app.sync.service import SYNC_TOMBSTONE_RETENTION
+from config.database import AsyncSession
+
+
+async def prune():
+    async with AsyncSession() as session:
+        repository = SyncRepository(session)
+        cutoff = await repository.get_now() - SYNC_TOMBSTONE_RETENTION
+        deleted = await repository.delete_tombstones_before(cutoff)
+        print(f"✅ Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}")
+
+
+if __name__ == '__main__':
+    asyncio.run(prune())
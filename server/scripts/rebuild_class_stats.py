@@ -0,0 +1,49 @@
+"""
+Rebuild the grade/attendance rollup tables from the source rows.
+
+The rollups (student_subject_grade_stats, class_subject_grade_stats,
+student_attendance_stats, class_attendance_stats) are kept up to date by the grade,
+attendance, student and teacher repositories. Run this once after creating the tables
+(alembic revision --autogenerate && alembic upgrade head) to backfill existing data,
+or any time the totals need to be recomputed after manual SQL edits.
+
+Run:
+  python scripts/rebuild_class_stats.py
+"""
+
+import asyncio
+
+# IMPORTANT: import models to ensure SQLAlchemy relationships are registered
+from app.school.models import School  # noqa: F401
+from app.users.models import User  # noqa: F401
+from app.users.models.teachers import Teacher  # noqa: F401
+from app.users.models.students import Student  # noqa: F401
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: F401
+from app.classes.models import Class  # noqa: F401
+from app.subject.models import Subject  # noqa: F401
+from app.schedule.models import Schedule  # noqa: F401
+from app.homework.models import Homework  # noqa: F401
+from app.material.models import Material  # noqa: F401
+from app.attendance.models import Attendance  # noqa: F401
+from app.grade.models import GradeModel  # noqa: F401
+from app.notification.models import Notification  # noqa: F401
+from app.stats.models import StudentSubjectGradeStats, ClassAttendanceStats  # noqa: F401
+
+from sqlalchemy import select, func
+
+from app.stats.repository import StatsRepository
+from config.database import AsyncSession
+
+
+async def rebuild():
+    async with AsyncSession() as session:
+        await StatsRepository(session).rebuild()
+        await session.commit()
+
+        grade_rows = await session.scalar(select(func.count()).select_from(StudentSubjectGradeStats))
+        class_rows = await session.scalar(select(func.count()).select_from(ClassAttendanceStats))
+        print(f"✅ Rebuilt rollups: {grade_rows} student/subject grade rows, {class_rows} class attendance rows")
+
+
+if __name__ == '__main__':
+    asyncio.run(rebuild())
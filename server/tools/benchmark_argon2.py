@@ -0,0 +1,68 @@
+"""
+Pick argon2 cost parameters for a target hashing latency on this host.
+
+For each memory cost (largest first) the time cost is raised until one hash takes
+longer than the target; the strongest setting that stays under it is suggested as
+environment variables for app/password/hasher.py. Run it on the production host
+(or one with the same CPU), not a laptop.
+
+Run:
+  python tools/benchmark_argon2.py --target-ms 250 --concurrency 4
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import argon2
+
+MEMORY_COSTS_KIB = [262144, 131072, 102400, 65536, 47104, 19456]
+MAX_TIME_COST = 10
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int) -> float:
+    """Median milliseconds for one hash (a verify costs the same)."""
+    hasher = argon2.using(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash("benchmark-password")
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250, help="Maximum median latency of one hash")
+    parser.add_argument("--parallelism", type=int, default=1, help="argon2 lanes per hash")
+    parser.add_argument("--concurrency", type=int, default=4, help="PASSWORD_HASH_CONCURRENCY you plan to run with")
+    parser.add_argument("--rounds", type=int, default=5, help="Hashes per measurement")
+    args = parser.parse_args()
+
+    best = None
+    for memory_cost in MEMORY_COSTS_KIB:
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            ms = measure(time_cost, memory_cost, args.parallelism, args.rounds)
+            print(f"memory_cost={memory_cost:>7} KiB time_cost={time_cost:>2} -> {ms:8.1f} ms")
+            if ms > args.target_ms:
+                break
+            strength = memory_cost * time_cost
+            if best is None or strength > best[0]:
+                best = (strength, time_cost, memory_cost, ms)
+
+    if best is None:
+        print(f"\nNo setting hashes in under {args.target_ms} ms on this host; raise --target-ms.")
+        return
+
+    _, time_cost, memory_cost, ms = best
+    per_worker = args.concurrency * 1000 / ms
+    print(f"\nSuggested settings (median {ms:.1f} ms per hash, ~{per_worker:.0f} logins/s per API worker):")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    print(f"PASSWORD_HASH_CONCURRENCY={args.concurrency}")
+    # Each running hash holds memory_cost KiB
+    print(f"# peak hashing memory per worker: {memory_cost * args.concurrency / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Before/after benchmark of response serialization (config/responses.py).
+
+Builds payloads shaped like the heaviest endpoints and times turning them into
+response bytes the way FastAPI did before (pydantic/jsonable_encoder to plain
+objects, then the stdlib json encoder of JSONResponse) and the way use_fast_json()
+does now (pydantic dump_json / orjson straight to bytes). Both outputs are checked
+to be the same JSON. No database needed.
+
+For end-to-end numbers on a seeded database, run tools/loadtest.py with --json on
+both commits and --compare.
+
+Run:
+  python tools/benchmark_json.py
+  python tools/benchmark_json.py --classes 12 --students 32 --grades 2000 --rounds 50
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi._compat.v2 import ModelField  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic.fields import FieldInfo  # noqa: E402
+
+from app.grade.models import GradeTypes  # noqa: E402
+from app.grade.schemas import GradeRead  # noqa: E402
+from config.responses import FastJSONResponse, _ModelJSONField, dumps  # noqa: E402
+
+
+def teaching_classes(classes: int, students: int) -> list:
+    """/teachers/me/teaching-classes: nested dicts with UUIDs and datetimes."""
+    now = datetime(2025, 1, 15, 8, 30)
+    payload = []
+    for _ in range(classes):
+        class_id, school_id = uuid.uuid4(), uuid.uuid4()
+        payload.append({
+            "id": class_id, "name": "9A", "school_id": school_id, "teacher_id": uuid.uuid4(),
+            "created_at": now, "updated_at": now,
+            "subjects": [{"id": uuid.uuid4(), "name": f"Subject {i}"} for i in range(3)],
+            "students": [
+                {
+                    "user_id": user_id, "class_id": class_id, "parent_id": None,
+                    "user": {"id": user_id, "username": f"Student {n}", "name": f"Student {n}",
+                             "email": f"s{n}@school.test", "class_id": class_id, "school_id": school_id},
+                    "username": f"Student {n}", "email": f"s{n}@school.test",
+                }
+                for n, user_id in enumerate(uuid.uuid4() for _ in range(students))
+            ],
+        })
+    return payload
+
+
+def grade_rows(count: int) -> list:
+    """/grades/student/{id}: ORM-like rows validated into List[GradeRead]."""
+    started = datetime(2025, 1, 1, 9, 0)
+    subject = SimpleNamespace(id=uuid.uuid4(), name="Matematică")
+    student_id, teacher_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), value=2 + i % 9, types=GradeTypes.TEST, student_id=student_id,
+            teacher_id=teacher_id, subject_id=subject.id, subject=subject,
+            created_at=started + timedelta(hours=i), updated_at=started + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(func: Callable[[], bytes], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def compare(name: str, before: Callable[[], bytes], after: Callable[[], bytes], rounds: int):
+    assert json.loads(before()) == json.loads(after()), f"{name}: outputs differ"
+    before_ms, after_ms = timed(before, rounds), timed(after, rounds)
+    size_kb = len(after()) / 1024
+    print(f"{name:<34} {size_kb:>8.0f} KiB {before_ms:>10.2f} ms {after_ms:>10.2f} ms {before_ms / after_ms:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=8)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--grades", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=30, help="Timed runs per case (median is reported)")
+    args = parser.parse_args()
+
+    classes = teaching_classes(args.classes, args.students)
+    # The handler used to str()/isoformat() everything itself before returning
+    classes_as_strings: Any = json.loads(dumps(classes))
+    rows = grade_rows(args.grades)
+
+    annotation = FieldInfo(annotation=List[GradeRead])
+    old_field = ModelField(field_info=annotation, name="response", mode="serialization")
+    new_field = _ModelJSONField(field_info=annotation, name="response", mode="serialization")
+
+    def model_before() -> bytes:
+        value, _ = old_field.validate(rows, {}, loc=("response",))
+        return JSONResponse(old_field.serialize(value)).body
+
+    def model_after() -> bytes:
+        value, _ = new_field.validate(rows, {}, loc=("response",))
+        return FastJSONResponse(new_field.serialize(value)).body
+
+    print(f"{'payload':<34} {'size':>12} {'before':>13} {'after':>13} {'speedup':>8}")
+    compare("teaching-classes (dict, str'd)", lambda: JSONResponse(jsonable_encoder(classes_as_strings)).body,
+            lambda: FastJSONResponse(classes_as_strings).body, args.rounds)
+    compare("teaching-classes (dict, native)", lambda: JSONResponse(jsonable_encoder(classes)).body,
+            lambda: FastJSONResponse(classes).body, args.rounds)
+    compare(f"List[GradeRead] x{args.grades}", model_before, model_after, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Query-plan regression check for the hot repository reads.
+
+Runs each listed repository method against a seeded database, captures the SQL it
+executes, runs EXPLAIN on every SELECT with the same parameters and fails (exit code 1)
+when a plan reads one of the large tables with a sequential scan. Tables below
+--min-rows are skipped: on tiny tables Postgres rightly prefers a seq scan.
+
+Seed a realistic dataset first (e.g. scripts/generate_dataset.py), run ANALYZE, then:
+  python tools/check_query_plans.py
+  python tools/check_query_plans.py --verbose     # print every plan
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api  # noqa: E402,F401  (registers every model/mapper)
+from sqlalchemy import event, func, select, text  # noqa: E402
+
+from app.attendance.models import Attendance  # noqa: E402
+from app.attendance.repository import AttendanceRepository  # noqa: E402
+from app.grade.models import GradeModel  # noqa: E402
+from app.grade.repository import GradeRepository  # noqa: E402
+from app.homework.repository import HomeworkRepository  # noqa: E402
+from app.material.repository import MaterialRepository  # noqa: E402
+from app.notification.models import Notification  # noqa: E402
+from app.notification.repository import NotificationRepository  # noqa: E402
+from app.schedule.repository import ScheduleRepository  # noqa: E402
+from app.schedule.models import Schedule  # noqa: E402
+from app.users.models.students import Student  # noqa: E402
+from app.users.repositories.teacher import TeacherRepository  # noqa: E402
+from config.database import AsyncSession, engine  # noqa: E402
+from config.pagination import CursorParams  # noqa: E402
+
+# Tables that must never be sequentially scanned by the queries below
+HOT_TABLES = {
+    "grades", "attendances", "notifications", "materials", "homeworks",
+    "homework_assignments", "schedules", "students",
+}
+
+_captured: List[Tuple[str, tuple]] = []
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith("SELECT"):
+        _captured.append((statement, tuple(parameters or ())))
+
+
+def _seq_scans(node: dict) -> List[str]:
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        found.append(node.get("Relation Name"))
+    for child in node.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def _most_common(session, column) -> object:
+    """The value of `column` with the most rows, i.e. the heaviest realistic lookup."""
+    return await session.scalar(select(column).group_by(column).order_by(func.count().desc()).limit(1))
+
+
+async def check(verbose: bool, min_rows: int) -> int:
+    async with AsyncSession() as session:
+        result = await session.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind = 'r'"
+        ))
+        row_estimates = dict(result.all())
+
+        student_id = await _most_common(session, GradeModel.student_id)
+        teacher_id = await _most_common(session, GradeModel.teacher_id)
+        subject_id = await _most_common(session, GradeModel.subject_id)
+        class_id = await _most_common(session, Student.class_id)
+        user_id = await _most_common(session, Notification.user_id)
+        attendance_student_id = await _most_common(session, Attendance.student_id)
+        schedule_teacher_id = await _most_common(session, Schedule.teacher_id)
+
+        grades = GradeRepository(session)
+        attendance = AttendanceRepository(session)
+        notifications = NotificationRepository(session)
+        materials = MaterialRepository(session)
+        homework = HomeworkRepository(session)
+        schedules = ScheduleRepository(session)
+        teachers = TeacherRepository(session)
+        first_page = CursorParams(cursor="", limit=20, with_total=False)
+
+        cases: List[Tuple[str, Callable[[], Awaitable]]] = [
+            ("GradeRepository.get_by_student", lambda: grades.get_by_student(student_id, 0, 20)),
+            ("GradeRepository.get_by_teacher", lambda: grades.get_by_teacher(teacher_id, 0, 20)),
+            ("GradeRepository.get_by_subject", lambda: grades.get_by_subject(subject_id, 0, 20)),
+            ("GradeRepository.get_page(student)", lambda: grades.get_page(first_page, student_id=student_id)),
+            ("GradeRepository.get_class_matrix_cells", lambda: grades.get_class_matrix_cells(class_id)),
+            ("AttendanceRepository.get_by_student", lambda: attendance.get_by_student(attendance_student_id)),
+            ("AttendanceRepository.get_page_by_student", lambda: attendance.get_page_by_student(attendance_student_id, first_page)),
+            ("NotificationRepository.get_by_user", lambda: notifications.get_by_user(user_id)),
+            ("NotificationRepository.get_page_by_user", lambda: notifications.get_page_by_user(user_id, first_page)),
+            ("MaterialRepository.get_by_class", lambda: materials.get_by_class(class_id)),
+            ("HomeworkRepository.get_by_class", lambda: homework.get_by_class(class_id)),
+            ("HomeworkRepository.get_for_student", lambda: homework.get_for_student(student_id, class_id)),
+            ("ScheduleRepository.get_by_class", lambda: schedules.get_by_class(class_id)),
+            ("ScheduleRepository.get_by_teacher", lambda: schedules.get_by_teacher(schedule_teacher_id)),
+            ("TeacherRepository.get_class_students", lambda: teachers.get_class_students([class_id])),
+        ]
+
+        connection = await session.connection()
+        raw = (await connection.get_raw_connection()).driver_connection
+
+        failures = 0
+        for name, run in cases:
+            _captured.clear()
+            await run()
+            statements = list(_captured)
+
+            problems = []
+            for statement, parameters in statements:
+                plan = await raw.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *parameters)
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                scans = [
+                    table for table in _seq_scans(plan[0]["Plan"])
+                    if table in HOT_TABLES and row_estimates.get(table, 0) >= min_rows
+                ]
+                if scans:
+                    problems.append((statement, scans))
+                if verbose:
+                    print(f"\n-- {name}\n{statement}\n{json.dumps(plan[0]['Plan'], indent=1)}")
+
+            if problems:
+                failures += 1
+                print(f"FAIL {name}")
+                for statement, scans in problems:
+                    print(f"     seq scan on {', '.join(scans)}: {' '.join(statement.split())[:200]}")
+            else:
+                print(f"ok   {name} ({len(statements)} queries)")
+
+        await session.rollback()
+
+    await engine.dispose()
+    print(f"\n{len(cases) - failures}/{len(cases)} repository reads use indexes")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    parser.add_argument("--min-rows", type=int, default=1000, help="Ignore seq scans on tables smaller than this")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(check(args.verbose, args.min_rows)))
+
+
+if __name__ == "__main__":
+    main()
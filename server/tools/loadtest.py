@@ -0,0 +1,379 @@
+"""
+In-process load test and latency benchmark for the API.
+
+Drives the FastAPI app from api.py through httpx's ASGI transport (no network, no
+uvicorn) against the database configured in .env, and replays scripted scenarios
+with concurrent virtual users:
+
+  login       morning login burst of students
+  teacher     teachers opening the app (/teachers/me, teaching classes, gradebook)
+  grading     teachers entering a test for a whole class via POST /grades/bulk
+  director    directors opening the school reports
+  homework    teachers assigning homework to all their classes via POST /homework/bulk
+
+For every endpoint it reports p50/p95/p99 latency, requests per second, errors and
+SQL queries per request (from the X-DB-Query-Count header of RequestStatsMiddleware,
+which this tool switches on). --json writes the results (with the git commit) so runs can
+be compared; --compare checks a run against such a file and exits 1 when an endpoint's
+p95 got slower than --max-regression.
+
+The write scenarios insert grades, homework and notifications: point it at a
+throwaway database seeded with scripts/generate_dataset.py, never at production.
+Needs httpx (pip install httpx), which the API itself does not depend on.
+
+Run:
+  python tools/loadtest.py --password dataset123
+  python tools/loadtest.py --scenarios login,teacher --users 50 --iterations 20 --json before.json
+  python tools/loadtest.py --json after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QUERY_STATS_HEADERS", "1")
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from api import app  # noqa: E402
+from app.users.enums import UserRole  # noqa: E402
+from app.users.models import User  # noqa: E402
+from app.users.models.students import Student  # noqa: E402
+from app.users.models.teacher_subjects import TeacherClassSubject  # noqa: E402
+from app.users.models.teachers import Teacher  # noqa: E402
+from config.database import AsyncSession, engine  # noqa: E402
+
+SCENARIOS = ["login", "teacher", "grading", "director", "homework"]
+
+
+class SetupError(Exception):
+    """A scenario cannot run as intended (e.g. a seeded account cannot log in)."""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    """Latency, status and query samples per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: Dict[str, str] = {}
+        # Wall time of the scenarios that called each endpoint, for requests per second
+        self.elapsed: Dict[str, float] = defaultdict(float)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str,
+                      token: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+        except Exception as e:
+            self.errors[label] += 1
+            self.error_samples.setdefault(label, repr(e))
+            return None
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        self.queries[label].append(int(response.headers.get("x-db-query-count", 0)))
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            self.error_samples.setdefault(label, f"{response.status_code} {response.text[:200]}")
+        return response
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for label, samples in sorted(self.latencies.items()):
+            elapsed = self.elapsed[label]
+            result[label] = {
+                "requests": len(samples),
+                "errors": self.errors[label],
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "max_ms": round(max(samples), 2),
+                "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+                "queries_per_request": round(statistics.mean(self.queries[label]), 1),
+                "max_queries": max(self.queries[label]),
+            }
+        return result
+
+
+async def load_accounts(users: int, seed: int) -> dict:
+    """Pick students, teachers with class assignments and directors from the database."""
+    async with AsyncSession() as session:
+        students = (await session.execute(
+            select(User.email).join(Student, Student.user_id == User.id)
+            .where(User.role == UserRole.STUDENT, User.is_activated.is_(True), User.password.is_not(None))
+            .order_by(User.email).limit(users * 10)
+        )).scalars().all()
+
+        rows = (await session.execute(
+            select(User.id, User.email, TeacherClassSubject.class_id, TeacherClassSubject.subject_id)
+            .join(TeacherClassSubject, TeacherClassSubject.teacher_id == User.id)
+            .where(User.is_activated.is_(True), User.password.is_not(None))
+            .order_by(User.email).limit(users * 20)
+        )).all()
+        teachers: Dict[str, dict] = {}
+        for user_id, email, class_id, subject_id in rows:
+            teacher = teachers.setdefault(email, {"id": str(user_id), "email": email, "assignments": []})
+            teacher["assignments"].append({"class_id": str(class_id), "subject_id": str(subject_id)})
+
+        class_ids = {a["class_id"] for t in teachers.values() for a in t["assignments"]}
+        roster: Dict[str, List[str]] = defaultdict(list)
+        if class_ids:
+            for student_id, class_id in (await session.execute(
+                select(Student.user_id, Student.class_id).where(Student.class_id.in_(class_ids))
+            )).all():
+                roster[str(class_id)].append(str(student_id))
+
+        directors = (await session.execute(
+            select(User.email).join(Teacher, Teacher.user_id == User.id)
+            .where(Teacher.is_director.is_(True), User.is_activated.is_(True), User.password.is_not(None))
+            .order_by(User.email).limit(users)
+        )).scalars().all()
+
+    rng = random.Random(seed)
+    teacher_list = list(teachers.values())
+    rng.shuffle(teacher_list)
+    return {
+        "students": list(students),
+        "teachers": teacher_list[:users],
+        "directors": list(directors),
+        "roster": roster,
+    }
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, email: str, password: str) -> Optional[str]:
+    response = await recorder.request(client, "POST /auth/login", "POST", "/auth/login",
+                                      json={"email": email, "password": password})
+    if response is None or response.status_code != 200:
+        return None
+    return response.json().get("access_token")
+
+
+async def run_users(count: int, iterations: int, user_flow: Callable[[int, int], object]):
+    """Run `iterations` rounds of user_flow for `count` concurrent virtual users; the first failure stops all."""
+    async def virtual_user(index: int):
+        for iteration in range(iterations):
+            await user_flow(index, iteration)
+
+    tasks = [asyncio.create_task(virtual_user(i)) for i in range(count)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class Scenarios:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, accounts: dict, args):
+        self.client = client
+        self.recorder = recorder
+        self.accounts = accounts
+        self.args = args
+        self.tokens: Dict[str, str] = {}
+
+    async def token(self, email: str) -> str:
+        # Setup logins are not recorded, the login scenario measures them. Without a token
+        # the scenario would only measure 401s, so stop the run instead.
+        if email not in self.tokens:
+            response = await self.client.post("/auth/login", json={"email": email, "password": self.args.password})
+            if response.status_code != 200:
+                raise SetupError(f"login as {email} failed: {response.status_code} {response.text[:300]}")
+            self.tokens[email] = response.json()["access_token"]
+        return self.tokens[email]
+
+    async def login(self):
+        students = self.accounts["students"]
+        if not students:
+            return print("  no activated students with a password, skipped")
+
+        async def flow(index: int, iteration: int):
+            email = students[(iteration * self.args.users + index) % len(students)]
+            await login(self.client, self.recorder, email, self.args.password)
+
+        await run_users(self.args.users, self.args.iterations, flow)
+
+    async def teacher(self):
+        teachers = self.accounts["teachers"]
+
+        async def flow(index: int, iteration: int):
+            teacher = teachers[index % len(teachers)]
+            token = await self.token(teacher["email"])
+            await self.recorder.request(self.client, "GET /teachers/me", "GET", "/teachers/me", token)
+            await self.recorder.request(self.client, "GET /teachers/me/teaching-classes", "GET",
+                                        "/teachers/me/teaching-classes", token)
+            class_id = teacher["assignments"][iteration % len(teacher["assignments"])]["class_id"]
+            await self.recorder.request(self.client, "GET /grades/class/{class_id}/matrix", "GET",
+                                        f"/grades/class/{class_id}/matrix", token)
+
+        await run_users(min(self.args.users, len(teachers)), self.args.iterations, flow)
+
+    async def grading(self):
+        teachers = self.accounts["teachers"]
+        roster = self.accounts["roster"]
+
+        async def flow(index: int, iteration: int):
+            teacher = teachers[index % len(teachers)]
+            token = await self.token(teacher["email"])
+            assignment = teacher["assignments"][iteration % len(teacher["assignments"])]
+            grades = [
+                {"value": random.randint(4, 10), "types": "test", "student_id": student_id,
+                 "teacher_id": teacher["id"], "subject_id": assignment["subject_id"]}
+                for student_id in roster.get(assignment["class_id"], [])
+            ]
+            if grades:
+                await self.recorder.request(self.client, "POST /grades/bulk", "POST", "/grades/bulk", token, json=grades)
+
+        await run_users(min(self.args.users, len(teachers)), self.args.iterations, flow)
+
+    async def director(self):
+        directors = self.accounts["directors"]
+        if not directors:
+            return print("  no directors, skipped")
+
+        async def flow(index: int, iteration: int):
+            token = await self.token(directors[index % len(directors)])
+            for path in ("/reports/school-overview", "/reports/teacher-performance"):
+                await self.recorder.request(self.client, f"GET {path}", "GET", path, token)
+
+        await run_users(min(self.args.users, len(directors)), self.args.iterations, flow)
+
+    async def homework(self):
+        teachers = self.accounts["teachers"]
+        due = (datetime.now() + timedelta(days=7)).isoformat()
+
+        async def flow(index: int, iteration: int):
+            teacher = teachers[index % len(teachers)]
+            token = await self.token(teacher["email"])
+            homeworks = [
+                {"title": f"Load test {iteration}", "due_date": due, "teacher_id": teacher["id"], **assignment}
+                for assignment in teacher["assignments"]
+            ]
+            await self.recorder.request(self.client, "POST /homework/bulk", "POST", "/homework/bulk", token,
+                                        json=homeworks)
+
+        await run_users(min(self.args.users, len(teachers)), self.args.iterations, flow)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(endpoints: Dict[str, dict]):
+    print(f"\n{'endpoint':<42} {'reqs':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>7} {'q/req':>6}")
+    for label, stats in endpoints.items():
+        print(f"{label:<42} {stats['requests']:>6} {stats['errors']:>4} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['rps']:>7.1f} {stats['queries_per_request']:>6.1f}")
+
+
+def compare(endpoints: Dict[str, dict], baseline_path: str, max_regression: float) -> int:
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit')}):")
+    regressions = 0
+    for label, stats in endpoints.items():
+        before = baseline["endpoints"].get(label)
+        if not before or not before["p95_ms"]:
+            continue
+        change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+        queries = stats["queries_per_request"] - before["queries_per_request"]
+        regressed = change > max_regression
+        regressions += regressed
+        print(f"{'REGRESSED' if regressed else 'ok':<10} {label:<42} p95 {before['p95_ms']:.1f} -> "
+              f"{stats['p95_ms']:.1f} ms ({change:+.0%}), queries/request {queries:+.1f}")
+    return 1 if regressions else 0
+
+
+async def run(args) -> int:
+    accounts = await load_accounts(args.users, args.seed)
+    if not accounts["teachers"] and set(args.scenarios) - {"login", "director"}:
+        print("No teachers with class assignments found; seed the database with scripts/generate_dataset.py")
+        return 1
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+                scenarios = Scenarios(client, recorder, accounts, args)
+                for name in args.scenarios:
+                    print(f"Running {name} ({args.users} users x {args.iterations} iterations) ...")
+                    before = {label: len(samples) for label, samples in recorder.latencies.items()}
+                    started = time.perf_counter()
+                    await getattr(scenarios, name)()
+                    elapsed = time.perf_counter() - started
+                    # Throughput of an endpoint is measured over the scenarios that called it
+                    for label, samples in recorder.latencies.items():
+                        if len(samples) != before.get(label, 0):
+                            recorder.elapsed[label] += elapsed
+    except SetupError as e:
+        print(f"Aborted: {e}")
+        print("Check --password, and that the database was seeded with scripts/generate_dataset.py")
+        return 1
+    finally:
+        await engine.dispose()
+
+    endpoints = recorder.summary()
+    print_summary(endpoints)
+    for label, sample in recorder.error_samples.items():
+        print(f"  first error on {label}: {sample}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "config": {"scenarios": args.scenarios, "users": args.users, "iterations": args.iterations},
+            "endpoints": endpoints,
+        }, indent=2))
+        print(f"\nResults written to {args.json}")
+
+    exit_code = 1 if any(recorder.errors.values()) and args.fail_on_errors else 0
+    if args.compare:
+        exit_code = max(exit_code, compare(endpoints, args.compare, args.max_regression))
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users per scenario")
+    parser.add_argument("--iterations", type=int, default=10, help="Rounds each virtual user runs")
+    parser.add_argument("--password", default="dataset123", help="Password of the seeded accounts")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    parser.add_argument("--compare", help="Baseline results file to compare p95 latencies with")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed p95 slowdown vs the baseline before failing (0.2 = 20%%)")
+    parser.add_argument("--fail-on-errors", action="store_true", help="Exit 1 when any request failed")
+    args = parser.parse_args()
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    random.seed(args.seed)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()